@@ -2,7 +2,7 @@
 
 ##############################################################################
 # Local imports.
-from .app import run
+from .cli import run
 
 ##############################################################################
 # Run the app if we're being called as the main entry point.
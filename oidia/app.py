@@ -1,13 +1,22 @@
 """The main app class."""
 
+##############################################################################
+# Python imports.
+from time   import perf_counter
+from typing import Any
+
 ##############################################################################
 # Textual imports.
-from textual.app import App
+from textual         import events
+from textual.app     import App
+from textual.widgets import Input
 
 ##############################################################################
 # Local imports.
-from .        import __version__
-from .screens import Main
+from .          import __version__
+from .data      import Datasets, History, Store, data_directory
+from .recording import Recorder
+from .screens   import Main
 
 ##############################################################################
 class OIDIA( App[ None ] ):
@@ -19,18 +28,124 @@ class OIDIA( App[ None ] ):
     SUB_TITLE = f"The simple terminal streak tracker - v{__version__}"
     """str: The subtitle of the application."""
 
-    SCREENS = {
-        "main": Main
-    }
-    """dict[ str, Screen ]: The screens for the application."""
+    def __init__(
+        self,
+        *args: Any,
+        undo_memory: int=History.DEFAULT_BUDGET,
+        store: Store | None=None,
+        datasets: Datasets | None=None,
+        dataset: str=Datasets.DEFAULT,
+        recorder: Recorder | None=None,
+        **kwargs: Any
+    ) -> None:
+        """Initialise the application.
+
+        Args:
+            undo_memory (int): The memory budget for the undo history, in bytes.
+            store (Store | None): The one store of streaks to show, rather than the local user's datasets.
+            datasets (Datasets | None): The datasets to show; by default the local user's datasets.
+            dataset (str): The name of the dataset to show first.
+            recorder (Recorder | None): The recorder to record the keys and actions with.
+
+        Note:
+            When a store is given it's the only thing that is shown, and
+            switching between datasets isn't possible.
+        """
+        super().__init__( *args, **kwargs )
+        self._undo_memory = undo_memory
+        self._store       = store
+        self._datasets    = None if store is not None else ( datasets or Datasets( data_directory() ) )
+        self._dataset     = dataset
+        self._screens: set[ str ] = set()
+        self._recorder    = recorder
 
     def on_mount( self ) -> None:
         """Initialise the application on startup."""
-        self.push_screen( "main" )
+        if self._recorder is not None:
+            self._recorder.start( ( self.size.width, self.size.height ) )
+        if self._store is not None or not self.switch_dataset( self._dataset ):
+            self.push_screen( Main( history=History( self._undo_memory ), store=self._store ) )
 
-##############################################################################
-def run() -> None:
-    """Run the application."""
-    OIDIA().run()
+    def switch_dataset( self, name: str ) -> bool:
+        """Switch to showing a dataset.
+
+        Args:
+            name (str): The name of the dataset.
+
+        Returns:
+            bool: `True` if the dataset is now being shown, `False` if it couldn't be.
+
+        Note:
+            The screen for a dataset is kept for as long as its store is
+            kept loaded, so switching back to it shows it just as it was
+            left, undo history and all, with nothing to load or mount.
+        """
+        if self._datasets is None:
+            return False
+        try:
+            store = self._datasets.store( name )
+        except ValueError:
+            return False
+        if not self.is_screen_installed( screen := f"dataset:{name}" ):
+            self.install_screen(
+                Main( history=History( self._undo_memory ), store=store, datasets=self._datasets ), screen
+            )
+            self._screens.add( name )
+        if isinstance( self.screen, Main ):
+            self.switch_screen( screen )
+        else:
+            self.push_screen( screen )
+        self._dataset  = name
+        self.sub_title = self.SUB_TITLE if name == Datasets.DEFAULT else f"{name} - {self.SUB_TITLE}"
+        for dropped in self._screens - set( self._datasets.loaded ):
+            self._screens.discard( dropped )
+            dropped_screen = self.get_screen( f"dataset:{dropped}" )
+            self.uninstall_screen( dropped_screen )
+            dropped_screen.remove()
+        return True
+
+    def on_main_switch_dataset( self, event: Main.SwitchDataset ) -> None:
+        """Handle a request to switch to another dataset.
+
+        Args:
+            event (Main.SwitchDataset): The request.
+        """
+        if event.dataset != self._dataset and not self.switch_dataset( event.dataset ):
+            self.bell()
+
+    async def on_event( self, event: events.Event ) -> None:
+        """Handle an event, recording any keys being pressed.
+
+        Args:
+            event (events.Event): The event.
+
+        Note:
+            Anything printable that is typed into an input is recorded as
+            an `x`, so that titles and the like aren't recorded.
+        """
+        if self._recorder is not None and isinstance( event, events.Key ) and not event.is_forwarded:
+            self._recorder.key(
+                "x" if isinstance( self.focused, Input ) and event.is_printable else event.key
+            )
+        await super().on_event( event )
+
+    async def action(
+        self, action: str | tuple[ str, tuple[ Any, ... ] ], default_namespace: object | None=None
+    ) -> bool:
+        """Perform an action, recording it if it was handled.
+
+        Args:
+            action (str | tuple[ str, tuple[ Any, ... ] ]): The action, as given or already parsed.
+            default_namespace (object | None): The namespace to use if the action doesn't give one.
+
+        Returns:
+            bool: `True` if the action was handled, `False` if not.
+        """
+        if self._recorder is None:
+            return await super().action( action, default_namespace )
+        started = perf_counter()
+        if handled := await super().action( action, default_namespace ):
+            self._recorder.action( action if isinstance( action, str ) else action[ 0 ], perf_counter() - started )
+        return handled
 
 ### app.py ends here
@@ -0,0 +1,628 @@
+"""Provides the command line interface for the application."""
+
+##############################################################################
+# Python imports.
+import sys
+from argparse   import ArgumentParser, ArgumentTypeError, Namespace
+from asyncio    import run as run_coroutine
+from contextlib import nullcontext
+from datetime   import date
+from getpass    import getpass
+from ipaddress  import ip_address
+from pathlib    import Path
+from socket     import gethostname
+from statistics import median
+from tempfile   import TemporaryDirectory
+
+##############################################################################
+# Local imports.
+from .          import __doc__ as DESCRIPTION, __version__
+from .app       import OIDIA
+from .data      import (
+    EXPORT_FORMATS, IMPORT_FORMATS, BackupError, Datasets, History, Passwords, Shape, Storage, Store, Stores,
+    Streak, Sync, SyncError, Tally, TransferError, data_directory, guess_format, merge_tally, read_rows,
+    seed_storage, synthetic_streaks, transport_for, write_rows
+)
+from .recording import Recorder, Recording, Replayer
+from .soak      import Soak, Thresholds
+
+##############################################################################
+# The server runs sessions on Unix pseudo-terminals, so it's only there to
+# be had on platforms that have them.
+try:
+    from .server import Server, serve, web_files
+except ImportError:
+    HAS_SERVER = False
+else:
+    HAS_SERVER = True
+
+##############################################################################
+def dataset_storage( args: Namespace ) -> Storage:
+    """Get the storage for the dataset given on the command line.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        Storage: The storage for the dataset.
+    """
+    return Datasets( data_directory() ).storage( args.dataset )
+
+##############################################################################
+def import_streaks( args: Namespace ) -> int:
+    """Import streak data from a file.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+
+    Note:
+        The import is all or nothing; if there's a problem with the file,
+        nothing is saved. Importing the same file again changes nothing.
+    """
+    try:
+        data_format = args.format or guess_format( args.file )
+        with (
+            nullcontext( sys.stdin ) if str( args.file ) == "-" else args.file.open( encoding="utf-8", newline="" )
+        ) as source:
+            tally = Tally.of( read_rows( source, data_format ) )
+    except ( OSError, TransferError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    storage = dataset_storage( args )
+    streaks = storage.load()
+    added: list[ Streak ] = []
+    merge_tally( streaks, tally, storage.archive, added )
+    storage.save( streaks + added )
+    print( f"Imported {tally.rows} rows, adding {len( added )} new streaks." )
+    return 0
+
+##############################################################################
+def export_streaks( args: Namespace ) -> int:
+    """Export streak data to a file.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    try:
+        data_format = args.format or ( guess_format( args.output ) if args.output else "csv" )
+        with (
+            args.output.open( "w", encoding="utf-8", newline="" ) if args.output else nullcontext( sys.stdout )
+        ) as target:
+            target.writelines( write_rows(
+                dataset_storage( args ).rows( args.streak, args.start, args.end ), data_format
+            ) )
+    except ( OSError, TransferError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    return 0
+
+##############################################################################
+def backup_streaks( args: Namespace ) -> int:
+    """Take a backup snapshot of the streak data, or list the snapshots.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    backups = dataset_storage( args ).backups
+    try:
+        if args.list:
+            for snapshot in backups.snapshots:
+                streaks, years = backups.describe( snapshot )
+                print( f"{snapshot}  {streaks} streaks{'  archived: ' + ', '.join( years ) if years else ''}" )
+        elif ( name := backups.snapshot( force=True ) ) is None:
+            print( "Nothing has changed since the last snapshot." )
+        else:
+            print( f"Took snapshot {name}." )
+    except ( OSError, BackupError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    return 0
+
+##############################################################################
+def restore_streaks( args: Namespace ) -> int:
+    """Restore the streak data from a backup snapshot.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    backups = dataset_storage( args ).backups
+    try:
+        if args.snapshot == "latest":
+            if not ( snapshots := backups.snapshots ):
+                raise BackupError( "There are no snapshots to restore" )
+            args.snapshot = snapshots[ -1 ]
+        backups.restore( args.snapshot )
+    except ( OSError, BackupError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    print( f"Restored snapshot {args.snapshot}." )
+    return 0
+
+##############################################################################
+def sync_streaks( args: Namespace ) -> int:
+    """Sync the streak data with other devices.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    try:
+        syncer         = Sync( dataset_storage( args ), transport_for( args.location ), args.device )
+        joining        = not syncer.joined
+        sent, received = syncer.run()
+    except ( OSError, SyncError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    if joining:
+        print( f"{args.device} has joined the sync." )
+    print( f"Sent {sent} changes, received {received} changes." )
+    return 0
+
+##############################################################################
+def list_datasets( _: Namespace ) -> int:
+    """List the datasets.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    for name in Datasets( data_directory() ).names:
+        print( name )
+    return 0
+
+##############################################################################
+def passwords() -> Passwords:
+    """Get the passwords of the users of the server.
+
+    Returns:
+        Passwords: The passwords.
+    """
+    return Passwords( data_directory() / "passwords.json" )
+
+##############################################################################
+def set_password( args: Namespace ) -> int:
+    """Set, or remove, the password that a user logs in to the server with.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    if not Stores.USER_NAME.fullmatch( args.user ):
+        print( f"oidia: {args.user!r} isn't a valid user name", file=sys.stderr )
+        return 1
+    if args.remove:
+        passwords().set( args.user, "" )
+        return 0
+    if not ( password := getpass( "Password: " ) ):
+        print( "oidia: The password can't be empty", file=sys.stderr )
+        return 1
+    if getpass( "Password again: " ) != password:
+        print( "oidia: The passwords don't match", file=sys.stderr )
+        return 1
+    passwords().set( args.user, password )
+    return 0
+
+##############################################################################
+def is_loopback( host: str ) -> bool:
+    """Is the given host only reachable from this machine?
+
+    Args:
+        host (str): The host name or address.
+
+    Returns:
+        bool: `True` if the host is a loopback address, `False` if not.
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ip_address( host ).is_loopback
+    except ValueError:
+        return False
+
+##############################################################################
+def serve_streaks( args: Namespace ) -> int:
+    """Serve sessions of the application to many users.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    if not HAS_SERVER:
+        print( "oidia: Serving isn't supported on this platform, as it needs Unix pseudo-terminals", file=sys.stderr )
+        return 1
+    if not ( users := passwords() ).users:
+        print( "oidia: No user has a password yet; set one with: oidia password USER", file=sys.stderr )
+        return 1
+    try:
+        web = None if args.web_port is None else web_files( args.web_assets or data_directory() / "web" )
+    except FileNotFoundError as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    if not is_loopback( args.host ):
+        print(
+            f"oidia: Warning: {args.host} can be reached from other machines, and nothing the server sends or "
+            "receives is encrypted, passwords included",
+            file=sys.stderr
+        )
+    print( f"Serving terminals on {args.host}:{args.port}", end="" )
+    print( "" if args.web_port is None else f" and web browsers on http://{args.host}:{args.web_port}/", end="" )
+    print( ", press Ctrl+C to stop." )
+    try:
+        run_coroutine( serve(
+            Server(
+                Stores( data_directory() / "users", args.save_delay ),
+                users,
+                args.size,
+                args.undo_memory * 1024,
+                web
+            ),
+            args.host,
+            ( args.port, args.web_port )
+        ) )
+    except OSError as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+##############################################################################
+def soak_test( args: Namespace ) -> int:
+    """Run a soak test of the application.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+
+    Note:
+        The test runs against made-up data in a temporary directory, so
+        the real data is never touched.
+    """
+    soak = Soak( args.actions, args.sample_every, args.seed )
+    with TemporaryDirectory() as directory:
+        seed_storage(
+            storage := Storage( Path( directory ) ),
+            synthetic_streaks( args.streaks, args.history, seed=args.seed )
+        )
+        run_coroutine( OIDIA( store=Store( storage ) ).run_async(
+            headless=True, size=args.size, auto_pilot=soak.run
+        ) )
+    print( f"{'Actions':>8}  {'RSS (MB)':>9}  {'Widgets':>8}  {'Detached':>8}  {'Latency (ms)':>12}" )
+    for sample in soak.samples:
+        print(
+            f"{sample.actions:>8}  {sample.memory / 1048576:>9.1f}  {sample.widgets:>8}"
+            f"  {sample.detached:>8}  {sample.latency * 1000:>12.1f}"
+        )
+    if problems := soak.problems( Thresholds(
+        args.max_memory_growth * 1048576,
+        args.max_widget_growth,
+        args.max_detached_growth,
+        args.max_latency_growth
+    ) ):
+        for problem in problems:
+            print( f"oidia: {problem}", file=sys.stderr )
+        return 1
+    print( "Soak test passed." )
+    return 0
+
+##############################################################################
+def replay_recording( args: Namespace ) -> int:
+    """Replay a recording against made-up data, and report on how long each action took.
+
+    Args:
+        args (Namespace): The command line arguments.
+
+    Returns:
+        int: The exit code for the command.
+    """
+    try:
+        with args.recording.open( encoding="utf-8" ) as source:
+            replayer = Replayer( recording := Recording.read( source ) )
+    except ( OSError, ValueError ) as error:
+        print( f"oidia: {error}", file=sys.stderr )
+        return 1
+    with TemporaryDirectory() as directory:
+        seed_storage( storage := Storage( Path( directory ) ), recording.shape.make( args.seed ) )
+        run_coroutine( OIDIA( store=Store( storage ), recorder=replayer ).run_async(
+            headless=True, size=recording.size, auto_pilot=replayer.run
+        ) )
+    print( f"{'Action':<20}  {'Count':>6}  {'Median (ms)':>11}  {'Max (ms)':>9}  {'Total (ms)':>10}" )
+    for action, times in sorted( replayer.timings.items(), key=lambda timing: -sum( timing[ 1 ] ) ):
+        print(
+            f"{action:<20}  {len( times ):>6}  {median( times ) * 1000:>11.1f}"
+            f"  {max( times ) * 1000:>9.1f}  {sum( times ) * 1000:>10.1f}"
+        )
+    return 0
+
+##############################################################################
+def terminal_size( size: str ) -> tuple[ int, int ]:
+    """Parse the size of a terminal.
+
+    Args:
+        size (str): The size, as WIDTHxHEIGHT.
+
+    Returns:
+        tuple[ int, int ]: The width and height.
+
+    Raises:
+        ArgumentTypeError: If the size isn't valid.
+    """
+    try:
+        width, height = ( int( part ) for part in size.lower().split( "x" ) )
+    except ValueError:
+        raise ArgumentTypeError( f"{size!r} isn't a size like 80x25" ) from None
+    if width < 1 or height < 1:
+        raise ArgumentTypeError( f"{size!r} isn't a size like 80x25" )
+    return width, height
+
+##############################################################################
+def dataset_name( name: str ) -> str:
+    """Check the name of a dataset given on the command line.
+
+    Args:
+        name (str): The name of the dataset.
+
+    Returns:
+        str: The name of the dataset.
+
+    Raises:
+        ArgumentTypeError: If the name isn't valid.
+    """
+    if not Datasets.NAME.fullmatch( name ):
+        raise ArgumentTypeError( f"{name!r} isn't a valid dataset name" )
+    return name
+
+##############################################################################
+def positive( value: str ) -> int:
+    """Check that a number given on the command line is positive.
+
+    Args:
+        value (str): The number.
+
+    Returns:
+        int: The number.
+
+    Raises:
+        ArgumentTypeError: If the value isn't a positive number.
+    """
+    try:
+        if ( number := int( value ) ) > 0:
+            return number
+    except ValueError:
+        pass
+    raise ArgumentTypeError( f"{value!r} isn't a positive number" )
+
+##############################################################################
+def serve_arguments( server: ArgumentParser ) -> None:
+    """Add the arguments of the serve command.
+
+    Args:
+        server (ArgumentParser): The parser for the command.
+    """
+    server.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="The host to listen on; nothing is encrypted, so take care with anything else (default: %(default)s)"
+    )
+    server.add_argument(
+        "-p", "--port", type=int, default=4040, help="The port to listen on for terminals (default: %(default)s)"
+    )
+    server.add_argument(
+        "-w", "--web-port", type=int, metavar="PORT", help="Also listen on this port for web browsers"
+    )
+    server.add_argument(
+        "--web-assets",
+        type=Path,
+        metavar="DIRECTORY",
+        help="The directory holding the files of xterm.js that the web page needs (default: web in the data directory)"
+    )
+    server.add_argument(
+        "-s", "--size",
+        type=terminal_size,
+        default=( 80, 25 ),
+        metavar="WIDTHxHEIGHT",
+        help="The size of a terminal whose size isn't known (default: 80x25)"
+    )
+    server.add_argument(
+        "--save-delay",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="How long to hold back saving for after a change (default: %(default)s)"
+    )
+
+##############################################################################
+def soak_arguments( soak: ArgumentParser ) -> None:
+    """Add the arguments of the soak command.
+
+    Args:
+        soak (ArgumentParser): The parser for the command.
+    """
+    soak.add_argument(
+        "-n", "--actions", type=int, default=2000, help="The number of actions to carry out (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--sample-every",
+        type=int,
+        default=100,
+        metavar="ACTIONS",
+        help="How often to take a sample (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--streaks", type=int, default=20, help="The number of streaks to make up (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--history",
+        type=int,
+        default=730,
+        metavar="DAYS",
+        help="The number of days of data to make up (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--seed", type=int, default=0, help="The seed for the made-up data and actions (default: %(default)s)"
+    )
+    soak.add_argument(
+        "-s", "--size",
+        type=terminal_size,
+        default=( 120, 40 ),
+        metavar="WIDTHxHEIGHT",
+        help="The size of the terminal to test in (default: 120x40)"
+    )
+    soak.add_argument(
+        "--max-memory-growth", type=float, default=50, metavar="MB",
+        help="Fail if the resident memory grows by more than this (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--max-widget-growth", type=int, default=250, metavar="WIDGETS",
+        help="Fail if the number of widgets in the display grows by more than this (default: %(default)s)"
+    )
+    soak.add_argument(
+        "--max-detached-growth", type=int, default=100, metavar="WIDGETS",
+        help=(
+            "Fail if the number of widgets left alive outside of the display grows by more than this "
+            "(default: %(default)s)"
+        )
+    )
+    soak.add_argument(
+        "--max-latency-growth", type=float, default=2.0, metavar="FACTOR",
+        help="Fail if the median time an action takes grows by more than this factor (default: %(default)s)"
+    )
+
+##############################################################################
+def get_args() -> Namespace:
+    """Get the command line arguments.
+
+    Returns:
+        Namespace: The parsed arguments.
+    """
+    parser = ArgumentParser( prog="oidia", description=DESCRIPTION )
+    parser.add_argument( "-v", "--version", action="version", version=f"%(prog)s v{__version__}" )
+    parser.add_argument(
+        "--undo-memory",
+        type=int,
+        default=History.DEFAULT_BUDGET // 1024,
+        metavar="KB",
+        help="The memory to set aside for the undo history (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="FILE",
+        help="Record the keys pressed and actions taken, along with the shape of the data, to a file"
+    )
+    parser.add_argument(
+        "--dataset",
+        type=dataset_name,
+        default=Datasets.DEFAULT,
+        metavar="NAME",
+        help="The dataset to work with; it's made if it doesn't exist (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--keep-datasets",
+        type=positive,
+        default=3,
+        metavar="COUNT",
+        help="The number of datasets to keep loaded when switching between them (default: %(default)s)"
+    )
+    commands = parser.add_subparsers( dest="command", metavar="command" )
+
+    importer = commands.add_parser( "import", help="Import streak data from another tracker" )
+    importer.add_argument( "file", type=Path, help="The file to import, or - to read standard input" )
+    importer.add_argument( "-f", "--format", choices=IMPORT_FORMATS, help="The format of the file" )
+    importer.set_defaults( handler=import_streaks )
+
+    exporter = commands.add_parser( "export", help="Export streak data" )
+    exporter.add_argument( "-o", "--output", type=Path, help="The file to export to (default: standard output)" )
+    exporter.add_argument( "-f", "--format", choices=EXPORT_FORMATS, help="The format to export in (default: csv)" )
+    exporter.add_argument(
+        "-s", "--streak", action="append", metavar="TITLE", help="Only export this streak (can be repeated)"
+    )
+    exporter.add_argument(
+        "--from", dest="start", type=date.fromisoformat, metavar="DATE", help="Only export from this date on"
+    )
+    exporter.add_argument(
+        "--to", dest="end", type=date.fromisoformat, metavar="DATE", help="Only export up to this date"
+    )
+    exporter.set_defaults( handler=export_streaks )
+
+    backup = commands.add_parser( "backup", help="Take a backup snapshot of the streak data" )
+    backup.add_argument( "-l", "--list", action="store_true", help="List the snapshots rather than take one" )
+    backup.set_defaults( handler=backup_streaks )
+
+    restore = commands.add_parser( "restore", help="Restore the streak data from a backup snapshot" )
+    restore.add_argument( "snapshot", help="The name of the snapshot to restore, or latest" )
+    restore.set_defaults( handler=restore_streaks )
+
+    syncer = commands.add_parser( "sync", help="Sync the streak data with other devices" )
+    syncer.add_argument( "location", help="The directory to sync through" )
+    syncer.add_argument(
+        "-d", "--device", default=gethostname(), help="The name of this device (default: %(default)s)"
+    )
+    syncer.set_defaults( handler=sync_streaks )
+
+    datasets = commands.add_parser( "datasets", help="List the datasets" )
+    datasets.set_defaults( handler=list_datasets )
+
+    server = commands.add_parser( "serve", help="Serve sessions of the application to many users" )
+    serve_arguments( server )
+    server.set_defaults( handler=serve_streaks )
+
+    password = commands.add_parser( "password", help="Set the password a user logs in to the server with" )
+    password.add_argument( "user", help="The name of the user" )
+    password.add_argument( "-r", "--remove", action="store_true", help="Remove the user rather than set a password" )
+    password.set_defaults( handler=set_password )
+
+    soak = commands.add_parser( "soak", help="Soak test the application against made-up data" )
+    soak_arguments( soak )
+    soak.set_defaults( handler=soak_test )
+
+    replay = commands.add_parser( "replay", help="Replay a recording against made-up data and time the actions" )
+    replay.add_argument( "recording", type=Path, help="The recording to replay" )
+    replay.add_argument( "--seed", type=int, default=0, help="The seed for the made-up data (default: %(default)s)" )
+    replay.set_defaults( handler=replay_recording )
+
+    return parser.parse_args()
+
+##############################################################################
+def run() -> None:
+    """Run the application.
+
+    Note:
+        If a command was given on the command line that is run instead of
+        the application.
+    """
+    if ( args := get_args() ).command is None:
+        datasets = Datasets( data_directory(), args.keep_datasets )
+        if args.record is None:
+            OIDIA( undo_memory=args.undo_memory * 1024, datasets=datasets, dataset=args.dataset ).run()
+        else:
+            with args.record.open( "w", encoding="utf-8" ) as recording:
+                OIDIA(
+                    undo_memory=args.undo_memory * 1024,
+                    datasets=datasets,
+                    dataset=args.dataset,
+                    recorder=Recorder( recording, Shape.of( datasets.storage( args.dataset ) ) )
+                ).run()
+    else:
+        sys.exit( args.handler( args ) )
+
+### cli.py ends here
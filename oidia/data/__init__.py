@@ -0,0 +1,85 @@
+"""Provides the data handling for the application."""
+
+##############################################################################
+# Local imports.
+from .periods    import Resolution, TimeSpan, period_start, shift_period
+from .aggregates import Aggregates
+from .streak     import Streak
+from .archive    import Archive
+from .notes      import Notes
+from .backup     import Backups, BackupError
+from .storage    import Storage, data_directory
+from .store      import Store, Stores
+from .remote     import Connection, RemoteError, RemoteStore, StoreService
+from .passwords  import Passwords
+from .datasets   import Datasets
+from .synthetic  import StreakShape, Shape, synthetic_streaks, seed_storage
+from .search     import TitleIndex
+from .sync       import SyncError, Entry, Transport, DirectoryTransport, Sync, transport_for
+from .ordering   import SortOrder, sort_streaks, in_order
+from .changes    import (
+    Change, DayChange, TitleChange, OrderChange, StreakChange, invert, mark_days
+)
+from .history    import History, Operation
+from .transfer   import (
+    TransferError, Row, IMPORT_FORMATS, EXPORT_FORMATS, Tally, guess_format, read_rows, merge_tally, write_rows
+)
+
+##############################################################################
+# Exports.
+__all__ = [
+    "Resolution",
+    "TimeSpan",
+    "period_start",
+    "shift_period",
+    "Aggregates",
+    "Streak",
+    "Archive",
+    "Notes",
+    "Backups",
+    "BackupError",
+    "Storage",
+    "data_directory",
+    "Store",
+    "Stores",
+    "Connection",
+    "RemoteError",
+    "RemoteStore",
+    "StoreService",
+    "Passwords",
+    "Datasets",
+    "StreakShape",
+    "Shape",
+    "synthetic_streaks",
+    "seed_storage",
+    "TitleIndex",
+    "SyncError",
+    "Entry",
+    "Transport",
+    "DirectoryTransport",
+    "Sync",
+    "transport_for",
+    "SortOrder",
+    "sort_streaks",
+    "in_order",
+    "Change",
+    "DayChange",
+    "TitleChange",
+    "OrderChange",
+    "StreakChange",
+    "invert",
+    "mark_days",
+    "History",
+    "Operation",
+    "TransferError",
+    "Row",
+    "IMPORT_FORMATS",
+    "EXPORT_FORMATS",
+    "Tally",
+    "guess_format",
+    "read_rows",
+    "merge_tally",
+    "write_rows"
+]
+
+### __init__.py ends here
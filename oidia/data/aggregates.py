@@ -0,0 +1,74 @@
+"""Provides cached period totals for the history of a streak."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Mapping
+from datetime        import date
+
+##############################################################################
+# Local imports.
+from .periods import Resolution, period_start
+
+##############################################################################
+class Aggregates:
+    """A pyramid of cached per-period totals for a streak.
+
+    Each level of the pyramid holds the totals for one of the coarser
+    resolutions, keyed by the start date of the period. The pyramid is
+    built once and is then kept up to date as individual days change, so
+    getting the total for any period is a single lookup no matter how
+    long the history is. The total for each year is kept too.
+    """
+
+    LEVELS = ( Resolution.WEEK, Resolution.MONTH )
+    """tuple[ Resolution, ... ]: The resolutions that are aggregated."""
+
+    def __init__( self, days: Mapping[ date, int ] | None=None ) -> None:
+        """Initialise the aggregates.
+
+        Args:
+            days (Mapping[ date, int ] | None): The initial days to aggregate.
+        """
+        self._totals: dict[ Resolution, dict[ date, int ] ] = {
+            level: {} for level in self.LEVELS
+        }
+        self._years: dict[ int, int ] = {}
+        for day, count in ( days or {} ).items():
+            self.adjust( day, count )
+
+    def adjust( self, day: date, delta: int ) -> None:
+        """Adjust the aggregates for a change in the count for a day.
+
+        Args:
+            day (date): The day whose count changed.
+            delta (int): The amount the count changed by.
+        """
+        if delta:
+            for level, totals in self._totals.items():
+                if total := totals.get( period := period_start( day, level ), 0 ) + delta:
+                    totals[ period ] = total
+                else:
+                    del totals[ period ]
+            if total := self._years.get( day.year, 0 ) + delta:
+                self._years[ day.year ] = total
+            else:
+                del self._years[ day.year ]
+
+    @property
+    def years( self ) -> Mapping[ int, int ]:
+        """Mapping[ int, int ]: The total for each year that has any days."""
+        return self._years
+
+    def total( self, period: date, resolution: Resolution ) -> int:
+        """Get the total for a given period.
+
+        Args:
+            period (date): The start date of the period.
+            resolution (Resolution): The resolution of the period.
+
+        Returns:
+            int: The total count for the period.
+        """
+        return self._totals[ resolution ].get( period, 0 )
+
+### aggregates.py ends here
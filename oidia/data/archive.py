@@ -0,0 +1,414 @@
+"""Provides lazily-loaded per-year archives of old streak data."""
+
+##############################################################################
+# Python imports.
+from collections     import OrderedDict
+from collections.abc import Iterable, Mapping
+from datetime        import date, timedelta
+from json            import dump, loads
+from pathlib         import Path
+from typing          import Final, NamedTuple, cast
+
+##############################################################################
+# Local imports.
+from .streak import Streak
+
+##############################################################################
+class Summary( NamedTuple ):
+    """A summary of the done counts of a streak over some archived days."""
+
+    total: int = 0
+    """int: The total of the done counts."""
+
+    last: date = date.min
+    """date: The last day with a done count, or `date.min` if there isn't one."""
+
+    run: int = 0
+    """int: The number of consecutive days that were done, up to the last of the days."""
+
+    @classmethod
+    def of_year( cls, year: int, days: Mapping[ date, int ] ) -> "Summary":
+        """Summarise the done counts for a year.
+
+        Args:
+            year (int): The year being summarised.
+            days (Mapping[ date, int ]): The done counts for the days of the year.
+
+        Returns:
+            Summary: The summary of the year.
+        """
+        run = 0
+        day = date( year, 12, 31 )
+        while day.year == year and days.get( day ):
+            run += 1
+            day -= timedelta( days=1 )
+        return cls( sum( days.values() ), max( days, default=date.min ), run )
+
+##############################################################################
+class Archive:
+    """Per-year archive files for streak data that has gone cold.
+
+    Only the most recent years of data are kept in the main data file. Any
+    older years live in an archive file per year, keyed by the key of each
+    streak, and are only read when the user looks at them. Years that were
+    loaded are kept in memory on a least-recently-used basis and are
+    unloaded from the streaks again once the user moves away from them.
+
+    A summary of each streak for each archived year is kept alongside the
+    years themselves, and is updated whenever a year is saved, so that
+    anything that needs to know about the whole history of a streak can
+    do so without any year being loaded.
+    """
+
+    HOT_YEARS: Final = 2
+    """int: The number of years, including the current one, that are never archived."""
+
+    SUMMARY_FILE: Final = Path( "summary.json" )
+    """Path: The name of the file that holds the summaries of the archived years."""
+
+    def __init__( self, directory: Path, capacity: int=3 ) -> None:
+        """Initialise the archive.
+
+        Args:
+            directory (Path): The directory that holds the archive files.
+            capacity (int): The number of unseen archived years to keep loaded.
+        """
+        self._directory = directory
+        self._capacity  = capacity
+        self._loaded: OrderedDict[ int, None ] = OrderedDict()
+        self._dirty: set[ int ] = set()
+        self._summaries: dict[ int, dict[ str, Summary ] ] | None = None
+
+    @property
+    def first_hot_year( self ) -> int:
+        """int: The first year that is kept in the main data file."""
+        return date.today().year - ( self.HOT_YEARS - 1 )
+
+    @property
+    def first_hot_day( self ) -> date:
+        """date: The first day that is kept in the main data file."""
+        return date( self.first_hot_year, 1, 1 )
+
+    def is_archived( self, year: int ) -> bool:
+        """Is the given year one that is archived?
+
+        Args:
+            year (int): The year to check.
+
+        Returns:
+            bool: `True` if the year lives in the archive, `False` if not.
+        """
+        return year < self.first_hot_year
+
+    def is_loaded( self, year: int ) -> bool:
+        """Is the given archived year loaded?
+
+        Args:
+            year (int): The year to check.
+
+        Returns:
+            bool: `True` if the year is loaded into the streaks, `False` if not.
+        """
+        return year in self._loaded
+
+    def _file( self, year: int ) -> Path:
+        """Get the file for a given year.
+
+        Args:
+            year (int): The year to get the file for.
+
+        Returns:
+            Path: The path to the archive file for the year.
+        """
+        return self._directory / f"{year}.json"
+
+    @property
+    def years( self ) -> list[ int ]:
+        """list[ int ]: The years that have been archived, in order."""
+        return sorted(
+            int( archive.stem ) for archive in self._directory.glob( "*.json" ) if archive.stem.isdigit()
+        )
+
+    def read( self, year: int ) -> dict[ str, dict[ str, int ] ]:
+        """Read the raw data for a given year.
+
+        Args:
+            year (int): The year to read.
+
+        Returns:
+            dict[ str, dict[ str, int ] ]: The days for each streak key.
+        """
+        if ( archive_file := self._file( year ) ).exists():
+            return cast( dict[ str, dict[ str, int ] ], loads( archive_file.read_text( encoding="utf-8" ) ) )
+        return {}
+
+    async def fetch( self, years: Iterable[ int ] ) -> None:
+        """Make sure the data for archived years is at hand, ready to be read.
+
+        Args:
+            years (Iterable[ int ]): The years that are about to be needed.
+
+        Note:
+            Years are read from storage as they're needed, so there is
+            nothing to do here; an archive that lives elsewhere fetches
+            them.
+        """
+
+    async def fetch_summaries( self ) -> None:
+        """Make sure the summaries of the archived years are at hand.
+
+        Note:
+            The summaries are read from storage as they're needed, so
+            there is nothing to do here; an archive that lives elsewhere
+            fetches them.
+        """
+
+    @property
+    def summaries( self ) -> dict[ int, dict[ str, Summary ] ]:
+        """dict[ int, dict[ str, Summary ] ]: The summary of each streak, for each archived year.
+
+        The summaries are read from storage the first time they're asked
+        for; any archived year that hasn't been summarised yet is read and
+        summarised then, and the summaries saved.
+        """
+        if self._summaries is None:
+            summary_file = self._directory / self.SUMMARY_FILE
+            self._summaries = {
+                int( year ): {
+                    key: Summary( total, date.fromisoformat( last ), run )
+                    for key, ( total, last, run ) in streaks.items()
+                } for year, streaks in cast(
+                    dict[ str, dict[ str, tuple[ int, str, int ] ] ],
+                    loads( summary_file.read_text( encoding="utf-8" ) )
+                ).items()
+            } if summary_file.exists() else {}
+            if missing := [ year for year in self.years if year not in self._summaries ]:
+                for year in missing:
+                    self._summaries[ year ] = {
+                        key: Summary.of_year( year, {
+                            date.fromisoformat( day ): count for day, count in days.items()
+                        } ) for key, days in self.read( year ).items()
+                    }
+                self._save_summaries()
+        return self._summaries
+
+    def _save_summaries( self ) -> None:
+        """Save the summaries of the archived years."""
+        self._directory.mkdir( parents=True, exist_ok=True )
+        with ( self._directory / self.SUMMARY_FILE ).open( "w", encoding="utf-8" ) as summary_file:
+            dump( {
+                str( year ): {
+                    key: [ summary.total, summary.last.isoformat(), summary.run ]
+                    for key, summary in streaks.items()
+                } for year, streaks in sorted( self.summaries.items() )
+            }, summary_file )
+
+    def summary( self, streak: Streak ) -> Summary:
+        """Get the summary of all of the archived days of a streak.
+
+        Args:
+            streak (Streak): The streak to summarise.
+
+        Returns:
+            Summary: The summary of the archived days of the streak.
+
+        Note:
+            This only ever looks at the summaries, so gives the same result
+            whatever years happen to be loaded. The run is the run of days
+            up to the last archived day.
+        """
+        years = {
+            year: summary for year, summaries in self.summaries.items()
+            if ( summary := summaries.get( streak.key ) ) is not None
+        }
+        run  = 0
+        year = self.first_hot_year - 1
+        while ( summary := years.get( year ) ) is not None:
+            run  += summary.run
+            if summary.run < ( date( year + 1, 1, 1 ) - date( year, 1, 1 ) ).days:
+                break
+            year -= 1
+        return Summary(
+            sum( summary.total for summary in years.values() ),
+            max( ( summary.last for summary in years.values() ), default=date.min ),
+            run
+        )
+
+    def all_days( self, streak: Streak ) -> dict[ date, int ]:
+        """Get every day of a streak, including those in years that aren't loaded.
+
+        Args:
+            streak (Streak): The streak to get the days of.
+
+        Returns:
+            dict[ date, int ]: The done counts for every day of the streak.
+
+        Note:
+            This reads every archived year that isn't loaded, so is for
+            occasional use only; for example to take a full copy of a
+            streak that is being deleted, so that it can be put back.
+        """
+        days = dict( streak.days )
+        for year in self.years:
+            if year not in self._loaded:
+                days.update( {
+                    date.fromisoformat( day ): count
+                    for day, count in self.read( year ).get( streak.key, {} ).items()
+                } )
+        return days
+
+    def _load( self, year: int, streaks: Iterable[ Streak ] ) -> None:
+        """Load the given year into the given streaks.
+
+        Args:
+            year (int): The year to load.
+            streaks (Iterable[ Streak ]): The streaks to load the year into.
+
+        Note:
+            Data in the archive for a streak that no longer exists is
+            dropped, and the year is marked as needing to be saved again.
+        """
+        self._loaded[ year ] = None
+        archived = self.read( year )
+        for streak in streaks:
+            if ( days := archived.pop( streak.key, None ) ) is not None:
+                streak.load_days( { date.fromisoformat( day ): count for day, count in days.items() } )
+        if archived:
+            self._dirty.add( year )
+
+    def _save( self, year: int, streaks: Iterable[ Streak ] ) -> None:
+        """Save the given year from the given streaks.
+
+        Args:
+            year (int): The year to save.
+            streaks (Iterable[ Streak ]): The streaks to save the year from.
+        """
+        self._directory.mkdir( parents=True, exist_ok=True )
+        with self._file( year ).open( "w", encoding="utf-8" ) as archive_file:
+            dump( {
+                streak.key: {
+                    day.isoformat(): count for day, count in days.items()
+                } for streak in streaks if ( days := streak.year( year ) )
+            }, archive_file, indent=4 )
+        self.summaries[ year ] = {
+            streak.key: Summary.of_year( year, days ) for streak in streaks if ( days := streak.year( year ) )
+        }
+        self._save_summaries()
+        self._dirty.discard( year )
+        for streak in streaks:
+            streak.changed_years.discard( year )
+
+    def load_year( self, year: int, streaks: Iterable[ Streak ] ) -> None:
+        """Make sure that the given year is loaded.
+
+        Args:
+            year (int): The year to load.
+            streaks (Iterable[ Streak ]): The streaks to load the year into.
+
+        Note:
+            Unlike `visit` this never unloads any other years.
+        """
+        if self.is_archived( year ) and year not in self._loaded:
+            self._load( year, streaks )
+
+    def unload_year( self, year: int, streaks: Iterable[ Streak ] ) -> None:
+        """Make sure that the given year is unloaded.
+
+        Args:
+            year (int): The year to unload.
+            streaks (Iterable[ Streak ]): The streaks to unload the year from.
+
+        Note:
+            If the year has changed it is saved before it is unloaded.
+        """
+        if year in self._loaded:
+            self._unload( year, list( streaks ) )
+
+    def adopt( self, streaks: Iterable[ Streak ] ) -> bool:
+        """Adopt any archivable data that was found in the main data file.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks that were loaded.
+
+        Returns:
+            bool: `True` if any data was adopted, `False` if not.
+
+        Note:
+            This handles data from before archiving existed, and years
+            that have gone cold since the data was last saved. The years
+            are merged with anything already archived and marked as
+            needing to be saved, so the next save moves them into the
+            archive.
+        """
+        streaks = list( streaks )
+        adopting = {
+            day.year for streak in streaks for day in streak.days if self.is_archived( day.year )
+        }
+        for year in sorted( adopting ):
+            self._load( year, streaks )
+            self._dirty.add( year )
+        return bool( adopting )
+
+    def visit( self, streaks: Iterable[ Streak ], start: date, end: date ) -> bool:
+        """Make sure that the given range of dates is loaded.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks to load data into.
+            start (date): The start of the range being visited.
+            end (date): The end of the range being visited.
+
+        Returns:
+            bool: `True` if the data in the streaks changed, `False` if not.
+
+        Note:
+            Any archived years that are loaded but haven't been visited
+            recently will be saved, if needed, and unloaded.
+        """
+        streaks  = list( streaks )
+        visiting = {
+            year for year in range( start.year, end.year + 1 ) if self.is_archived( year )
+        }
+        changed  = False
+        for year in sorted( visiting ):
+            if year in self._loaded:
+                self._loaded.move_to_end( year )
+            else:
+                self._load( year, streaks )
+                changed = True
+        unseen = [ year for year in self._loaded if year not in visiting ]
+        for year in unseen[ :max( 0, len( unseen ) - self._capacity ) ]:
+            self._unload( year, streaks )
+            changed = True
+        return changed
+
+    def _unload( self, year: int, streaks: list[ Streak ] ) -> None:
+        """Unload the given year from the given streaks.
+
+        Args:
+            year (int): The year to unload.
+            streaks (list[ Streak ]): The streaks to unload the year from.
+        """
+        if year in self._dirty or any( year in streak.changed_years for streak in streaks ):
+            self._save( year, streaks )
+        for streak in streaks:
+            streak.unload_year( year )
+        del self._loaded[ year ]
+
+    def save( self, streaks: Iterable[ Streak ] ) -> None:
+        """Save any archived years that have changed.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks to save.
+
+        Note:
+            Only years that are loaded can be saved; any other year that
+            has changed stays marked as changed until it is.
+        """
+        streaks = list( streaks )
+        for streak in streaks:
+            self._dirty |= streak.changed_years
+            streak.changed_years.clear()
+        for year in sorted( self._dirty & set( self._loaded ) ):
+            self._save( year, streaks )
+
+### archive.py ends here
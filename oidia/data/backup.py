@@ -0,0 +1,242 @@
+"""Provides incremental, deduplicated backups of the streak data."""
+
+##############################################################################
+# Python imports.
+from datetime        import datetime, timedelta
+from hashlib         import sha256
+from json            import dump, dumps, loads
+from pathlib         import Path
+from typing          import Any, Final, cast
+
+##############################################################################
+class BackupError( Exception ):
+    """Exception raised when there is a problem with the backups."""
+
+##############################################################################
+class Backups:
+    """Rolling, content-addressed snapshots of the streak data.
+
+    Each streak in the data file, and each archived year, is stored as an
+    object named after the hash of its content; a snapshot is then just a
+    small manifest listing the objects it is made of. This means that a new
+    snapshot only adds objects for the streaks and years that changed since
+    any earlier snapshot, so the space used grows with the amount of
+    editing rather than with the size of the history.
+    """
+
+    INTERVAL: Final = timedelta( hours=1 )
+    """timedelta: How long to wait after a snapshot before taking another automatically."""
+
+    KEEP_RECENT: Final = 10
+    """int: The number of most recent snapshots that are always kept."""
+
+    KEEP_DAILY: Final = 14
+    """int: The number of days for which the last snapshot of the day is kept."""
+
+    KEEP_MONTHLY: Final = 12
+    """int: The number of months for which the last snapshot of the month is kept."""
+
+    NAME_FORMAT: Final = "%Y%m%d-%H%M%S-%f"
+    """str: The format of the name of a snapshot."""
+
+    def __init__( self, directory: Path, data_file: Path, archive_directory: Path ) -> None:
+        """Initialise the backups.
+
+        Args:
+            directory (Path): The directory that holds the backups.
+            data_file (Path): The data file being backed up.
+            archive_directory (Path): The archive directory being backed up.
+        """
+        self._objects   = directory / "objects"
+        self._snapshots = directory / "snapshots"
+        self._data_file = data_file
+        self._archive   = archive_directory
+        self._last: datetime | None = None
+
+    @property
+    def snapshots( self ) -> list[ str ]:
+        """list[ str ]: The names of the snapshots, oldest first."""
+        return sorted( snapshot.stem for snapshot in self._snapshots.glob( "*.json" ) )
+
+    def _object( self, digest: str ) -> Path:
+        """Get the path for an object.
+
+        Args:
+            digest (str): The hash of the object.
+
+        Returns:
+            Path: The path to the object.
+        """
+        return self._objects / digest[ :2 ] / digest
+
+    def _store( self, content: bytes ) -> str:
+        """Store an object, if it isn't already stored.
+
+        Args:
+            content (bytes): The content of the object.
+
+        Returns:
+            str: The hash of the object.
+        """
+        if not ( stored := self._object( digest := sha256( content ).hexdigest() ) ).exists():
+            stored.parent.mkdir( parents=True, exist_ok=True )
+            stored.write_bytes( content )
+        return digest
+
+    def _read( self, digest: str ) -> bytes:
+        """Read an object.
+
+        Args:
+            digest (str): The hash of the object.
+
+        Returns:
+            bytes: The content of the object.
+
+        Raises:
+            BackupError: If the object is missing.
+        """
+        try:
+            return self._object( digest ).read_bytes()
+        except FileNotFoundError:
+            raise BackupError( f"Backup object {digest} is missing" ) from None
+
+    def _manifest( self, name: str ) -> dict[ str, Any ]:
+        """Read the manifest of a snapshot.
+
+        Args:
+            name (str): The name of the snapshot.
+
+        Returns:
+            dict[ str, Any ]: The manifest.
+
+        Raises:
+            BackupError: If there is no such snapshot.
+        """
+        try:
+            return cast( dict[ str, Any ], loads( ( self._snapshots / f"{name}.json" ).read_text( encoding="utf-8" ) ) )
+        except FileNotFoundError:
+            raise BackupError( f"There is no snapshot called {name}" ) from None
+
+    def snapshot( self, force: bool=False ) -> str | None:
+        """Take a snapshot of the data.
+
+        Args:
+            force (bool): Take the snapshot even if one was taken recently.
+
+        Returns:
+            str | None: The name of the snapshot, or `None` if no snapshot
+                was needed.
+
+        Note:
+            No snapshot is taken if nothing has changed since the last
+            one, and unless forced none is taken if the last one is more
+            recent than `INTERVAL`. Taking a snapshot also applies the
+            retention policy.
+        """
+        now = datetime.now()
+        if self._last is None and ( snapshots := self.snapshots ):
+            self._last = datetime.strptime( snapshots[ -1 ], self.NAME_FORMAT )
+        if not force and self._last is not None and now - self._last < self.INTERVAL:
+            return None
+        if not self._data_file.exists():
+            return None
+        manifest = {
+            "streaks": [
+                self._store( dumps( streak, sort_keys=True, separators=( ",", ":" ) ).encode( "utf-8" ) )
+                for streak in loads( self._data_file.read_text( encoding="utf-8" ) )
+            ],
+            "archive": {
+                archive.stem: self._store( archive.read_bytes() )
+                for archive in sorted( self._archive.glob( "*.json" ) ) if archive.stem.isdigit()
+            }
+        }
+        self._last = now
+        if ( snapshots := self.snapshots ) and self._manifest( snapshots[ -1 ] ) == manifest:
+            return None
+        self._snapshots.mkdir( parents=True, exist_ok=True )
+        name = now.strftime( self.NAME_FORMAT )
+        with ( self._snapshots / f"{name}.json" ).open( "w", encoding="utf-8" ) as snapshot:
+            dump( manifest, snapshot )
+        self.prune()
+        return name
+
+    def _keep( self, snapshots: list[ str ] ) -> set[ str ]:
+        """Work out which snapshots the retention policy keeps.
+
+        Args:
+            snapshots (list[ str ]): The names of the snapshots, oldest first.
+
+        Returns:
+            set[ str ]: The names of the snapshots to keep.
+        """
+        keep  = set( snapshots[ -self.KEEP_RECENT: ] )
+        days: dict[ str, str ]   = {}
+        months: dict[ str, str ] = {}
+        for name in snapshots:
+            days[ name[ :8 ] ]   = name
+            months[ name[ :6 ] ] = name
+        keep.update( days[ day ] for day in sorted( days )[ -self.KEEP_DAILY: ] )
+        keep.update( months[ month ] for month in sorted( months )[ -self.KEEP_MONTHLY: ] )
+        return keep
+
+    def prune( self ) -> None:
+        """Apply the retention policy to the snapshots.
+
+        Note:
+            Along with the most recent snapshots, the last snapshot of each
+            of the most recent days, and the last snapshot of each of the
+            most recent months, are kept. Any objects that are no longer
+            part of a snapshot are removed.
+        """
+        keep = self._keep( snapshots := self.snapshots )
+        for name in snapshots:
+            if name not in keep:
+                ( self._snapshots / f"{name}.json" ).unlink()
+        used: set[ str ] = set()
+        for name in keep:
+            manifest = self._manifest( name )
+            used.update( manifest[ "streaks" ], manifest[ "archive" ].values() )
+        for stored in self._objects.glob( "*/*" ):
+            if stored.name not in used:
+                stored.unlink()
+
+    def restore( self, name: str ) -> None:
+        """Restore the data from a snapshot.
+
+        Args:
+            name (str): The name of the snapshot to restore.
+
+        Raises:
+            BackupError: If the snapshot can't be restored.
+
+        Note:
+            Before the data is replaced a snapshot is taken of it as it
+            is, so that a restore can itself be undone.
+        """
+        manifest = self._manifest( name )
+        streaks  = [ loads( self._read( digest ) ) for digest in manifest[ "streaks" ] ]
+        archive  = { year: self._read( digest ) for year, digest in manifest[ "archive" ].items() }
+        self.snapshot( force=True )
+        with self._data_file.open( "w", encoding="utf-8" ) as data:
+            dump( streaks, data, indent=4 )
+        self._archive.mkdir( parents=True, exist_ok=True )
+        for year_file in self._archive.glob( "*.json" ):
+            if year_file.stem not in archive:
+                year_file.unlink()
+        for year, content in archive.items():
+            ( self._archive / f"{year}.json" ).write_bytes( content )
+
+    def describe( self, name: str ) -> tuple[ int, list[ str ] ]:
+        """Describe a snapshot.
+
+        Args:
+            name (str): The name of the snapshot.
+
+        Returns:
+            tuple[ int, list[ str ] ]: The number of streaks in the
+                snapshot, and the archived years it holds.
+        """
+        manifest = self._manifest( name )
+        return len( manifest[ "streaks" ] ), sorted( manifest[ "archive" ] )
+
+### backup.py ends here
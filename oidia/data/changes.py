@@ -0,0 +1,146 @@
+"""Provides the means of making and recording changes to streak data."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Iterable
+from datetime        import date, timedelta
+from typing          import Any, NamedTuple, TypeAlias
+
+##############################################################################
+# Local imports.
+from .streak import Streak
+
+##############################################################################
+class DayChange( NamedTuple ):
+    """A record of a change to the done count of a day of a streak."""
+
+    key: str
+    """str: The key of the streak that was changed."""
+
+    day: date
+    """date: The day that was changed."""
+
+    before: int
+    """int: The done count before the change."""
+
+    after: int
+    """int: The done count after the change."""
+
+##############################################################################
+class TitleChange( NamedTuple ):
+    """A record of a change to the title of a streak."""
+
+    key: str
+    """str: The key of the streak that was changed."""
+
+    before: str
+    """str: The title before the change."""
+
+    after: str
+    """str: The title after the change."""
+
+##############################################################################
+class OrderChange( NamedTuple ):
+    """A record of a change to the order of a list of streaks."""
+
+    group: str
+    """str: The group whose streaks were reordered, or empty for the ungrouped streaks."""
+
+    before: tuple[ str, ... ]
+    """tuple[ str, ... ]: The keys of the streaks in their order before the change."""
+
+    after: tuple[ str, ... ]
+    """tuple[ str, ... ]: The keys of the streaks in their order after the change."""
+
+##############################################################################
+class StreakChange( NamedTuple ):
+    """A record of a streak being added or deleted."""
+
+    data: dict[ str, Any ]
+    """dict[ str, Any ]: The data for the streak, as made by `Streak.to_dict`.
+
+    For a streak that was deleted, this also holds any notes the streak had,
+    under `notes`, keyed by the ordinal of the day.
+    """
+
+    position: int
+    """int: The position of the streak within its group."""
+
+    added: bool
+    """bool: `True` if the streak was added, `False` if it was deleted."""
+
+##############################################################################
+Change: TypeAlias = DayChange | TitleChange | OrderChange | StreakChange
+"""The type of a record of a change to the streak data."""
+
+##############################################################################
+def invert( change: Change ) -> Change:
+    """Get the change that undoes a given change.
+
+    Args:
+        change (Change): The change to invert.
+
+    Returns:
+        Change: The change that undoes it.
+    """
+    if isinstance( change, DayChange ):
+        return change._replace( before=change.after, after=change.before )
+    if isinstance( change, TitleChange ):
+        return change._replace( before=change.after, after=change.before )
+    if isinstance( change, OrderChange ):
+        return change._replace( before=change.after, after=change.before )
+    return change._replace( added=not change.added )
+
+##############################################################################
+def change_size( change: Change ) -> int:
+    """Estimate how much memory a record of a change takes up.
+
+    Args:
+        change (Change): The change to size.
+
+    Returns:
+        int: A rough estimate of the size of the change, in bytes.
+
+    Note:
+        This is only intended to be good enough to keep the history of
+        changes within a memory budget; it isn't an exact accounting.
+    """
+    if isinstance( change, DayChange ):
+        return 200
+    if isinstance( change, TitleChange ):
+        return 200 + len( change.before ) + len( change.after )
+    if isinstance( change, OrderChange ):
+        return 200 + 100 * ( len( change.before ) + len( change.after ) )
+    return (
+        500 + len( str( change.data.get( "title", "" ) ) ) + 150 * len( change.data.get( "days", {} ) )
+        + sum( 100 + len( text ) for text in change.data.get( "notes", {} ).values() )
+    )
+
+##############################################################################
+def mark_days( streaks: Iterable[ Streak ], start: date, end: date, adjust: int | None ) -> list[ DayChange ]:
+    """Adjust the done counts for a range of days across some streaks.
+
+    Args:
+        streaks (Iterable[ Streak ]): The streaks to adjust.
+        start (date): The first day to adjust.
+        end (date): The last day to adjust.
+        adjust (int | None): The amount to adjust each count by, or `None` to clear them.
+
+    Returns:
+        list[ DayChange ]: The changes that were made.
+
+    Note:
+        Counts never go below zero, and days whose count doesn't actually
+        change aren't touched or recorded.
+    """
+    changes: list[ DayChange ] = []
+    days = [ start + timedelta( days=offset ) for offset in range( ( end - start ).days + 1 ) ]
+    for streak in streaks:
+        for day in days:
+            before = streak[ day ]
+            if ( after := 0 if adjust is None else max( 0, before + adjust ) ) != before:
+                streak[ day ] = after
+                changes.append( DayChange( streak.key, day, before, after ) )
+    return changes
+
+### changes.py ends here
@@ -0,0 +1,110 @@
+"""Provides named datasets of streaks, with the most recently used kept loaded."""
+
+##############################################################################
+# Python imports.
+import re
+from collections import OrderedDict
+from pathlib     import Path
+from typing      import Final
+
+##############################################################################
+# Local imports.
+from .storage import Storage
+from .store   import Store
+
+##############################################################################
+class Datasets:
+    """The named datasets that streaks can be kept in.
+
+    The default dataset lives in the data directory itself, just as the
+    data always has; every other dataset has a directory of its own. The
+    stores of the most recently used datasets are kept on a
+    least-recently-used basis, so going back to one of them needs no
+    loading at all; a store is saved as it's dropped.
+    """
+
+    DEFAULT: Final = "default"
+    """str: The name of the default dataset."""
+
+    DIRECTORY: Final = Path( "datasets" )
+    """Path: The name of the directory that holds the datasets other than the default."""
+
+    NAME: Final = re.compile( r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}" )
+    """Pattern: The pattern that the name of a dataset has to match."""
+
+    def __init__( self, directory: Path, capacity: int=3 ) -> None:
+        """Initialise the datasets.
+
+        Args:
+            directory (Path): The data directory.
+            capacity (int): The number of datasets to keep loaded.
+        """
+        self._directory = directory
+        self._capacity  = capacity
+        self._stores: OrderedDict[ str, Store ] = OrderedDict()
+
+    @property
+    def names( self ) -> list[ str ]:
+        """list[ str ]: The names of the datasets, the default first."""
+        return [ self.DEFAULT, *sorted(
+            dataset.name for dataset in ( self._directory / self.DIRECTORY ).glob( "*" )
+            if dataset.is_dir() and dataset.name != self.DEFAULT and self.NAME.fullmatch( dataset.name )
+        ) ]
+
+    @property
+    def loaded( self ) -> list[ str ]:
+        """list[ str ]: The names of the datasets that are loaded, least recently used first."""
+        return list( self._stores )
+
+    def storage( self, name: str ) -> Storage:
+        """Get the storage for a dataset.
+
+        Args:
+            name (str): The name of the dataset.
+
+        Returns:
+            Storage: The storage for the dataset.
+
+        Raises:
+            ValueError: If the name of the dataset isn't valid.
+
+        Note:
+            If the dataset doesn't exist yet its directory is created.
+        """
+        if not self.NAME.fullmatch( name ):
+            raise ValueError( f"{name!r} isn't a valid dataset name" )
+        if name == self.DEFAULT:
+            return Storage( self._directory )
+        ( directory := self._directory / self.DIRECTORY / name ).mkdir( parents=True, exist_ok=True )
+        return Storage( directory )
+
+    def store( self, name: str ) -> Store:
+        """Get the store for a dataset.
+
+        Args:
+            name (str): The name of the dataset.
+
+        Returns:
+            Store: The store for the dataset.
+
+        Raises:
+            ValueError: If the name of the dataset isn't valid.
+
+        Note:
+            If there are more datasets loaded than there's room for, the
+            least recently used is saved and dropped.
+        """
+        if name in self._stores:
+            self._stores.move_to_end( name )
+        else:
+            self._stores[ name ] = Store( self.storage( name ) )
+            while len( self._stores ) > self._capacity:
+                self._stores.popitem( last=False )[ 1 ].flush()
+        return self._stores[ name ]
+
+    def flush( self ) -> None:
+        """Save any changes that haven't been saved yet, for every loaded dataset."""
+        for store in self._stores.values():
+            store.flush()
+
+### datasets.py ends here
@@ -0,0 +1,110 @@
+"""Provides a bounded history of changes, for undo and redo."""
+
+##############################################################################
+# Python imports.
+from collections     import deque
+from collections.abc import Iterable
+from typing          import Final
+
+##############################################################################
+# Local imports.
+from .changes import Change, change_size, invert
+
+##############################################################################
+Operation = tuple[ Change, ... ]
+"""The type of a single undoable operation: the changes it was made of, in order."""
+
+##############################################################################
+class History:
+    """A history of changes made to the streaks, for undo and redo.
+
+    Each operation is held as just the changes it made, rather than as a
+    copy of the data. The history is kept within a memory budget, with the
+    oldest operations being forgotten once the budget is exceeded.
+    """
+
+    DEFAULT_BUDGET: Final = 4 * 1024 * 1024
+    """int: The default memory budget for the history, in bytes."""
+
+    def __init__( self, budget: int=DEFAULT_BUDGET ) -> None:
+        """Initialise the history.
+
+        Args:
+            budget (int): The memory budget for the history, in bytes.
+        """
+        self._budget = budget
+        self._undo: deque[ tuple[ Operation, int ] ] = deque()
+        self._redo: list[ tuple[ Operation, int ] ] = []
+        self._size = 0
+
+    @property
+    def size( self ) -> int:
+        """int: The estimated size of the history, in bytes."""
+        return self._size
+
+    @property
+    def can_undo( self ) -> bool:
+        """bool: Is there an operation that can be undone?"""
+        return bool( self._undo )
+
+    @property
+    def can_redo( self ) -> bool:
+        """bool: Is there an operation that can be redone?"""
+        return bool( self._redo )
+
+    def _trim( self ) -> None:
+        """Forget the oldest operations until the history is within budget."""
+        while self._size > self._budget and self._undo:
+            self._size -= self._undo.popleft()[ 1 ]
+
+    def record( self, changes: Iterable[ Change ] ) -> None:
+        """Record an operation.
+
+        Args:
+            changes (Iterable[ Change ]): The changes that made up the operation.
+
+        Note:
+            Recording an operation forgets anything that could have been
+            redone. An operation with no changes isn't recorded.
+        """
+        if operation := tuple( changes ):
+            self._size -= sum( size for _, size in self._redo )
+            self._redo.clear()
+            size = sum( change_size( change ) for change in operation )
+            self._undo.append( ( operation, size ) )
+            self._size += size
+            self._trim()
+
+    def undo( self ) -> Operation:
+        """Undo the most recent operation.
+
+        Returns:
+            Operation: The changes to apply to undo the operation, in the
+                order they should be applied; empty if there was nothing
+                to undo.
+        """
+        if not self._undo:
+            return ()
+        self._redo.append( entry := self._undo.pop() )
+        return tuple( invert( change ) for change in reversed( entry[ 0 ] ) )
+
+    def redo( self ) -> Operation:
+        """Redo the most recently undone operation.
+
+        Returns:
+            Operation: The changes to apply to redo the operation, in the
+                order they should be applied; empty if there was nothing
+                to redo.
+        """
+        if not self._redo:
+            return ()
+        self._undo.append( entry := self._redo.pop() )
+        return entry[ 0 ]
+
+    def clear( self ) -> None:
+        """Forget all of the history."""
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+### history.py ends here
@@ -0,0 +1,200 @@
+"""Provides lazily-loaded notes attached to the days of streaks."""
+
+##############################################################################
+# Python imports.
+from collections     import OrderedDict
+from collections.abc import Mapping
+from datetime        import date
+from hashlib         import sha256
+from json            import dump, loads
+from pathlib         import Path
+from typing          import Final
+
+##############################################################################
+class Notes:
+    """Short notes attached to individual days of streaks.
+
+    The notes are kept apart from the streak data, so however many there
+    are they add nothing to loading or saving the streaks. An index of
+    which days of which streaks have notes is read the first time it's
+    needed, and holds nothing but the ordinals of the days; the text of
+    the notes for a streak lives in a file of its own, and is only read
+    when a note is actually looked at. Streaks whose notes were read are
+    kept in memory on a least-recently-used basis.
+    """
+
+    INDEX_FILE: Final = Path( "index.json" )
+    """Path: The name of the file that holds the index of the notes."""
+
+    def __init__( self, directory: Path, capacity: int=8 ) -> None:
+        """Initialise the notes.
+
+        Args:
+            directory (Path): The directory that holds the notes.
+            capacity (int): The number of streaks whose notes are kept loaded.
+        """
+        self._directory = directory
+        self._capacity  = capacity
+        self._index: dict[ str, set[ int ] ] | None = None
+        self._loaded: OrderedDict[ str, dict[ int, str ] ] = OrderedDict()
+
+    @property
+    def index( self ) -> dict[ str, set[ int ] ]:
+        """dict[ str, set[ int ] ]: The ordinals of the days with notes, for each streak key.
+
+        The index is read from storage the first time it's asked for.
+        """
+        if self._index is None:
+            index_file  = self._directory / self.INDEX_FILE
+            self._index = {
+                key: set( days ) for key, days in loads( index_file.read_text( encoding="utf-8" ) ).items()
+            } if index_file.exists() else {}
+        return self._index
+
+    def _file( self, key: str ) -> Path:
+        """Get the file for the notes of a given streak.
+
+        Args:
+            key (str): The key of the streak.
+
+        Returns:
+            Path: The path to the file of notes for the streak.
+
+        Note:
+            The name of the file is made from a hash of the key, so that
+            whatever a key is it makes for a safe file name.
+        """
+        return self._directory / f"{sha256( key.encode( 'utf-8' ) ).hexdigest()[ :32 ]}.json"
+
+    def _notes( self, key: str ) -> dict[ int, str ]:
+        """Get the notes for a given streak, reading them if need be.
+
+        Args:
+            key (str): The key of the streak.
+
+        Returns:
+            dict[ int, str ]: The text of the notes, keyed by the ordinal of the day.
+        """
+        if key in self._loaded:
+            self._loaded.move_to_end( key )
+        else:
+            notes_file = self._file( key )
+            self._loaded[ key ] = {
+                int( day ): text for day, text in loads( notes_file.read_text( encoding="utf-8" ) ).items()
+            } if notes_file.exists() else {}
+            while len( self._loaded ) > self._capacity:
+                self._loaded.popitem( last=False )
+        return self._loaded[ key ]
+
+    async def fetch( self, key: str ) -> None:
+        """Make sure the notes for a streak are at hand, ready to be read.
+
+        Args:
+            key (str): The key of the streak.
+
+        Note:
+            Notes are read from storage as they're needed, so there is
+            nothing to do here; notes that live elsewhere are fetched.
+        """
+
+    def noted( self, key: str, start: date, end: date | None=None ) -> bool:
+        """Are there any notes for a streak within a range of days?
+
+        Args:
+            key (str): The key of the streak.
+            start (date): The first day to check.
+            end (date | None): The day after the last day to check; just `start` is checked if not given.
+
+        Returns:
+            bool: `True` if any of the days has a note, `False` if not.
+
+        Note:
+            This only ever looks at the index; no notes are read.
+        """
+        if not ( days := self.index.get( key ) ):
+            return False
+        first = start.toordinal()
+        if end is None:
+            return first in days
+        last = end.toordinal()
+        return any( first <= day < last for day in days )
+
+    def get( self, key: str, day: date ) -> str:
+        """Get the note for a day of a streak.
+
+        Args:
+            key (str): The key of the streak.
+            day (date): The day.
+
+        Returns:
+            str: The text of the note, or an empty string if there isn't one.
+        """
+        if not self.noted( key, day ):
+            return ""
+        return self._notes( key ).get( day.toordinal(), "" )
+
+    def of_streak( self, key: str ) -> dict[ int, str ]:
+        """Get every note for a streak.
+
+        Args:
+            key (str): The key of the streak.
+
+        Returns:
+            dict[ int, str ]: The text of the notes, keyed by the ordinal of the day.
+        """
+        return dict( self._notes( key ) ) if key in self.index else {}
+
+    def set( self, key: str, day: date, text: str ) -> None:
+        """Set the note for a day of a streak.
+
+        Args:
+            key (str): The key of the streak.
+            day (date): The day.
+            text (str): The text of the note; an empty note removes it.
+
+        Note:
+            Only the index and the file of notes for the streak are saved.
+        """
+        notes = self._notes( key )
+        if text:
+            notes[ day.toordinal() ] = text
+        else:
+            notes.pop( day.toordinal(), None )
+        self._save( key, notes )
+
+    def replace( self, key: str, notes: Mapping[ int, str ] ) -> None:
+        """Replace every note for a streak.
+
+        Args:
+            key (str): The key of the streak.
+            notes (Mapping[ int, str ]): The text of the notes, keyed by the ordinal of the day; none removes them all.
+
+        Note:
+            Only the index and the file of notes for the streak are saved.
+        """
+        loaded = self._notes( key )
+        loaded.clear()
+        loaded.update( notes )
+        self._save( key, loaded )
+
+    def _save( self, key: str, notes: dict[ int, str ] ) -> None:
+        """Save the notes for a streak, along with the index.
+
+        Args:
+            key (str): The key of the streak.
+            notes (dict[ int, str ]): The text of every note for the streak, keyed by the ordinal of the day.
+        """
+        if notes:
+            self.index[ key ] = set( notes )
+        else:
+            self.index.pop( key, None )
+        self._directory.mkdir( parents=True, exist_ok=True )
+        if notes:
+            with self._file( key ).open( "w", encoding="utf-8" ) as notes_file:
+                dump( { str( day ): text for day, text in sorted( notes.items() ) }, notes_file, indent=4 )
+        else:
+            self._file( key ).unlink( missing_ok=True )
+        with ( self._directory / self.INDEX_FILE ).open( "w", encoding="utf-8" ) as index_file:
+            dump( { key: sorted( days ) for key, days in self.index.items() }, index_file )
+
+### notes.py ends here
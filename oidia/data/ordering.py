@@ -0,0 +1,162 @@
+"""Provides the orders that streaks can be sorted into."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterable
+from datetime        import date, timedelta
+from enum            import Enum
+from typing          import Any
+
+##############################################################################
+# Local imports.
+from .archive import Archive
+from .streak  import Streak
+
+##############################################################################
+class SortOrder( Enum ):
+    """The orders that streaks can be sorted into."""
+
+    TITLE = "title"
+    """Sorted by title, alphabetically."""
+
+    ACTIVITY = "activity"
+    """Sorted by most recent activity, most recent first."""
+
+    TOTAL = "total"
+    """Sorted by total done count, highest first."""
+
+    RUN = "run"
+    """Sorted by the length of the current run of days, longest first."""
+
+    @property
+    def next( self ) -> "SortOrder":
+        """SortOrder: The sort order that follows this one."""
+        orders = list( SortOrder )
+        return orders[ ( orders.index( self ) + 1 ) % len( orders ) ]
+
+##############################################################################
+def last_active( streak: Streak, archive: Archive ) -> date:
+    """Get the last day a streak was done.
+
+    Args:
+        streak (Streak): The streak to check.
+        archive (Archive): The archive of the streak's old years.
+
+    Returns:
+        date: The last day the streak was done, or `date.min` if it never was.
+    """
+    first = archive.first_hot_day
+    if ( last := max( ( day for day in streak.days if day >= first ), default=date.min ) ) >= first:
+        return last
+    return archive.summary( streak ).last
+
+##############################################################################
+def total_done( streak: Streak, archive: Archive ) -> int:
+    """Get the total done count for the whole history of a streak.
+
+    Args:
+        streak (Streak): The streak to check.
+        archive (Archive): The archive of the streak's old years.
+
+    Returns:
+        int: The total done count.
+    """
+    first = archive.first_hot_year
+    return sum(
+        total for year, total in streak.year_totals.items() if year >= first
+    ) + archive.summary( streak ).total
+
+##############################################################################
+def current_run( streak: Streak, archive: Archive, today: date | None=None ) -> int:
+    """Get the length of the current run of days for a streak.
+
+    Args:
+        streak (Streak): The streak to check.
+        archive (Archive): The archive of the streak's old years.
+        today (date | None): The day to count back from.
+
+    Returns:
+        int: The number of consecutive days the streak has been done.
+
+    Note:
+        A run that ended yesterday is still counted as current, as today
+        may simply not have been done yet.
+    """
+    first = archive.first_hot_day
+    day   = today or date.today()
+    if not streak[ day ]:
+        day -= timedelta( days=1 )
+    run = 0
+    while day >= first and streak[ day ]:
+        run += 1
+        day -= timedelta( days=1 )
+    if day < first:
+        # The run goes back into the archive, so carry on with the run
+        # the archive ended with.
+        run += archive.summary( streak ).run
+    return run
+
+##############################################################################
+def sort_key( order: SortOrder, archive: Archive ) -> Callable[ [ Streak ], Any ]:
+    """Get the key function for a sort order.
+
+    Args:
+        order (SortOrder): The order to get the key function for.
+        archive (Archive): The archive of the streaks' old years.
+
+    Returns:
+        Callable[ [ Streak ], Any ]: The key function.
+
+    Note:
+        Keys for the orders that put the largest values first are negated
+        so that every order can be sorted ascending.
+    """
+    if order is SortOrder.TITLE:
+        return lambda streak: streak.title.casefold()
+    if order is SortOrder.ACTIVITY:
+        return lambda streak: -last_active( streak, archive ).toordinal()
+    if order is SortOrder.TOTAL:
+        return lambda streak: -total_done( streak, archive )
+    today = date.today()
+    return lambda streak: -current_run( streak, archive, today )
+
+##############################################################################
+def sort_streaks( streaks: Iterable[ Streak ], order: SortOrder, archive: Archive ) -> list[ Streak ]:
+    """Sort some streaks into the given order.
+
+    Args:
+        streaks (Iterable[ Streak ]): The streaks to sort.
+        order (SortOrder): The order to sort them into.
+        archive (Archive): The archive of the streaks' old years.
+
+    Returns:
+        list[ Streak ]: The sorted streaks.
+
+    Note:
+        The sort is stable, so streaks that are equal for the given order
+        keep their current order relative to each other. The key for each
+        streak is worked out just the once, from the years that are never
+        archived and the archive's summaries of the rest, so the order
+        doesn't depend on which archived years happen to be loaded.
+    """
+    return sorted( streaks, key=sort_key( order, archive ) )
+
+##############################################################################
+def in_order( streaks: Iterable[ Streak ], keys: Iterable[ str ] ) -> list[ Streak ]:
+    """Put some streaks into the order given by a list of keys.
+
+    Args:
+        streaks (Iterable[ Streak ]): The streaks to put in order.
+        keys (Iterable[ str ]): The keys of the streaks, in the order wanted.
+
+    Returns:
+        list[ Streak ]: The streaks in order.
+
+    Note:
+        Any streaks whose keys aren't in `keys` end up after those that
+        are, in their current order.
+    """
+    positions = { key: position for position, key in enumerate( keys ) }
+    return sorted( streaks, key=lambda streak: positions.get( streak.key, len( positions ) ) )
+
+### ordering.py ends here
@@ -0,0 +1,98 @@
+"""Provides the passwords of the users of the server."""
+
+##############################################################################
+# Python imports.
+from hashlib import scrypt
+from hmac    import compare_digest
+from json    import dump, loads
+from os      import urandom
+from pathlib import Path
+from typing  import Final, cast
+
+##############################################################################
+class Passwords:
+    """The passwords of the users that can log in to the server.
+
+    Passwords are never kept as they are; each one is kept as an scrypt
+    hash with a salt of its own.
+    """
+
+    SALT_SIZE: Final = 16
+    """int: The size of the salt for each password, in bytes."""
+
+    COST: Final = 2**14
+    """int: The CPU and memory cost of hashing a password."""
+
+    def __init__( self, passwords_file: Path ) -> None:
+        """Initialise the passwords.
+
+        Args:
+            passwords_file (Path): The file that holds the passwords.
+        """
+        self._file = passwords_file
+
+    def _hashes( self ) -> dict[ str, str ]:
+        """Read the hashed passwords.
+
+        Returns:
+            dict[ str, str ]: The salt and hash of each user's password, in hex, keyed by user name.
+        """
+        if self._file.exists():
+            return cast( dict[ str, str ], loads( self._file.read_text( encoding="utf-8" ) ) )
+        return {}
+
+    def _hash( self, password: str, salt: bytes ) -> bytes:
+        """Hash a password.
+
+        Args:
+            password (str): The password.
+            salt (bytes): The salt to hash it with.
+
+        Returns:
+            bytes: The hash of the password.
+        """
+        return scrypt( password.encode( "utf-8" ), salt=salt, n=self.COST, r=8, p=1 )
+
+    @property
+    def users( self ) -> list[ str ]:
+        """list[ str ]: The names of the users that have a password."""
+        return sorted( self._hashes() )
+
+    def set( self, user: str, password: str ) -> None:
+        """Set the password of a user.
+
+        Args:
+            user (str): The name of the user.
+            password (str): The password; an empty password removes the user.
+        """
+        hashes = self._hashes()
+        if password:
+            salt = urandom( self.SALT_SIZE )
+            hashes[ user ] = f"{salt.hex()}:{self._hash( password, salt ).hex()}"
+        else:
+            hashes.pop( user, None )
+        self._file.parent.mkdir( parents=True, exist_ok=True )
+        self._file.touch( mode=0o600 )
+        with self._file.open( "w", encoding="utf-8" ) as passwords_file:
+            dump( hashes, passwords_file, indent=4 )
+
+    def check( self, user: str, password: str ) -> bool:
+        """Check the password of a user.
+
+        Args:
+            user (str): The name of the user.
+            password (str): The password they gave.
+
+        Returns:
+            bool: `True` if the password is right, `False` if not.
+
+        Note:
+            A password is hashed even for a user that doesn't exist, so
+            that how long a check takes says nothing about who the users
+            are.
+        """
+        salt, _, expected = self._hashes().get( user, ":" ).partition( ":" )
+        found = self._hash( password, bytes.fromhex( salt ) or bytes( self.SALT_SIZE ) )
+        return bool( expected ) and compare_digest( found, bytes.fromhex( expected ) )
+
+### passwords.py ends here
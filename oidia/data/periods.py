@@ -0,0 +1,131 @@
+"""Provides tools for working with periods of time on a timeline."""
+
+##############################################################################
+# Python imports.
+from calendar    import monthrange
+from dataclasses import dataclass
+from datetime    import date, timedelta
+from enum        import Enum
+from typing      import ClassVar
+
+##############################################################################
+class Resolution( Enum ):
+    """The resolutions at which a timeline can be viewed."""
+
+    DAY = "day"
+    """A cell per day."""
+
+    WEEK = "week"
+    """A cell per week, with weeks starting on a Monday."""
+
+    MONTH = "month"
+    """A cell per calendar month."""
+
+##############################################################################
+def period_start( day: date, resolution: Resolution ) -> date:
+    """Get the start of the period that contains the given day.
+
+    Args:
+        day (date): The day to find the period for.
+        resolution (Resolution): The resolution of the period.
+
+    Returns:
+        date: The first day of the period that contains `day`.
+    """
+    if resolution is Resolution.WEEK:
+        return day - timedelta( days=day.weekday() )
+    if resolution is Resolution.MONTH:
+        return day.replace( day=1 )
+    return day
+
+##############################################################################
+def shift_period( day: date, resolution: Resolution, periods: int ) -> date:
+    """Shift a day by a number of periods.
+
+    Args:
+        day (date): The day to shift.
+        resolution (Resolution): The resolution of the periods.
+        periods (int): The number of periods to shift by.
+
+    Returns:
+        date: The shifted day.
+
+    Note:
+        When shifting by months the day of the month is clamped to the
+        length of the target month.
+    """
+    if resolution is Resolution.WEEK:
+        return day + timedelta( weeks=periods )
+    if resolution is Resolution.MONTH:
+        year, month = divmod( ( day.year * 12 ) + day.month - 1 + periods, 12 )
+        return day.replace(
+            year  = year,
+            month = month + 1,
+            day   = min( day.day, monthrange( year, month + 1 )[ 1 ] )
+        )
+    return day + timedelta( days=periods )
+
+##############################################################################
+@dataclass( frozen=True )
+class TimeSpan:
+    """The span of time covered by a timeline."""
+
+    resolution: Resolution = Resolution.DAY
+    """Resolution: The resolution of each cell in the timeline."""
+
+    length: int = 7
+    """int: The number of cells in the timeline."""
+
+    LIMITS: ClassVar[ dict[ Resolution, tuple[ int, int ] ] ] = {
+        Resolution.DAY:   ( 1, 31 ),
+        Resolution.WEEK:  ( 5, 52 ),
+        Resolution.MONTH: ( 13, 120 )
+    }
+    """dict[ Resolution, tuple[ int, int ] ]: The minimum and maximum lengths for each resolution."""
+
+    ORDER: ClassVar[ tuple[ Resolution, ... ] ] = ( Resolution.DAY, Resolution.WEEK, Resolution.MONTH )
+    """tuple[ Resolution, ... ]: The resolutions, from finest to coarsest."""
+
+    def zoomed( self, steps: int ) -> "TimeSpan":
+        """Get the time span that results from zooming this one.
+
+        Args:
+            steps (int): The number of cells to zoom by.
+
+        Returns:
+            TimeSpan: The new time span.
+
+        Note:
+            A positive number of steps zooms out, a negative number zooms
+            in. When zooming takes the length past the limits for the
+            current resolution the span switches to the next coarser or
+            finer resolution. Zooming stops once the span can go no
+            further, however many steps are left.
+        """
+        span      = self
+        direction = 1 if steps > 0 else -1
+        for _ in range( abs( steps ) ):
+            if ( stepped := span.stepped( direction ) ) == span:
+                break
+            span = stepped
+        return span
+
+    def stepped( self, direction: int ) -> "TimeSpan":
+        """Get the time span that results from zooming this one by a single step.
+
+        Args:
+            direction (int): The direction to zoom in.
+
+        Returns:
+            TimeSpan: The new time span.
+        """
+        shortest, longest = self.LIMITS[ self.resolution ]
+        if shortest <= ( length := self.length + direction ) <= longest:
+            return TimeSpan( self.resolution, length )
+        neighbour = self.ORDER.index( self.resolution ) + direction
+        if 0 <= neighbour < len( self.ORDER ):
+            resolution = self.ORDER[ neighbour ]
+            return TimeSpan( resolution, self.LIMITS[ resolution ][ 0 if direction > 0 else 1 ] )
+        return self
+
+### periods.py ends here
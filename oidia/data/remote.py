@@ -0,0 +1,863 @@
+"""Provides a store of streaks that is shared with sessions running in other processes."""
+
+##############################################################################
+# Python imports.
+from asyncio         import (
+    Future, StreamReader, StreamWriter, create_task, gather, get_running_loop, open_connection, sleep
+)
+from collections     import Counter, deque
+from collections.abc import Callable, Iterable, Mapping
+from contextlib      import suppress
+from datetime        import date
+from json            import dumps, loads
+from pathlib         import Path
+from socket          import socket
+from typing          import Any, Final, cast
+
+##############################################################################
+# Local imports.
+from .archive import Archive, Summary
+from .notes   import Notes
+from .storage import Storage
+from .store   import Store
+from .streak  import Streak
+
+##############################################################################
+Message = dict[ str, Any ]
+"""The type of a message passed between a session and the server."""
+
+##############################################################################
+class RemoteError( Exception ):
+    """Type of exception raised when the server can't do what a session asked."""
+
+##############################################################################
+class Connection:
+    """The connection between a session and the server that holds its store.
+
+    Each message is a line of JSON. A session sends requests, and the
+    server replies to them in the order that they were sent; the server
+    can also send messages of its own, telling the session about changes
+    made by other sessions. Both come down the one connection, so a
+    session always sees them in the order that the server dealt with them.
+    Nothing here ever blocks the session's event loop: a request can be
+    sent without waiting for the reply, or the reply can be awaited.
+    """
+
+    LIMIT: Final = 1 << 24
+    """int: The longest message that can be received, in bytes."""
+
+    def __init__( self, reader: StreamReader, writer: StreamWriter ) -> None:
+        """Initialise the connection.
+
+        Args:
+            reader (StreamReader): The stream that the server's messages are read from.
+            writer (StreamWriter): The stream that requests are written to.
+        """
+        self._reader  = reader
+        self._writer  = writer
+        self._closed  = False
+        self._replies: deque[ Future[ Message ] ] = deque()
+        self._news: Callable[ [ Message ], None ] | None = None
+        self._listening = create_task( self._listen() )
+
+    @classmethod
+    async def open( cls, connection: socket ) -> "Connection":
+        """Open a connection over a socket.
+
+        Args:
+            connection (socket): The socket connected to the server.
+
+        Returns:
+            Connection: The connection.
+        """
+        return cls( *await open_connection( sock=connection, limit=cls.LIMIT ) )
+
+    def listen( self, news: Callable[ [ Message ], None ] ) -> None:
+        """Start passing on the news that the server sends.
+
+        Args:
+            news (Callable[ [ Message ], None ]): The function to call with each piece of news from the server.
+
+        Note:
+            Any news that arrives before anyone listens is dropped.
+        """
+        self._news = news
+
+    async def _listen( self ) -> None:
+        """Listen to what the server sends, until it goes away.
+
+        Note:
+            Once a reply has been handed over, whoever is waiting for it
+            gets to carry on before anything that arrived after it is
+            looked at; so news that follows a reply is always applied on
+            top of it, never underneath it.
+        """
+        with suppress( ConnectionError, ValueError ):
+            while line := await self._reader.readline():
+                message = cast( Message, loads( line ) )
+                if "news" in message:
+                    if self._news is not None:
+                        self._news( message[ "news" ] )
+                    continue
+                if ( reply := self._replies.popleft() ).done():
+                    continue
+                if "error" in message:
+                    reply.set_exception( RemoteError( message[ "error" ] ) )
+                else:
+                    reply.set_result( cast( Message, message[ "reply" ] ) )
+                await sleep( 0 )
+        self._closed = True
+        while self._replies:
+            if not ( reply := self._replies.popleft() ).done():
+                reply.set_exception( RemoteError( "The server has gone away" ) )
+
+    def send( self, request: str, **arguments: Any ) -> "Future[ Message ]":
+        """Send a request to the server, without waiting for the reply.
+
+        Args:
+            request (str): The name of the request.
+            arguments (Any): The arguments of the request.
+
+        Returns:
+            Future[ Message ]: The reply from the server, once it arrives.
+
+        Raises:
+            RemoteError: If the server has gone away.
+
+        Note:
+            If the server can't carry out the request the reply is a
+            `RemoteError`; nobody has to wait for a reply that they have
+            no use for.
+        """
+        if self._closed:
+            raise RemoteError( "The server has gone away" )
+        self._writer.write( dumps( { "request": request, **arguments } ).encode( "utf-8" ) + b"\n" )
+        self._replies.append( reply := get_running_loop().create_future() )
+        reply.add_done_callback( lambda reply: reply.cancelled() or reply.exception() )
+        return reply
+
+    async def call( self, request: str, **arguments: Any ) -> Message:
+        """Make a request of the server, and wait for the reply.
+
+        Args:
+            request (str): The name of the request.
+            arguments (Any): The arguments of the request.
+
+        Returns:
+            Message: The reply from the server.
+
+        Raises:
+            RemoteError: If the server couldn't carry out the request.
+        """
+        reply = self.send( request, **arguments )
+        await self._writer.drain()
+        return await reply
+
+    async def close( self ) -> None:
+        """Close the connection, once the server has replied to everything it was sent."""
+        await gather( *self._replies, return_exceptions=True )
+        self._writer.close()
+        with suppress( ConnectionError ):
+            await self._writer.wait_closed()
+        self._listening.cancel()
+
+##############################################################################
+def _days_to_json( days: dict[ str, dict[ date, int ] ] ) -> dict[ str, dict[ str, int ] ]:
+    """Convert days of streaks, keyed by streak key, into JSON data.
+
+    Args:
+        days (dict[ str, dict[ date, int ] ]): The days of each streak.
+
+    Returns:
+        dict[ str, dict[ str, int ] ]: The days, ready to be converted into JSON.
+    """
+    return { key: { day.isoformat(): count for day, count in counts.items() } for key, counts in days.items() }
+
+##############################################################################
+def _days_from_json( days: dict[ str, dict[ str, int ] ] ) -> dict[ str, dict[ date, int ] ]:
+    """Convert JSON data into days of streaks, keyed by streak key.
+
+    Args:
+        days (dict[ str, dict[ str, int ] ]): The JSON data.
+
+    Returns:
+        dict[ str, dict[ date, int ] ]: The days of each streak.
+    """
+    return {
+        key: { date.fromisoformat( day ): count for day, count in counts.items() } for key, counts in days.items()
+    }
+
+##############################################################################
+def _order( streaks: Iterable[ Streak ] ) -> list[ tuple[ str, str, str ] ]:
+    """Get the order of the streaks, along with their titles and groups.
+
+    Args:
+        streaks (Iterable[ Streak ]): The streaks.
+
+    Returns:
+        list[ tuple[ str, str, str ] ]: The key, title and group of each streak, in order.
+    """
+    return [ ( streak.key, streak.title, streak.group ) for streak in streaks ]
+
+##############################################################################
+def _arranged( streaks: dict[ str, Streak ], order: list[ tuple[ str, str, str ] ] ) -> list[ Streak ]:
+    """Arrange streaks into a given order, giving them their titles and groups.
+
+    Args:
+        streaks (dict[ str, Streak ]): The streaks, by key.
+        order (list[ tuple[ str, str, str ] ]): The key, title and group of each streak, in order.
+
+    Returns:
+        list[ Streak ]: The streaks in order; any that aren't in the order come last.
+    """
+    remaining = dict( streaks )
+    arranged: list[ Streak ] = []
+    for key, title, group in order:
+        if ( streak := remaining.pop( key, None ) ) is not None:
+            streak.title = title
+            streak.group = group
+            arranged.append( streak )
+    return [ *arranged, *remaining.values() ]
+
+##############################################################################
+class RemoteArchive( Archive ):
+    """An archive whose years are read from the server.
+
+    The server holds the only copy of the streaks that can be saved, so a
+    session never writes the archive; what it reads comes from the server,
+    which knows about changes that haven't been saved yet. Years and
+    summaries have to be fetched before they're used, as nothing here
+    ever waits on the server.
+    """
+
+    def __init__( self, directory: Path, connection: Connection ) -> None:
+        """Initialise the archive.
+
+        Args:
+            directory (Path): The directory that holds the archive.
+            connection (Connection): The connection to the server.
+        """
+        super().__init__( directory )
+        self._connection = connection
+        self._fetched: dict[ int, dict[ str, dict[ str, int ] ] ] = {}
+
+    async def fetch( self, years: Iterable[ int ] ) -> None:
+        """Fetch the data for archived years from the server, ready to be read.
+
+        Args:
+            years (Iterable[ int ]): The years that are about to be needed.
+
+        Note:
+            Years that are loaded, or have already been fetched, aren't
+            asked for again.
+        """
+        wanted = sorted( {
+            year for year in years
+            if self.is_archived( year ) and not self.is_loaded( year ) and year not in self._fetched
+        } )
+        replies = [ self._connection.send( "read", year=year ) for year in wanted ]
+        for year, reply in zip( wanted, replies ):
+            self._fetched[ year ] = cast( dict[ str, dict[ str, int ] ], ( await reply )[ "days" ] )
+
+    def patch( self, key: str, day: date, count: int ) -> None:
+        """Bring the data of a year that has been fetched up to date with a change.
+
+        Args:
+            key (str): The key of the streak that changed.
+            day (date): The day that changed.
+            count (int): The new done count for the day.
+        """
+        if ( year := self._fetched.get( day.year ) ) is not None:
+            year.setdefault( key, {} )[ day.isoformat() ] = count
+
+    def read( self, year: int ) -> dict[ str, dict[ str, int ] ]:
+        """Read the raw data for a given year.
+
+        Args:
+            year (int): The year to read.
+
+        Returns:
+            dict[ str, dict[ str, int ] ]: The days for each streak key.
+
+        Note:
+            The year is handed over the once; a year that hasn't been
+            fetched reads as empty.
+        """
+        return self._fetched.pop( year, {} )
+
+    async def fetch_summaries( self ) -> None:
+        """Fetch the summaries of the archived years from the server, if they aren't at hand."""
+        if self._summaries is None:
+            summaries = ( await self._connection.call( "summaries" ) )[ "summaries" ]
+            self._summaries = {
+                int( year ): {
+                    key: Summary( total, date.fromisoformat( last ), run )
+                    for key, ( total, last, run ) in streaks.items()
+                } for year, streaks in summaries.items()
+            }
+
+    @property
+    def summaries( self ) -> dict[ int, dict[ str, Summary ] ]:
+        """dict[ int, dict[ str, Summary ] ]: The summary of each streak, for each archived year.
+
+        Until the summaries have been fetched there are none.
+        """
+        return {} if self._summaries is None else self._summaries
+
+    def forget( self ) -> None:
+        """Forget the summaries, so that they're asked for again."""
+        self._summaries = None
+
+    def _save( self, year: int, streaks: Iterable[ Streak ] ) -> None:
+        """Forget that the given year needs saving; the server does the saving.
+
+        Args:
+            year (int): The year.
+            streaks (Iterable[ Streak ]): The streaks.
+        """
+        self._dirty.discard( year )
+        for streak in streaks:
+            streak.changed_years.discard( year )
+
+##############################################################################
+class RemoteNotes( Notes ):
+    """Notes that are read from, and written through, the server.
+
+    The index is fetched when the session starts, and kept up to date
+    with the news from the server; the notes of a streak have to be
+    fetched before they're read.
+    """
+
+    def __init__( self, directory: Path, connection: Connection ) -> None:
+        """Initialise the notes.
+
+        Args:
+            directory (Path): The directory that holds the notes.
+            connection (Connection): The connection to the server.
+        """
+        super().__init__( directory )
+        self._connection = connection
+        self._index      = {}
+
+    async def fetch_index( self ) -> None:
+        """Fetch the index of the notes from the server."""
+        self._index = {
+            key: set( days ) for key, days in ( await self._connection.call( "index" ) )[ "index" ].items()
+        }
+
+    async def fetch( self, key: str ) -> None:
+        """Fetch the notes for a streak from the server, if they aren't at hand.
+
+        Args:
+            key (str): The key of the streak.
+        """
+        if key in self.index and key not in self._loaded:
+            notes = ( await self._connection.call( "notes", key=key ) )[ "notes" ]
+            self._keep( key, { int( day ): text for day, text in notes.items() } )
+
+    def _keep( self, key: str, notes: dict[ int, str ] ) -> None:
+        """Keep the notes of a streak at hand.
+
+        Args:
+            key (str): The key of the streak.
+            notes (dict[ int, str ]): The text of the notes, keyed by the ordinal of the day.
+        """
+        self._loaded[ key ] = notes
+        self._loaded.move_to_end( key )
+        while len( self._loaded ) > self._capacity:
+            self._loaded.popitem( last=False )
+
+    def _notes( self, key: str ) -> dict[ int, str ]:
+        """Get the notes for a given streak.
+
+        Args:
+            key (str): The key of the streak.
+
+        Returns:
+            dict[ int, str ]: The text of the notes, keyed by the ordinal of the day.
+
+        Note:
+            Notes that haven't been fetched read as empty.
+        """
+        if key in self._loaded:
+            self._loaded.move_to_end( key )
+            return self._loaded[ key ]
+        return {}
+
+    def _index_days( self, key: str, days: Iterable[ int ] ) -> None:
+        """Record in the index which days of a streak have notes.
+
+        Args:
+            key (str): The key of the streak.
+            days (Iterable[ int ]): The ordinals of the days with notes.
+        """
+        if days := set( days ):
+            self.index[ key ] = days
+        else:
+            self.index.pop( key, None )
+
+    def set( self, key: str, day: date, text: str ) -> None:
+        """Set the note for a day of a streak.
+
+        Args:
+            key (str): The key of the streak.
+            day (date): The day.
+            text (str): The text of the note; an empty note removes it.
+        """
+        days = set( self.index.get( key, () ) )
+        if text:
+            days.add( day.toordinal() )
+        else:
+            days.discard( day.toordinal() )
+        self._index_days( key, days )
+        if ( loaded := self._loaded.get( key ) ) is not None:
+            if text:
+                loaded[ day.toordinal() ] = text
+            else:
+                loaded.pop( day.toordinal(), None )
+        self._connection.send( "note", key=key, day=day.isoformat(), text=text )
+
+    def replace( self, key: str, notes: Mapping[ int, str ] ) -> None:
+        """Replace every note for a streak.
+
+        Args:
+            key (str): The key of the streak.
+            notes (Mapping[ int, str ]): The text of the notes, keyed by the ordinal of the day; none removes them all.
+        """
+        self._index_days( key, notes )
+        self._keep( key, dict( notes ) )
+        self._connection.send( "replace", key=key, notes={ str( day ): text for day, text in notes.items() } )
+
+    def changed( self, key: str, days: Iterable[ int ] ) -> None:
+        """Take in news that the notes of a streak have been changed by another session.
+
+        Args:
+            key (str): The key of the streak.
+            days (Iterable[ int ]): The ordinals of the days that now have notes.
+        """
+        self._index_days( key, days )
+        self._loaded.pop( key, None )
+
+##############################################################################
+class RemoteStorage( Storage ):
+    """The storage for a session whose streaks are held by the server."""
+
+    def __init__( self, directory: Path, connection: Connection ) -> None:
+        """Initialise the storage.
+
+        Args:
+            directory (Path): The directory that the data lives in.
+            connection (Connection): The connection to the server.
+        """
+        super().__init__( directory )
+        self.archive: RemoteArchive = RemoteArchive( directory / self.ARCHIVE_DIRECTORY, connection )
+        """RemoteArchive: The archive of old years of streak data."""
+        self.notes: RemoteNotes = RemoteNotes( directory / self.NOTES_DIRECTORY, connection )
+        """RemoteNotes: The notes attached to days of the streaks."""
+
+##############################################################################
+class RemoteStore( Store ):
+    """A copy of a store held by the server, for a session in another process.
+
+    Changes made by the session are sent to the server as they're made,
+    without waiting for the server to reply, and the server sends news of
+    the changes made by other sessions, which are applied to the copy as
+    they arrive. Only the server ever saves the streaks.
+    """
+
+    def __init__( self, connection: Connection, directory: Path ) -> None:
+        """Initialise the store.
+
+        Args:
+            connection (Connection): The connection to the server.
+            directory (Path): The directory that the data lives in.
+        """
+        self._connection = connection
+        super().__init__( RemoteStorage( directory, connection ) )
+        self.storage: RemoteStorage
+        self._known: set[ str ] = set()
+        self._sending: Counter[ tuple[ str, date ] ] = Counter()
+        self._unanswered = 0
+        self._adopted: dict[ str, Streak ] = {}
+        connection.listen( self._news )
+
+    @property
+    def streaks( self ) -> list[ Streak ]:
+        """list[ Streak ]: The streaks in the store.
+
+        Until the streaks have been fetched with `ready` there are none.
+        """
+        return [] if self._streaks is None else self._streaks
+
+    async def ready( self ) -> None:
+        """Fetch the streaks, and the index of the notes, from the server.
+
+        Note:
+            Any news from the server that comes before the streaks is
+            already part of what's fetched, so is of no interest.
+        """
+        if self._streaks is None:
+            self._streaks = [
+                Streak.from_dict( data ) for data in ( await self._connection.call( "streaks" ) )[ "streaks" ]
+            ]
+            self._known = { streak.key for streak in self._streaks }
+            await self.storage.notes.fetch_index()
+
+    async def close( self ) -> None:
+        """Close the connection to the server, once everything sent has been dealt with."""
+        await self._connection.close()
+
+    def _apply( self, news: Message ) -> None:
+        """Apply news of a change from the server.
+
+        Args:
+            news (Message): The news.
+
+        Note:
+            Days that have been changed here, but that the server hasn't
+            yet replied about, are left alone; the server will end up
+            with the change made here, as it deals with it last. For the
+            same reason the order of the streaks is left alone while
+            there are changes still to be replied to, as the reply brings
+            the order that the server ends up with; any streaks added in
+            the meantime are held until then.
+        """
+        if "notes" in news:
+            self.storage.notes.changed( news[ "notes" ], news[ "days" ] )
+            return
+        for data in news[ "new" ]:
+            if data[ "key" ] not in self._known:
+                self._adopted.setdefault( data[ "key" ], Streak.from_dict( data ) )
+        streaks = { **self._adopted, **{ streak.key: streak for streak in self.streaks } }
+        archive = self.storage.archive
+        for key, days in _days_from_json( news[ "days" ] ).items():
+            if ( streak := streaks.get( key ) ) is None:
+                continue
+            for day in [ day for day in days if ( key, day ) in self._sending ]:
+                del days[ day ]
+            for day in [ day for day in days if archive.is_archived( day.year ) and not archive.is_loaded( day.year ) ]:
+                archive.patch( key, day, days.pop( day ) )
+            streak.load_days( days )
+        if not self._unanswered:
+            self._arrange( streaks, news[ "order" ] )
+        archive.forget()
+
+    def _arrange( self, streaks: dict[ str, Streak ], order: list[ tuple[ str, str, str ] ] ) -> None:
+        """Arrange the streaks into the order that the server has them in.
+
+        Args:
+            streaks (dict[ str, Streak ]): The streaks that are known about, by key.
+            order (list[ tuple[ str, str, str ] ]): The key, title and group of each streak, in order.
+        """
+        self._streaks = []
+        for key, title, group in order:
+            if ( streak := streaks.get( key ) ) is not None:
+                streak.title = title
+                streak.group = group
+                self._streaks.append( streak )
+        self._known = { streak.key for streak in self._streaks }
+        self._adopted.clear()
+
+    def _tell( self, session: object | None=None ) -> None:
+        """Tell the sessions that the streaks have changed.
+
+        Args:
+            session (object | None): The session that made the change, which isn't told.
+        """
+        for other, changed in list( self._sessions.items() ):
+            if other is not session:
+                changed()
+
+    def _news( self, news: Message ) -> None:
+        """Apply news that the server has sent, and tell the sessions about it.
+
+        Args:
+            news (Message): The news.
+        """
+        if self._streaks is not None:
+            self._apply( news )
+            self._tell()
+
+    def changed( self, streaks: Iterable[ Streak ], session: object | None=None ) -> None:
+        """Send the changes made to the streaks to the server.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks as they now are, in order.
+            session (object | None): The session that made the change.
+
+        Note:
+            The server replies with the order that it ends up with, which
+            takes in the changes made by other sessions in the meantime;
+            the order is taken up once the server has replied to every
+            change sent from here, so that it never undoes a change made
+            here since.
+        """
+        self._streaks = streaks = list( streaks )
+        changed = [
+            ( streak.key, day ) for streak in streaks for day in streak.changed_days
+        ]
+        reply = self._connection.send(
+            "changed",
+            order=_order( streaks ),
+            deleted=sorted( self._known - { streak.key for streak in streaks } ),
+            new=[ streak.to_dict() for streak in streaks if streak.key not in self._known ],
+            days=_days_to_json( {
+                streak.key: { day: streak[ day ] for day in streak.changed_days } for streak in streaks
+                if streak.changed_days
+            } )
+        )
+        for streak in streaks:
+            streak.changed_days.clear()
+            streak.changed_years.clear()
+        self._known = { streak.key for streak in streaks }
+        self._sending.update( changed )
+        self._unanswered += 1
+        reply.add_done_callback( lambda reply: self._answered( reply, changed ) )
+        self.storage.archive.forget()
+        self._tell( session )
+
+    def _answered( self, reply: "Future[ Message ]", changed: list[ tuple[ str, date ] ] ) -> None:
+        """Take in the server's reply to a change sent from here.
+
+        Args:
+            reply (Future[ Message ]): The reply.
+            changed (list[ tuple[ str, date ] ]): The days that the change was made to.
+        """
+        self._sending.subtract( changed )
+        self._sending = +self._sending
+        self._unanswered -= 1
+        if not self._unanswered and not reply.cancelled() and reply.exception() is None:
+            before = _order( self.streaks )
+            self._arrange(
+                { **self._adopted, **{ streak.key: streak for streak in self.streaks } }, reply.result()[ "order" ]
+            )
+            if _order( self.streaks ) != before:
+                self._tell()
+
+    def flush( self ) -> None:
+        """Ask the server to save any changes that haven't been saved yet."""
+        self._connection.send( "flush" )
+
+##############################################################################
+class StoreService:
+    """Serves a store to sessions that are running in other processes.
+
+    This is the server's side of `RemoteStore`: it carries out the
+    requests of each session against the one store, and sends news of
+    each change to every other session using the store.
+    """
+
+    def __init__( self, store: Store ) -> None:
+        """Initialise the service.
+
+        Args:
+            store (Store): The store to serve.
+        """
+        self._store = store
+        self._sessions: dict[ object, Callable[ [ Message ], None ] ] = {}
+
+    @property
+    def sessions( self ) -> int:
+        """int: The number of sessions that are using the store."""
+        return len( self._sessions )
+
+    def join( self, session: object, send: Callable[ [ Message ], None ] ) -> None:
+        """Add a session to those using the store.
+
+        Args:
+            session (object): The session.
+            send (Callable[ [ Message ], None ]): The function that sends a message to the session.
+        """
+        self._sessions[ session ] = send
+
+    def leave( self, session: object ) -> None:
+        """Remove a session from those using the store.
+
+        Args:
+            session (object): The session.
+        """
+        self._sessions.pop( session, None )
+
+    def _tell( self, session: object, news: Message ) -> None:
+        """Tell every session other than the given one about a change.
+
+        Args:
+            session (object): The session that made the change.
+            news (Message): The news of the change.
+        """
+        for other, send in list( self._sessions.items() ):
+            if other is not session:
+                send( { "news": news } )
+
+    def _noted( self, session: object, key: str ) -> None:
+        """Tell every session other than the given one that the notes of a streak have changed.
+
+        Args:
+            session (object): The session that changed the notes.
+            key (str): The key of the streak.
+        """
+        self._tell( session, { "notes": key, "days": sorted( self._store.storage.notes.index.get( key, () ) ) } )
+
+    def _read( self, year: int ) -> dict[ str, dict[ str, int ] ]:
+        """Read the raw data for a given archived year.
+
+        Args:
+            year (int): The year to read.
+
+        Returns:
+            dict[ str, dict[ str, int ] ]: The days for each streak key.
+
+        Note:
+            If the year is loaded into the store it's taken from there, as
+            it might have changes that haven't been saved yet.
+        """
+        if self._store.storage.archive.is_loaded( year ):
+            return {
+                streak.key: { day.isoformat(): count for day, count in days.items() }
+                for streak in self._store.streaks if ( days := streak.year( year ) )
+            }
+        return self._store.storage.archive.read( year )
+
+    def _adopt( self, streaks: dict[ str, Streak ], new: list[ dict[ str, Any ] ] ) -> None:
+        """Adopt the streaks that a session has added.
+
+        Args:
+            streaks (dict[ str, Streak ]): The streaks in the store, by key.
+            new (list[ dict[ str, Any ] ]): The data of the streaks that were added.
+
+        Note:
+            Every day of an added streak counts as changed, so that it all
+            gets saved, archived years and all.
+        """
+        archive = self._store.storage.archive
+        for data in new:
+            if data[ "key" ] not in streaks:
+                streak = Streak.from_dict( data )
+                for year in sorted( { day.year for day in streak.days } ):
+                    archive.load_year( year, streaks.values() )
+                streak.changed_years.update( day.year for day in streak.days )
+                streak.changed_days.update( streak.days )
+                streaks[ streak.key ] = streak
+
+    def _cold( self, request: Message ) -> set[ int ]:
+        """Get the archived years that a change touches that aren't loaded.
+
+        Args:
+            request (Message): The request describing the changes.
+
+        Returns:
+            set[ int ]: The years.
+        """
+        archive = self._store.storage.archive
+        return {
+            year for year in {
+                date.fromisoformat( day ).year
+                for days in [ *request[ "days" ].values(), *( data[ "days" ] for data in request[ "new" ] ) ]
+                for day in days
+            } if archive.is_archived( year ) and not archive.is_loaded( year )
+        }
+
+    def _changed( self, session: object, request: Message ) -> Message:
+        """Apply the changes a session has made.
+
+        Args:
+            session (object): The session that made the changes.
+            request (Message): The request describing the changes.
+
+        Returns:
+            Message: The reply to the session, giving the order the streaks end up in.
+
+        Note:
+            Archived years are loaded to take in the changes to them; any
+            that weren't already loaded are saved and unloaded again once
+            the changes are made, so that a session importing a long
+            history doesn't leave every year of it in memory.
+        """
+        archive = self._store.storage.archive
+        cold    = self._cold( request )
+        streaks = { streak.key: streak for streak in self._store.streaks }
+        for key in request[ "deleted" ]:
+            streaks.pop( key, None )
+        self._adopt( streaks, request[ "new" ] )
+        days = {
+            key: counts for key, counts in _days_from_json( request[ "days" ] ).items() if key in streaks
+        }
+        for key, counts in days.items():
+            for day, count in counts.items():
+                archive.load_year( day.year, streaks.values() )
+                streaks[ key ][ day ] = count
+        self._store.changed( ordered := _arranged( streaks, request[ "order" ] ), session )
+        self._tell( session, {
+            "order": ( order := _order( ordered ) ),
+            "new": request[ "new" ],
+            "days": _days_to_json( {
+                key: { day: streaks[ key ][ day ] for day in counts } for key, counts in days.items()
+            } )
+        } )
+        for year in sorted( cold ):
+            archive.unload_year( year, ordered )
+        return { "order": order }
+
+    def _summaries( self ) -> Message:
+        """Get the summaries of the archived years.
+
+        Returns:
+            Message: The summaries, ready to be converted into JSON.
+
+        Note:
+            Any changes that haven't been saved yet are saved first, so
+            that the summaries take them in.
+        """
+        self._store.flush()
+        return {
+            str( year ): {
+                key: ( summary.total, summary.last.isoformat(), summary.run ) for key, summary in streaks.items()
+            } for year, streaks in self._store.storage.archive.summaries.items()
+        }
+
+    def handle( self, session: object, request: Message ) -> Message:
+        """Carry out a request from a session.
+
+        Args:
+            session (object): The session making the request.
+            request (Message): The request.
+
+        Returns:
+            Message: The message to send back to the session.
+        """
+        notes = self._store.storage.notes
+        match request.get( "request" ):
+            case "streaks":
+                reply: Message = { "streaks": [
+                    streak.to_dict( self._store.storage.archive.first_hot_day ) for streak in self._store.streaks
+                ] }
+            case "changed":
+                reply = self._changed( session, request )
+            case "read":
+                reply = { "days": self._read( int( request[ "year" ] ) ) }
+            case "summaries":
+                reply = { "summaries": self._summaries() }
+            case "index":
+                reply = { "index": { key: sorted( days ) for key, days in notes.index.items() } }
+            case "notes":
+                reply = { "notes": {
+                    str( day ): text for day, text in notes.of_streak( str( request[ "key" ] ) ).items()
+                } }
+            case "note":
+                notes.set( str( request[ "key" ] ), date.fromisoformat( request[ "day" ] ), str( request[ "text" ] ) )
+                self._noted( session, str( request[ "key" ] ) )
+                reply = {}
+            case "replace":
+                notes.replace( str( request[ "key" ] ), {
+                    int( day ): str( text ) for day, text in request[ "notes" ].items()
+                } )
+                self._noted( session, str( request[ "key" ] ) )
+                reply = {}
+            case "flush":
+                self._store.flush()
+                reply = {}
+            case unknown:
+                return { "error": f"Unknown request {unknown!r}" }
+        return { "reply": reply }
+
+### remote.py ends here
@@ -0,0 +1,93 @@
+"""Provides an index for quickly searching streak titles."""
+
+##############################################################################
+# Python imports.
+from collections import defaultdict
+from typing      import Final
+
+##############################################################################
+class TitleIndex:
+    """An n-gram index of streak titles.
+
+    Every title is broken down into all of its 1, 2 and 3 character
+    substrings, each of which maps to the keys of the streaks whose titles
+    contain it. A search for a short term is then a single lookup, and a
+    search for a longer term is an intersection of the sets for its
+    trigrams, followed by a check of the few candidates that are left.
+    Searching is case-insensitive.
+    """
+
+    GRAM_SIZE: Final = 3
+    """int: The size of the largest substrings that are indexed."""
+
+    def __init__( self ) -> None:
+        """Initialise the index."""
+        self._titles: dict[ str, str ] = {}
+        self._grams: defaultdict[ str, set[ str ] ] = defaultdict( set )
+
+    @classmethod
+    def _grams_of( cls, title: str ) -> set[ str ]:
+        """Get all of the indexed substrings of a title.
+
+        Args:
+            title (str): The title to break down.
+
+        Returns:
+            set[ str ]: The substrings of the title.
+        """
+        return {
+            title[ start:start + size ]
+            for size in range( 1, cls.GRAM_SIZE + 1 )
+            for start in range( len( title ) - size + 1 )
+        }
+
+    def __len__( self ) -> int:
+        """int: The number of titles in the index."""
+        return len( self._titles )
+
+    def add( self, key: str, title: str ) -> None:
+        """Add a title to the index, or update the title for a key.
+
+        Args:
+            key (str): The key of the streak.
+            title (str): The title of the streak.
+        """
+        if self._titles.get( key ) == ( title := title.casefold() ):
+            return
+        self.remove( key )
+        self._titles[ key ] = title
+        for gram in self._grams_of( title ):
+            self._grams[ gram ].add( key )
+
+    def remove( self, key: str ) -> None:
+        """Remove a title from the index.
+
+        Args:
+            key (str): The key of the streak to remove.
+        """
+        if ( title := self._titles.pop( key, None ) ) is not None:
+            for gram in self._grams_of( title ):
+                ( keys := self._grams[ gram ] ).discard( key )
+                if not keys:
+                    del self._grams[ gram ]
+
+    def search( self, text: str ) -> set[ str ]:
+        """Search the index.
+
+        Args:
+            text (str): The text to search for.
+
+        Returns:
+            set[ str ]: The keys of the streaks whose titles contain the text.
+        """
+        if not ( text := text.casefold() ):
+            return set( self._titles )
+        if len( text ) <= self.GRAM_SIZE:
+            return set( self._grams.get( text, () ) )
+        candidates = set.intersection( *(
+            self._grams.get( text[ start:start + self.GRAM_SIZE ], set() )
+            for start in range( len( text ) - self.GRAM_SIZE + 1 )
+        ) )
+        return { key for key in candidates if text in self._titles[ key ] }
+
+### search.py ends here
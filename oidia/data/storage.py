@@ -0,0 +1,169 @@
+"""Provides the storage of streak data."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Iterable, Iterator
+from datetime        import date
+from json            import dump, dumps, loads
+from pathlib         import Path
+from typing          import Final
+
+##############################################################################
+# XDG imports.
+from xdg import xdg_data_home
+
+##############################################################################
+# Local imports.
+from .archive  import Archive
+from .backup   import Backups
+from .notes    import Notes
+from .streak   import Streak
+from .transfer import Row
+
+##############################################################################
+def data_directory() -> Path:
+    """Get the directory that the application's data lives in.
+
+    Returns:
+        Path: The path to the data directory.
+
+    Note:
+        As a side effect of calling this the directory will be created if
+        it doesn't exist.
+    """
+    ( data_dir := xdg_data_home() / "oidia" ).mkdir( parents=True, exist_ok=True )
+    return data_dir
+
+##############################################################################
+class Storage:
+    """Handles loading and saving streak data."""
+
+    STREAKS_FILE: Final = Path( "streaks.json" )
+    """Path: The name of the file that the list it saved to."""
+
+    ARCHIVE_DIRECTORY: Final = Path( "archive" )
+    """Path: The name of the directory that old years are archived to."""
+
+    BACKUP_DIRECTORY: Final = Path( "backups" )
+    """Path: The name of the directory that backups are kept in."""
+
+    NOTES_DIRECTORY: Final = Path( "notes" )
+    """Path: The name of the directory that notes on days are kept in."""
+
+    SYNC_DIRECTORY: Final = Path( "sync" )
+    """Path: The name of the directory that the state of syncing is kept in."""
+
+    OUTBOX_FILE: Final = Path( "outbox.jsonl" )
+    """Path: The name of the file, in the sync directory, that changes waiting to be synced are kept in."""
+
+    def __init__( self, directory: Path ) -> None:
+        """Initialise the storage.
+
+        Args:
+            directory (Path): The directory that the data lives in.
+        """
+        self.directory = directory
+        """Path: The directory that the data lives in."""
+        self.archive = Archive( directory / self.ARCHIVE_DIRECTORY )
+        """Archive: The archive of old years of streak data."""
+        self.backups = Backups(
+            directory / self.BACKUP_DIRECTORY, self.data_file, directory / self.ARCHIVE_DIRECTORY
+        )
+        """Backups: The backups of the streak data."""
+        self.notes = Notes( directory / self.NOTES_DIRECTORY )
+        """Notes: The notes attached to days of the streaks."""
+
+    @property
+    def data_file( self ) -> Path:
+        """Path: The full path to the file for saving the data."""
+        return self.directory / self.STREAKS_FILE
+
+    @property
+    def outbox( self ) -> Path:
+        """Path: The full path to the file of changes waiting to be synced."""
+        return self.directory / self.SYNC_DIRECTORY / self.OUTBOX_FILE
+
+    def save( self, streaks: Iterable[ Streak ] ) -> None:
+        """Save the given streaks.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks to save.
+
+        Note:
+            If it's time for one, a backup snapshot is taken of what was
+            saved. If the data is being synced, the days that changed are
+            added to the outbox, ready for the next sync.
+        """
+        streaks = list( streaks )
+        with self.data_file.open( "w", encoding="utf-8" ) as data:
+            dump( [ streak.to_dict( self.archive.first_hot_day ) for streak in streaks ], data, indent=4 )
+        self.archive.save( streaks )
+        if self.outbox.parent.is_dir() and ( changes := [
+            dumps( { "key": streak.key, "title": streak.title, "day": day.isoformat(), "count": streak[ day ] } )
+            for streak in streaks for day in sorted( streak.changed_days )
+        ] ):
+            with self.outbox.open( "a", encoding="utf-8" ) as outbox:
+                outbox.writelines( f"{change}\n" for change in changes )
+        for streak in streaks:
+            streak.changed_days.clear()
+        self.backups.snapshot()
+
+    def load( self ) -> list[ Streak ]:
+        """Load the streaks.
+
+        Returns:
+            list[ Streak ]: The streaks that were loaded.
+
+        Note:
+            Only the days that aren't archived are loaded.
+        """
+        if not self.data_file.exists():
+            return []
+        streaks = [
+            Streak.from_dict( streak ) for streak in loads( self.data_file.read_text( encoding="utf-8" ) )
+        ]
+        if self.archive.adopt( streaks ):
+            self.save( streaks )
+        return streaks
+
+    def rows(
+        self, titles: Iterable[ str ] | None=None, start: date | None=None, end: date | None=None
+    ) -> Iterator[ Row ]:
+        """Stream the stored streak data as rows.
+
+        Args:
+            titles (Iterable[ str ] | None): Only include streaks with these titles.
+            start (date | None): Only include days from this date on.
+            end (date | None): Only include days up to and including this date.
+
+        Yields:
+            Row: The rows of streak data.
+
+        Note:
+            This reads straight from storage rather than from any streaks
+            that are loaded. Archived years are read one at a time, oldest
+            first, and years outside of the range of dates are never read,
+            so memory use doesn't grow with the length of the history.
+        """
+        if not self.data_file.exists():
+            return
+        wanted   = None if titles is None else set( titles )
+        streaks  = [
+            streak for streak in loads( self.data_file.read_text( encoding="utf-8" ) )
+            if wanted is None or streak[ "title" ] in wanted
+        ]
+        keys     = { streak.get( "key" ): streak[ "title" ] for streak in streaks }
+        def _rows( title: str, days: dict[ str, int ] ) -> Iterator[ Row ]:
+            """Generate the rows for the given days of a streak."""
+            for day, count in sorted( days.items() ):
+                if ( start is None or start.isoformat() <= day ) and ( end is None or day <= end.isoformat() ):
+                    yield Row( title, date.fromisoformat( day ), count )
+        for year in self.archive.years:
+            if ( start is None or start.year <= year ) and ( end is None or year <= end.year ):
+                for key, days in self.archive.read( year ).items():
+                    if key in keys:
+                        yield from _rows( keys[ key ], days )
+        for streak in streaks:
+            yield from _rows( streak[ "title" ], streak[ "days" ] )
+
+### storage.py ends here
@@ -0,0 +1,182 @@
+"""Provides a store of streaks that can be shared between sessions."""
+
+##############################################################################
+# Python imports.
+import re
+from asyncio         import TimerHandle, get_running_loop
+from collections.abc import Callable, Iterable
+from datetime        import date
+from pathlib         import Path
+from typing          import Final
+
+##############################################################################
+# Local imports.
+from .storage import Storage
+from .streak  import Streak
+
+##############################################################################
+class Store:
+    """The streaks of one user, held in memory and shared between sessions.
+
+    The streaks are loaded from storage the once, however many sessions
+    are looking at them, and every session works with the same streaks.
+    When a session changes them, every other session is told so that it
+    can bring its display up to date; saving to storage can be held back
+    for a while so that a burst of changes, from any number of sessions,
+    is written in one go.
+    """
+
+    def __init__( self, storage: Storage, delay: float=0 ) -> None:
+        """Initialise the store.
+
+        Args:
+            storage (Storage): The storage for the streaks.
+            delay (float): How long to hold back saving for after a change, in seconds.
+        """
+        self.storage = storage
+        """Storage: The storage for the streaks."""
+        self._delay = delay
+        self._dirty = False
+        self._streaks: list[ Streak ] | None = None
+        self._pending: TimerHandle | None    = None
+        self._sessions: dict[ object, Callable[ [], None ] ] = {}
+        self._visiting: dict[ object, tuple[ date, date ] ]  = {}
+
+    @property
+    def streaks( self ) -> list[ Streak ]:
+        """list[ Streak ]: The streaks in the store.
+
+        The streaks are loaded from storage the first time they're asked for.
+        """
+        if self._streaks is None:
+            self._streaks = self.storage.load()
+        return self._streaks
+
+    async def ready( self ) -> None:
+        """Make sure the streaks are ready to be used.
+
+        Note:
+            The streaks are loaded from storage as they're needed, so there
+            is nothing to wait for here; a store whose streaks live
+            elsewhere fetches them.
+        """
+
+    @property
+    def sessions( self ) -> int:
+        """int: The number of sessions that are using the store."""
+        return len( self._sessions )
+
+    def subscribe( self, session: object, changed: Callable[ [], None ] ) -> None:
+        """Start telling a session about changes made by other sessions.
+
+        Args:
+            session (object): The session.
+            changed (Callable[ [], None ]): The function to call when another session changes the streaks.
+        """
+        self._sessions[ session ] = changed
+
+    def unsubscribe( self, session: object ) -> None:
+        """Stop telling a session about changes.
+
+        Args:
+            session (object): The session.
+        """
+        self._sessions.pop( session, None )
+        self._visiting.pop( session, None )
+
+    def changed( self, streaks: Iterable[ Streak ], session: object | None=None ) -> None:
+        """Record that the streaks have been changed.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks as they now are, in order.
+            session (object | None): The session that made the change.
+
+        Note:
+            Every session other than the one that made the change is told
+            about it. If there's no delay the streaks are saved straight
+            away, otherwise a save is scheduled if one isn't already.
+        """
+        self._streaks = list( streaks )
+        self._dirty   = True
+        if self._delay <= 0:
+            self.flush()
+        elif self._pending is None:
+            self._pending = get_running_loop().call_later( self._delay, self.flush )
+        for other, changed in list( self._sessions.items() ):
+            if other is not session:
+                changed()
+
+    def flush( self ) -> None:
+        """Save the streaks, if there are changes that haven't been saved yet."""
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._dirty and self._streaks is not None:
+            self._dirty = False
+            self.storage.save( self._streaks )
+
+    async def visit( self, session: object, start: date, end: date ) -> bool:
+        """Make sure the data for the range of dates a session is showing is loaded.
+
+        Args:
+            session (object): The session.
+            start (date): The start of the range being visited.
+            end (date): The end of the range being visited.
+
+        Returns:
+            bool: `True` if the data in the streaks changed, `False` if not.
+
+        Note:
+            As the sessions share the streaks, the range that is visited
+            takes in what every session is showing; that way one session
+            moving around never unloads a year another session is showing.
+        """
+        self._visiting[ session ] = ( start, end )
+        start = min( start for start, _ in self._visiting.values() )
+        end   = max( end for _, end in self._visiting.values() )
+        await self.storage.archive.fetch( range( start.year, end.year + 1 ) )
+        return self.storage.archive.visit( self.streaks, start, end )
+
+##############################################################################
+class Stores:
+    """The stores for a number of users, each with their own data directory."""
+
+    USER_NAME: Final = re.compile( r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}" )
+    """Pattern: The pattern that a user name has to match."""
+
+    def __init__( self, directory: Path, delay: float=0 ) -> None:
+        """Initialise the stores.
+
+        Args:
+            directory (Path): The directory that holds the directory of each user.
+            delay (float): How long each store holds back saving for after a change, in seconds.
+        """
+        self._directory = directory
+        self._delay     = delay
+        self._stores: dict[ str, Store ] = {}
+
+    def for_user( self, user: str ) -> Store:
+        """Get the store for a user.
+
+        Args:
+            user (str): The name of the user.
+
+        Returns:
+            Store: The store for the user.
+
+        Raises:
+            ValueError: If the user name isn't valid.
+        """
+        if not self.USER_NAME.fullmatch( user ):
+            raise ValueError( f"{user!r} isn't a valid user name" )
+        if user not in self._stores:
+            ( directory := self._directory / user ).mkdir( parents=True, exist_ok=True )
+            self._stores[ user ] = Store( Storage( directory ), self._delay )
+        return self._stores[ user ]
+
+    def flush( self ) -> None:
+        """Save any changes that haven't been saved yet, for every user."""
+        for store in self._stores.values():
+            store.flush()
+
+### store.py ends here
@@ -0,0 +1,180 @@
+"""Provides the class that holds the data for a single streak."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Mapping
+from datetime        import date
+from typing          import cast
+from uuid            import uuid4
+
+##############################################################################
+# Local imports.
+from .aggregates import Aggregates
+from .periods    import Resolution
+
+##############################################################################
+class Streak:
+    """The data for a single streak."""
+
+    def __init__(
+        self,
+        title: str="",
+        days: Mapping[ date, int ] | None=None,
+        key: str | None=None,
+        group: str=""
+    ) -> None:
+        """Initialise the streak.
+
+        Args:
+            title (str): The title of the streak.
+            days (Mapping[ date, int ] | None): The done counts for the streak.
+            key (str | None): The unique key for the streak.
+            group (str): The name of the group the streak belongs to.
+
+        Note:
+            If no key is provided a fresh one is created.
+        """
+        self.title = title
+        """str: The title of the streak."""
+        self.key = key or uuid4().hex
+        """str: The unique key for the streak."""
+        self.group = group
+        """str: The name of the group the streak belongs to, or empty if it isn't grouped."""
+        self.changed_years: set[ int ] = set()
+        """set[ int ]: The years that have had days changed since they were last saved."""
+        self.changed_days: set[ date ] = set()
+        """set[ date ]: The days that have been changed since they were last saved."""
+        self._days = { day: count for day, count in ( days or {} ).items() if count > 0 }
+        self._aggregates = Aggregates( self._days )
+
+    def __getitem__( self, day: date ) -> int:
+        """Get the done count for a given day.
+
+        Args:
+            day (date): The day to get the count for.
+
+        Returns:
+            int: The done count for the day.
+        """
+        return self._days.get( day, 0 )
+
+    def __setitem__( self, day: date, count: int ) -> None:
+        """Set the done count for a given day.
+
+        Args:
+            day (date): The day to set the count for.
+            count (int): The done count for the day.
+        """
+        self._set( day, count )
+        self.changed_years.add( day.year )
+        self.changed_days.add( day )
+
+    def _set( self, day: date, count: int ) -> None:
+        """Set the done count for a given day without recording the change.
+
+        Args:
+            day (date): The day to set the count for.
+            count (int): The done count for the day.
+        """
+        self._aggregates.adjust( day, max( 0, count ) - self[ day ] )
+        if count > 0:
+            self._days[ day ] = count
+        else:
+            self._days.pop( day, None )
+
+    @property
+    def days( self ) -> Mapping[ date, int ]:
+        """Mapping[ date, int ]: The days that have a done count."""
+        return self._days
+
+    def year( self, year: int ) -> dict[ date, int ]:
+        """Get the done counts for a given year.
+
+        Args:
+            year (int): The year to get the done counts for.
+
+        Returns:
+            dict[ date, int ]: The done counts for the days in that year.
+        """
+        return { day: count for day, count in self._days.items() if day.year == year }
+
+    @property
+    def year_totals( self ) -> Mapping[ int, int ]:
+        """Mapping[ int, int ]: The total done count for each year that has days loaded."""
+        return self._aggregates.years
+
+    def load_days( self, days: Mapping[ date, int ] ) -> None:
+        """Load previously-saved done counts into the streak.
+
+        Args:
+            days (Mapping[ date, int ]): The done counts to load.
+        """
+        for day, count in days.items():
+            self._set( day, count )
+
+    def unload_year( self, year: int ) -> None:
+        """Unload the done counts for a given year from the streak.
+
+        Args:
+            year (int): The year to unload.
+        """
+        for day in self.year( year ):
+            self._set( day, 0 )
+
+    def total( self, period: date, resolution: Resolution ) -> int:
+        """Get the total done count for a period.
+
+        Args:
+            period (date): The start date of the period.
+            resolution (Resolution): The resolution of the period.
+
+        Returns:
+            int: The total done count for the period.
+        """
+        return self[ period ] if resolution is Resolution.DAY else self._aggregates.total( period, resolution )
+
+    def to_dict( self, since: date | None=None ) -> dict[ str, str | dict[ str, int ] ]:
+        """Get the streak as a dictionary.
+
+        This is intended to be converted into JSON data.
+
+        Args:
+            since (date | None): Only include the days from this date on.
+
+        Returns:
+            dict[ str, str | dict[ str, int ] ]: The streak as a dictionary.
+        """
+        return {
+            "key": self.key,
+            "title": self.title,
+            "group": self.group,
+            "days": {
+                day.isoformat(): count for day, count in self._days.items()
+                if since is None or day >= since
+            }
+        }
+
+    @property
+    def as_dict( self ) -> dict[ str, str | dict[ str, int ] ]:
+        """dict[ str, str | dict[ str, int ] ]: The streak as a dictionary.
+
+        This is intended to be converted into JSON data.
+        """
+        return self.to_dict()
+
+    @classmethod
+    def from_dict( cls, data: Mapping[ str, str | dict[ str, int ] ] ) -> "Streak":
+        """Create a fresh instance of a `Streak` from a dictionary.
+
+        Args:
+            data (Mapping[ str, str | dict[ str, int ] ]): The data to load up.
+
+        Returns:
+            Streak: The new streak.
+        """
+        return cls( str( data[ "title" ] ), {
+            date.fromisoformat( day ): count for day, count
+            in cast( dict[ str, int ], data[ "days" ] ).items()
+        }, cast( str | None, data.get( "key" ) ), str( data.get( "group", "" ) ) )
+
+### streak.py ends here
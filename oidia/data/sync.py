@@ -0,0 +1,499 @@
+"""Provides syncing of streak data between devices."""
+
+##############################################################################
+# Python imports.
+from abc             import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from datetime        import date
+from json            import dump, dumps, loads
+from pathlib         import Path
+from typing          import Any, Final, NamedTuple, cast
+
+##############################################################################
+# Local imports.
+from .storage import Storage
+from .streak  import Streak
+
+##############################################################################
+class SyncError( Exception ):
+    """Exception raised when there is a problem syncing."""
+
+##############################################################################
+class Entry( NamedTuple ):
+    """A write of the done count for a day of a streak, as exchanged between devices."""
+
+    key: str
+    """str: The key of the streak that was written to."""
+
+    title: str
+    """str: The title of the streak, for creating it on devices that don't have it yet."""
+
+    day: date
+    """date: The day that was written to."""
+
+    value: int
+    """int: The done count that was written."""
+
+    clock: int
+    """int: The logical clock of the device that made the write, as of the write."""
+
+    device: str
+    """str: The name of the device that made the write."""
+
+    @property
+    def stamp( self ) -> tuple[ int, str ]:
+        """tuple[ int, str ]: The stamp of the write; of two writes to a day, the one with the later stamp wins."""
+        return ( self.clock, self.device )
+
+    def to_json( self ) -> str:
+        """Get the entry as a line of JSON.
+
+        Returns:
+            str: The entry as JSON.
+        """
+        return dumps( {
+            "key": self.key,
+            "title": self.title,
+            "day": self.day.isoformat(),
+            "value": self.value,
+            "clock": self.clock,
+            "device": self.device
+        } )
+
+    @classmethod
+    def from_json( cls, line: str ) -> "Entry":
+        """Create an entry from a line of JSON.
+
+        Args:
+            line (str): The line of JSON.
+
+        Returns:
+            Entry: The entry.
+
+        Raises:
+            SyncError: If the line isn't a valid entry.
+        """
+        try:
+            data = loads( line )
+            return cls(
+                str( data[ "key" ] ),
+                str( data[ "title" ] ),
+                date.fromisoformat( data[ "day" ] ),
+                int( data[ "value" ] ),
+                int( data[ "clock" ] ),
+                str( data[ "device" ] )
+            )
+        except ( ValueError, KeyError, TypeError ) as error:
+            raise SyncError( f"Invalid entry in sync log: {line!r}" ) from error
+
+##############################################################################
+class Stamps:
+    """The stamps of the writes that won, for each day that has been synced.
+
+    The stamps are kept in a file per year, and a year is only read when
+    a day in it is looked at, and only written when a day in it changed.
+    """
+
+    def __init__( self, directory: Path ) -> None:
+        """Initialise the stamps.
+
+        Args:
+            directory (Path): The directory that holds the stamps.
+        """
+        self._directory = directory
+        self._years: dict[ int, dict[ str, dict[ str, tuple[ int, str ] ] ] ] = {}
+        self._dirty: set[ int ] = set()
+
+    def _year( self, year: int ) -> dict[ str, dict[ str, tuple[ int, str ] ] ]:
+        """Get the stamps for a year, reading them if need be.
+
+        Args:
+            year (int): The year to get the stamps for.
+
+        Returns:
+            dict[ str, dict[ str, tuple[ int, str ] ] ]: The stamp of each day, for each streak key.
+        """
+        if year not in self._years:
+            stamps_file = self._directory / f"{year}.json"
+            self._years[ year ] = {
+                key: { day: ( clock, device ) for day, ( clock, device ) in days.items() }
+                for key, days in cast(
+                    dict[ str, dict[ str, tuple[ int, str ] ] ],
+                    loads( stamps_file.read_text( encoding="utf-8" ) )
+                ).items()
+            } if stamps_file.exists() else {}
+        return self._years[ year ]
+
+    def get( self, key: str, day: date ) -> tuple[ int, str ] | None:
+        """Get the stamp of the write that won for a day.
+
+        Args:
+            key (str): The key of the streak.
+            day (date): The day.
+
+        Returns:
+            tuple[ int, str ] | None: The stamp, or `None` if the day has never been synced.
+        """
+        return self._year( day.year ).get( key, {} ).get( day.isoformat() )
+
+    def set( self, key: str, day: date, stamp: tuple[ int, str ] ) -> None:
+        """Set the stamp of the write that won for a day.
+
+        Args:
+            key (str): The key of the streak.
+            day (date): The day.
+            stamp (tuple[ int, str ]): The stamp.
+        """
+        self._year( day.year ).setdefault( key, {} )[ day.isoformat() ] = stamp
+        self._dirty.add( day.year )
+
+    def save( self ) -> None:
+        """Save the years of stamps that have changed."""
+        self._directory.mkdir( parents=True, exist_ok=True )
+        for year in sorted( self._dirty ):
+            with ( self._directory / f"{year}.json" ).open( "w", encoding="utf-8" ) as stamps_file:
+                dump( self._years[ year ], stamps_file )
+        self._dirty.clear()
+
+##############################################################################
+class Transport( ABC ):
+    """The base class for the means of exchanging change logs between devices.
+
+    Each device has its own log of changes, that only it ever appends to.
+    Logs are read from a position onwards, so that a device only ever
+    reads the changes it hasn't seen yet.
+    """
+
+    @abstractmethod
+    def devices( self ) -> list[ str ]:
+        """Get the names of the devices that have change logs.
+
+        Returns:
+            list[ str ]: The names of the devices.
+        """
+
+    @abstractmethod
+    def append( self, device: str, lines: Iterable[ str ] ) -> None:
+        """Append lines to the change log of a device.
+
+        Args:
+            device (str): The name of the device.
+            lines (Iterable[ str ]): The lines to append.
+        """
+
+    @abstractmethod
+    def read( self, device: str, position: int ) -> tuple[ list[ str ], int ]:
+        """Read the lines of the change log of a device from a given position.
+
+        Args:
+            device (str): The name of the device.
+            position (int): The position to read from.
+
+        Returns:
+            tuple[ list[ str ], int ]: The lines that were read, and the
+                position to read from next time.
+        """
+
+##############################################################################
+class DirectoryTransport( Transport ):
+    """A transport that keeps the change logs as files in a directory.
+
+    The directory can be local or on any sort of shared or synced
+    filesystem; as each file is only ever appended to by one device
+    there's nothing for anything else to conflict over.
+    """
+
+    def __init__( self, directory: Path ) -> None:
+        """Initialise the transport.
+
+        Args:
+            directory (Path): The directory that holds the change logs.
+        """
+        self._directory = directory
+
+    def _log( self, device: str ) -> Path:
+        """Get the path to the change log for a device.
+
+        Args:
+            device (str): The name of the device.
+
+        Returns:
+            Path: The path to the change log.
+        """
+        return self._directory / f"{device}.jsonl"
+
+    def devices( self ) -> list[ str ]:
+        """Get the names of the devices that have change logs.
+
+        Returns:
+            list[ str ]: The names of the devices.
+        """
+        return sorted( log.stem for log in self._directory.glob( "*.jsonl" ) )
+
+    def append( self, device: str, lines: Iterable[ str ] ) -> None:
+        """Append lines to the change log of a device.
+
+        Args:
+            device (str): The name of the device.
+            lines (Iterable[ str ]): The lines to append.
+        """
+        self._directory.mkdir( parents=True, exist_ok=True )
+        with self._log( device ).open( "a", encoding="utf-8" ) as log:
+            log.writelines( f"{line}\n" for line in lines )
+
+    def read( self, device: str, position: int ) -> tuple[ list[ str ], int ]:
+        """Read the lines of the change log of a device from a given position.
+
+        Args:
+            device (str): The name of the device.
+            position (int): The position to read from.
+
+        Returns:
+            tuple[ list[ str ], int ]: The lines that were read, and the
+                position to read from next time.
+
+        Note:
+            Only whole lines are read, so a log that is part-way through
+            being written or copied is picked up from the same place next
+            time.
+        """
+        with self._log( device ).open( "rb" ) as log:
+            log.seek( position )
+            content = log.read()
+        complete = content[ :content.rfind( b"\n" ) + 1 ]
+        return complete.decode( "utf-8" ).splitlines(), position + len( complete )
+
+##############################################################################
+def transport_for( location: str ) -> Transport:
+    """Get the transport for a sync location.
+
+    Args:
+        location (str): The location to sync with.
+
+    Returns:
+        Transport: The transport for the location.
+
+    Raises:
+        SyncError: If the location isn't one that can be synced with.
+    """
+    if "://" in location:
+        raise SyncError( f"Don't know how to sync with {location}" )
+    return DirectoryTransport( Path( location ).expanduser() )
+
+##############################################################################
+class Sync:
+    """Syncs the streak data of this device with other devices.
+
+    Every change to the count for a day is a write of the new count,
+    stamped with this device's logical clock and its name. Of any two
+    writes to the same day, the one with the later stamp wins, wherever
+    and in whatever order they're seen, so every device ends up with the
+    same data once it has seen the same writes.
+
+    The days changed on this device are collected as they're saved, and
+    only those are sent; only the writes from other devices that haven't
+    been read yet are read. Writes are stamped, and remembered as waiting
+    to be sent, before they're sent, and seeing the same write again
+    changes nothing, so a sync that fails part-way through can simply be
+    run again.
+    """
+
+    STATE_FILE: Final = Path( "state.json" )
+    """Path: The name of the file that holds the state of the sync."""
+
+    STAMPS_DIRECTORY: Final = Path( "stamps" )
+    """Path: The name of the directory that the stamps of the synced days are kept in."""
+
+    def __init__( self, storage: Storage, transport: Transport, device: str ) -> None:
+        """Initialise the sync.
+
+        Args:
+            storage (Storage): The storage for the streaks to sync.
+            transport (Transport): The transport to sync through.
+            device (str): The name of this device.
+        """
+        self._storage   = storage
+        self._transport = transport
+        self._device    = device
+        self._stamps    = Stamps( self._state / self.STAMPS_DIRECTORY )
+        self._clock     = 0
+        self._read: dict[ str, int ] = {}
+        self._unsent: list[ str ] = []
+
+    @property
+    def _state( self ) -> Path:
+        """Path: The directory that the state of the sync is kept in."""
+        return self._storage.directory / Storage.SYNC_DIRECTORY
+
+    @property
+    def _state_file( self ) -> Path:
+        """Path: The file that holds the state of the sync."""
+        return self._state / self.STATE_FILE
+
+    @property
+    def joined( self ) -> bool:
+        """bool: Has this device synced before?"""
+        return self._state_file.exists()
+
+    def _load_state( self ) -> None:
+        """Load the state of the sync."""
+        state         = cast( dict[ str, Any ], loads( self._state_file.read_text( encoding="utf-8" ) ) )
+        self._clock   = int( state[ "clock" ] )
+        self._read    = { device: int( position ) for device, position in state[ "read" ].items() }
+        self._unsent  = [ str( line ) for line in state[ "unsent" ] ]
+
+    def _save_state( self ) -> None:
+        """Save the state of the sync, along with the stamps."""
+        self._stamps.save()
+        with self._state_file.open( "w", encoding="utf-8" ) as state_file:
+            dump( { "clock": self._clock, "read": self._read, "unsent": self._unsent }, state_file )
+
+    def _write( self, key: str, title: str, day: date, value: int ) -> None:
+        """Make a write from this device, and remember it as having won.
+
+        Args:
+            key (str): The key of the streak.
+            title (str): The title of the streak.
+            day (date): The day.
+            value (int): The done count.
+        """
+        self._clock += 1
+        entry = Entry( key, title, day, value, self._clock, self._device )
+        self._stamps.set( key, day, entry.stamp )
+        self._unsent.append( entry.to_json() )
+
+    def _send( self ) -> int:
+        """Send the writes that are waiting to be sent.
+
+        Returns:
+            int: The number of writes sent.
+        """
+        if sent := len( self._unsent ):
+            self._transport.append( self._device, self._unsent )
+            self._unsent = []
+        return sent
+
+    def _received( self, everyone: bool=False ) -> Iterator[ Entry ]:
+        """Read the writes from other devices that haven't been read yet.
+
+        Args:
+            everyone (bool): Read every log from the start, this device's own included.
+
+        Yields:
+            Entry: The writes.
+        """
+        for device in self._transport.devices():
+            if everyone or device != self._device:
+                lines, position = self._transport.read( device, 0 if everyone else self._read.get( device, 0 ) )
+                if device != self._device:
+                    self._read[ device ] = position
+                for line in lines:
+                    if line.strip():
+                        entry       = Entry.from_json( line )
+                        self._clock = max( self._clock, entry.clock )
+                        yield entry
+
+    def _apply( self, streaks: dict[ str, Streak ], entry: Entry ) -> bool:
+        """Apply a write from another device, if it wins.
+
+        Args:
+            streaks (dict[ str, Streak ]): The streaks to apply the write to, by key.
+            entry (Entry): The write.
+
+        Returns:
+            bool: `True` if the write won, `False` if not.
+        """
+        if ( stamp := self._stamps.get( entry.key, entry.day ) ) is not None and stamp >= entry.stamp:
+            return False
+        self._stamps.set( entry.key, entry.day, entry.stamp )
+        if ( streak := streaks.get( entry.key ) ) is None:
+            streak = streaks[ entry.key ] = Streak( entry.title, key=entry.key )
+        self._storage.archive.load_year( entry.day.year, streaks.values() )
+        if streak[ entry.day ] != entry.value:
+            streak[ entry.day ] = entry.value
+        # This came from elsewhere, so it's not a change to send back.
+        streak.changed_days.discard( entry.day )
+        return True
+
+    def _join( self ) -> tuple[ int, int ]:
+        """Join the sync for the first time.
+
+        Returns:
+            tuple[ int, int ]: The number of writes sent and the number of writes received.
+
+        Note:
+            As this device may well have started out with a copy of the
+            data from another device, what's here is compared with every
+            write that has been made so far. Any day that has been synced
+            before takes what was synced; any other day that has a count
+            here is sent as a fresh write.
+        """
+        streaks = { streak.key: streak for streak in self._storage.load() }
+        for year in self._storage.archive.years:
+            self._storage.archive.load_year( year, streaks.values() )
+        received = 0
+        for entry in self._received( everyone=True ):
+            received += entry.device != self._device
+            self._apply( streaks, entry )
+        for streak in streaks.values():
+            for day, count in sorted( streak.days.items() ):
+                if self._stamps.get( streak.key, day ) is None:
+                    self._write( streak.key, streak.title, day, count )
+        self._storage.outbox.unlink( missing_ok=True )
+        self._storage.save( streaks.values() )
+        self._save_state()
+        sent = self._send()
+        self._save_state()
+        return sent, received
+
+    def run( self ) -> tuple[ int, int ]:
+        """Sync the streak data.
+
+        Returns:
+            tuple[ int, int ]: The number of writes sent and the number of
+                writes received from other devices.
+
+        Raises:
+            SyncError: If there was a problem with the sync.
+
+        Note:
+            Deleting a streak isn't synced; a streak that has been deleted
+            will come back if another device changes it.
+        """
+        self._state.mkdir( parents=True, exist_ok=True )
+        if not self.joined:
+            return self._join()
+        self._load_state()
+        streaks = { streak.key: streak for streak in self._storage.load() }
+
+        # Stamp everything that has changed here since last time, and
+        # remember it all as waiting to be sent before sending any of it.
+        if self._storage.outbox.exists():
+            latest: dict[ tuple[ str, str ], dict[ str, Any ] ] = {}
+            for line in self._storage.outbox.read_text( encoding="utf-8" ).splitlines():
+                if line.strip():
+                    change = loads( line )
+                    latest[ change[ "key" ], change[ "day" ] ] = change
+            for change in latest.values():
+                self._write(
+                    str( change[ "key" ] ),
+                    str( change[ "title" ] ),
+                    date.fromisoformat( change[ "day" ] ),
+                    int( change[ "count" ] )
+                )
+            self._save_state()
+            self._storage.outbox.unlink()
+        sent = self._send()
+
+        # Apply anything from elsewhere that hasn't been seen yet.
+        received = 0
+        changed  = False
+        for entry in self._received():
+            received += 1
+            changed   = self._apply( streaks, entry ) or changed
+        if changed:
+            self._storage.save( streaks.values() )
+        self._save_state()
+        return sent, received
+
+### sync.py ends here
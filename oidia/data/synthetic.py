@@ -0,0 +1,181 @@
+"""Provides synthetic streak data, for exercising the application."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Iterable
+from datetime        import date, timedelta
+from json            import dump, loads
+from random          import Random
+from typing          import Any, NamedTuple
+
+##############################################################################
+# Local imports.
+from .storage import Storage
+from .streak  import Streak
+
+##############################################################################
+def synthetic_streaks(
+    count: int, history: int, density: float=0.5, groups: int=0, seed: int=0
+) -> list[ Streak ]:
+    """Make some streaks full of made-up data.
+
+    Args:
+        count (int): The number of streaks to make.
+        history (int): The number of days, back from today, that the data covers.
+        density (float): The proportion of days that are done.
+        groups (int): The number of groups to spread the streaks across.
+        seed (int): The seed for the random numbers, so the same data can be made again.
+
+    Returns:
+        list[ Streak ]: The streaks.
+
+    Note:
+        When there are groups, about half of the streaks are left ungrouped
+        and the rest are dealt out between the groups.
+    """
+    random = Random( seed )
+    today  = date.today()
+    return [
+        Streak(
+            f"Streak {number + 1}",
+            {
+                today - timedelta( days=day ): random.randint( 1, 3 )
+                for day in range( history ) if random.random() < density
+            },
+            group=f"Group {number // 2 % groups + 1}" if groups and number % 2 else ""
+        ) for number in range( count )
+    ]
+
+##############################################################################
+class StreakShape( NamedTuple ):
+    """The shape of the data for a streak, with nothing to say what it is."""
+
+    group: int
+    """int: The number of the group the streak is in, or 0 if it isn't grouped."""
+
+    days: int
+    """int: The number of days the streak was done."""
+
+    total: int
+    """int: The total done count for the streak."""
+
+##############################################################################
+class Shape( NamedTuple ):
+    """The shape of a set of streak data, with nothing to say what it is.
+
+    This holds enough to make up data that puts the application to the
+    same amount of work as the real thing: how many streaks there are,
+    how they're grouped, how far back the data goes, and how much of it
+    there is for each streak. Titles, group names and the days themselves
+    aren't kept.
+    """
+
+    history: int
+    """int: The number of days, back from today, that the data covers."""
+
+    streaks: tuple[ StreakShape, ... ]
+    """tuple[ StreakShape, ... ]: The shape of each streak, in order."""
+
+    @classmethod
+    def of( cls, storage: Storage ) -> "Shape":
+        """Get the shape of the data held in some storage.
+
+        Args:
+            storage (Storage): The storage to get the shape of.
+
+        Returns:
+            Shape: The shape of the data.
+
+        Note:
+            This reads straight from storage rather than from any streaks
+            that are loaded, and the archived years are read one at a time.
+            Streaks are counted by their position in the data, as data from
+            before streaks had keys has none to go by; only streaks with a
+            key can have archived years.
+        """
+        streaks = loads( storage.data_file.read_text( encoding="utf-8" ) ) if storage.data_file.exists() else []
+        counts  = [ list( streak[ "days" ].values() ) for streak in streaks ]
+        keyed   = { key: number for number, streak in enumerate( streaks ) if ( key := streak.get( "key" ) ) }
+        first   = min( ( day for streak in streaks for day in streak[ "days" ] ), default=date.today().isoformat() )
+        for year in storage.archive.years:
+            for key, days in storage.archive.read( year ).items():
+                if key in keyed and days:
+                    counts[ keyed[ key ] ].extend( days.values() )
+                    first = min( first, *days )
+        groups: dict[ str, int ] = { "": 0 }
+        for streak in streaks:
+            groups.setdefault( streak.get( "group", "" ), len( groups ) )
+        return cls( ( date.today() - date.fromisoformat( first ) ).days + 1, tuple(
+            StreakShape( groups[ streak.get( "group", "" ) ], len( days ), sum( days ) )
+            for streak, days in zip( streaks, counts )
+        ) )
+
+    def to_json( self ) -> dict[ str, Any ]:
+        """Get the shape as JSON-friendly data.
+
+        Returns:
+            dict[ str, Any ]: The shape.
+        """
+        return { "history": self.history, "streaks": [ list( streak ) for streak in self.streaks ] }
+
+    @classmethod
+    def from_json( cls, data: dict[ str, Any ] ) -> "Shape":
+        """Create a shape from JSON-friendly data.
+
+        Args:
+            data (dict[ str, Any ]): The data.
+
+        Returns:
+            Shape: The shape.
+
+        Raises:
+            ValueError: If the data isn't a valid shape.
+        """
+        try:
+            return cls( int( data[ "history" ] ), tuple(
+                StreakShape( int( group ), int( days ), int( total ) ) for group, days, total in data[ "streaks" ]
+            ) )
+        except ( KeyError, TypeError ) as error:
+            raise ValueError( f"Not a valid data shape: {error}" ) from None
+
+    def make( self, seed: int=0 ) -> list[ Streak ]:
+        """Make up streaks that have this shape.
+
+        Args:
+            seed (int): The seed for the random numbers, so the same data can be made again.
+
+        Returns:
+            list[ Streak ]: The streaks.
+        """
+        random = Random( seed )
+        today  = date.today()
+        made: list[ Streak ] = []
+        for number, shape in enumerate( self.streaks ):
+            days   = sorted( random.sample( range( self.history ), min( shape.days, self.history ) ) )
+            counts = [ 1 ] * len( days )
+            for _ in range( max( 0, shape.total - len( days ) ) if days else 0 ):
+                counts[ random.randrange( len( counts ) ) ] += 1
+            made.append( Streak(
+                f"Streak {number + 1}",
+                { today - timedelta( days=day ): count for day, count in zip( days, counts ) },
+                group=f"Group {shape.group}" if shape.group else ""
+            ) )
+        return made
+
+##############################################################################
+def seed_storage( storage: Storage, streaks: Iterable[ Streak ] ) -> None:
+    """Replace the data in some storage with the given streaks.
+
+    Args:
+        storage (Storage): The storage to write the streaks to.
+        streaks (Iterable[ Streak ]): The streaks to write.
+
+    Note:
+        All of the days are written to the main data file; any that belong
+        in the archive are moved there the first time the data is loaded.
+    """
+    storage.directory.mkdir( parents=True, exist_ok=True )
+    with storage.data_file.open( "w", encoding="utf-8" ) as data:
+        dump( [ streak.to_dict() for streak in streaks ], data )
+
+### synthetic.py ends here
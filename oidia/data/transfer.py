@@ -0,0 +1,340 @@
+"""Provides tools for transferring streak data in and out of the application."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Callable, Iterable, Iterator
+from csv             import DictReader, writer
+from datetime        import date, datetime, timedelta, timezone
+from io              import StringIO
+from json            import dumps, loads
+from pathlib         import Path
+from typing          import NamedTuple, TextIO
+from uuid            import NAMESPACE_URL, uuid5
+
+##############################################################################
+# Local imports.
+from .archive import Archive
+from .streak  import Streak
+
+##############################################################################
+class TransferError( Exception ):
+    """Exception raised when there is a problem transferring data."""
+
+##############################################################################
+class Row( NamedTuple ):
+    """A single row of transferred streak data."""
+
+    title: str
+    """str: The title of the streak."""
+
+    day: date
+    """date: The day the row is for."""
+
+    value: int
+    """int: The done count for the day."""
+
+##############################################################################
+IMPORT_FORMATS = ( "csv", "jsonl" )
+"""tuple[ str, ... ]: The names of the formats that rows can be read from."""
+
+##############################################################################
+EXPORT_FORMATS = ( "csv", "jsonl", "ical" )
+"""tuple[ str, ... ]: The names of the formats that rows can be written to."""
+
+##############################################################################
+def guess_format( path: Path ) -> str:
+    """Guess the format of a file from its name.
+
+    Args:
+        path (Path): The path to the file.
+
+    Returns:
+        str: The name of the format.
+
+    Raises:
+        TransferError: If the format can't be worked out.
+    """
+    if ( suffix := path.suffix.lower() ) == ".csv":
+        return "csv"
+    if suffix in ( ".jsonl", ".ndjson" ):
+        return "jsonl"
+    if suffix in ( ".ics", ".ical" ):
+        return "ical"
+    raise TransferError( f"Unable to work out the format of {path}" )
+
+##############################################################################
+def _row( record: dict[ str, object ], line: int ) -> Row:
+    """Turn a record from a file into a row.
+
+    Args:
+        record (dict[ str, object ]): The record to convert.
+        line (int): The line the record came from.
+
+    Returns:
+        Row: The row.
+
+    Raises:
+        TransferError: If the record is not a valid row.
+
+    Note:
+        If a record has no count, or an empty one, it is taken to be a
+        count of 1, which is handy for trackers that only record the dates
+        something was done. A count of 0 is a count of 0.
+    """
+    try:
+        count = record.get( "count" )
+        row   = Row(
+            str( record[ "title" ] ).strip(),
+            date.fromisoformat( str( record[ "date" ] ).strip() ),
+            1 if count is None or str( count ).strip() == "" else int( str( count ).strip() )
+        )
+    except ( KeyError, TypeError, ValueError ) as error:
+        raise TransferError( f"Line {line}: not a valid row ({error})" ) from error
+    if not row.title:
+        raise TransferError( f"Line {line}: the row has no title" )
+    return row
+
+##############################################################################
+def read_rows( source: TextIO, data_format: str ) -> Iterator[ Row ]:
+    """Read rows of streak data from a source.
+
+    Args:
+        source (TextIO): The source to read from.
+        data_format (str): The format of the data in the source.
+
+    Yields:
+        Row: The rows from the source, one at a time.
+
+    Raises:
+        TransferError: If the data is not valid.
+    """
+    if data_format == "csv":
+        reader = DictReader( source )
+        if not { "title", "date" } <= set( reader.fieldnames or () ):
+            raise TransferError( "The CSV data needs title and date columns" )
+        for record in reader:
+            yield _row( record, reader.line_num )
+    elif data_format == "jsonl":
+        for line, text in enumerate( source, start=1 ):
+            if text.strip():
+                try:
+                    yield _row( loads( text ), line )
+                except ValueError as error:
+                    raise TransferError( f"Line {line}: not valid JSON ({error})" ) from error
+    else:
+        raise TransferError( f"Unknown format: {data_format}" )
+
+##############################################################################
+class Tally( NamedTuple ):
+    """Rows of streak data, added up by the title of the streak and the day."""
+
+    rows: int
+    """int: The number of rows that were added up."""
+
+    days: dict[ str, dict[ date, int ] ]
+    """dict[ str, dict[ date, int ] ]: The total done count for each day, for each title."""
+
+    @classmethod
+    def of( cls, rows: Iterable[ Row ] ) -> "Tally":
+        """Add up some rows of streak data.
+
+        Args:
+            rows (Iterable[ Row ]): The rows to add up.
+
+        Returns:
+            Tally: The tally of the rows.
+
+        Raises:
+            TransferError: If there was a problem with the rows.
+
+        Note:
+            The rows are consumed in a single pass, so memory use depends
+            on the number of different days in the rows, not on the number
+            of rows.
+        """
+        tally: dict[ str, dict[ date, int ] ] = {}
+        counted = 0
+        for counted, ( title, day, count ) in enumerate( rows, start=1 ):
+            days        = tally.setdefault( title, {} )
+            days[ day ] = days.get( day, 0 ) + count
+        return cls( counted, tally )
+
+    @property
+    def years( self ) -> set[ int ]:
+        """set[ int ]: The years that the rows cover."""
+        return { day.year for days in self.days.values() for day in days }
+
+##############################################################################
+def merge_tally(
+    streaks: list[ Streak ],
+    tally: Tally,
+    archive: Archive,
+    added: list[ Streak ],
+    save: Callable[ [ list[ Streak ] ], None ] | None=None
+) -> None:
+    """Merge a tally of rows of streak data into a list of streaks.
+
+    Args:
+        streaks (list[ Streak ]): The streaks to merge into.
+        tally (Tally): The tally of the rows to merge.
+        archive (Archive): The archive for the streaks.
+        added (list[ Streak ]): A list to add newly-created streaks to.
+        save (Callable[ [ list[ Streak ] ], None ] | None): Called to save the streaks as they are.
+
+    Note:
+        Rows are matched to streaks by title, and the total for each day
+        in the tally replaces the count already recorded for the day; so
+        importing the same rows again changes nothing.
+
+        Archived years that are already loaded are merged into along with
+        the years that are never archived. Any other archived year is
+        loaded, merged into, saved and then unloaded again, a year at a
+        time, so that importing a long history doesn't leave every year
+        of it in memory. `save` is called with all of the streaks before
+        each such year is unloaded, for anything that needs to know about
+        the changes before they're dropped from memory.
+    """
+    by_title = { streak.title: streak for streak in streaks }
+    for title in tally.days:
+        if title not in by_title:
+            added.append( by_title.setdefault( title, Streak( title ) ) )
+    everything = streaks + added
+    cold: dict[ int, list[ tuple[ Streak, date, int ] ] ] = {}
+    for title, days in tally.days.items():
+        for day, count in days.items():
+            if archive.is_archived( day.year ) and not archive.is_loaded( day.year ):
+                cold.setdefault( day.year, [] ).append( ( by_title[ title ], day, count ) )
+            else:
+                by_title[ title ][ day ] = count
+    for year, counts in sorted( cold.items() ):
+        archive.load_year( year, everything )
+        for streak, day, count in counts:
+            streak[ day ] = count
+        if save is not None:
+            save( everything )
+        archive.unload_year( year, everything )
+
+##############################################################################
+def csv_lines( rows: Iterable[ Row ] ) -> Iterator[ str ]:
+    """Turn rows of streak data into lines of CSV.
+
+    Args:
+        rows (Iterable[ Row ]): The rows to turn into CSV.
+
+    Yields:
+        str: The lines of CSV, starting with a header line.
+    """
+    line = StringIO()
+    csv  = writer( line, lineterminator="\n" )
+    def _line( values: Iterable[ object ] ) -> str:
+        """Turn some values into a line of CSV."""
+        line.seek( 0 )
+        line.truncate()
+        csv.writerow( values )
+        return line.getvalue()
+    yield _line( ( "title", "date", "count" ) )
+    for title, day, count in rows:
+        yield _line( ( title, day.isoformat(), count ) )
+
+##############################################################################
+def jsonl_lines( rows: Iterable[ Row ] ) -> Iterator[ str ]:
+    """Turn rows of streak data into lines of JSON.
+
+    Args:
+        rows (Iterable[ Row ]): The rows to turn into JSON.
+
+    Yields:
+        str: The lines of JSON, one per row.
+    """
+    for title, day, count in rows:
+        yield f"{dumps( { 'title': title, 'date': day.isoformat(), 'count': count } )}\n"
+
+##############################################################################
+def _ical_text( text: str ) -> str:
+    """Escape text for use in an iCalendar value.
+
+    Args:
+        text (str): The text to escape.
+
+    Returns:
+        str: The escaped text.
+    """
+    return text.replace( "\\", "\\\\" ).replace( ";", "\\;" ).replace( ",", "\\," ).replace( "\n", "\\n" )
+
+##############################################################################
+def _ical_line( line: str ) -> str:
+    """Fold a content line of an iCalendar document.
+
+    Args:
+        line (str): The content line.
+
+    Returns:
+        str: The line, folded and ended as iCalendar needs.
+
+    Note:
+        As RFC 5545 requires, no line is longer than 75 octets; longer
+        lines are broken with a line break followed by a space, and never
+        part way through the encoding of a character.
+    """
+    folded: list[ str ] = []
+    piece, size = "", 0
+    for character in line:
+        if size + ( octets := len( character.encode( "utf-8" ) ) ) > 75:
+            folded.append( piece )
+            piece, size = " ", 1
+        piece += character
+        size  += octets
+    return "\r\n".join( [ *folded, piece ] ) + "\r\n"
+
+##############################################################################
+def ical_lines( rows: Iterable[ Row ] ) -> Iterator[ str ]:
+    """Turn rows of streak data into an iCalendar document.
+
+    Args:
+        rows (Iterable[ Row ]): The rows to turn into calendar events.
+
+    Yields:
+        str: The lines of the calendar, with each row being an all-day event.
+
+    Note:
+        The UID of each event is derived from the title of the streak and
+        the day, so exporting the same data again results in the same
+        events.
+    """
+    stamp = datetime.now( timezone.utc ).strftime( "%Y%m%dT%H%M%SZ" )
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//davep.org//OIDIA//EN\r\n"
+    for title, day, count in rows:
+        yield "".join( _ical_line( line ) for line in (
+            "BEGIN:VEVENT",
+            f"UID:{uuid5( NAMESPACE_URL, f'oidia:{title}:{day.isoformat()}' )}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day.strftime( '%Y%m%d' )}",
+            f"DTEND;VALUE=DATE:{( day + timedelta( days=1 ) ).strftime( '%Y%m%d' )}",
+            f"SUMMARY:{_ical_text( title if count == 1 else f'{title} (x{count})' )}",
+            "END:VEVENT"
+        ) )
+    yield "END:VCALENDAR\r\n"
+
+##############################################################################
+def write_rows( rows: Iterable[ Row ], data_format: str ) -> Iterator[ str ]:
+    """Turn rows of streak data into text in a given format.
+
+    Args:
+        rows (Iterable[ Row ]): The rows to write.
+        data_format (str): The format to write the rows in.
+
+    Yields:
+        str: The text of the rows, a piece at a time.
+
+    Raises:
+        TransferError: If the format isn't known.
+    """
+    if data_format == "csv":
+        return csv_lines( rows )
+    if data_format == "jsonl":
+        return jsonl_lines( rows )
+    if data_format == "ical":
+        return ical_lines( rows )
+    raise TransferError( f"Unknown format: {data_format}" )
+
+### transfer.py ends here
@@ -0,0 +1,230 @@
+"""Provides recording of what is done in the application, and replaying it."""
+
+##############################################################################
+# Python imports.
+from contextvars import Context
+from json        import dumps, loads
+from time        import perf_counter
+from typing      import IO, Any, Final, NamedTuple
+from unicodedata import lookup
+
+##############################################################################
+# Textual imports.
+from textual       import events
+from textual.keys  import KEY_TO_UNICODE_NAME, REPLACED_KEYS
+from textual.pilot import Pilot
+
+##############################################################################
+# Local imports.
+from .data import Shape
+
+##############################################################################
+def action_name( action: str ) -> str:
+    """Get the plain name of an action.
+
+    Args:
+        action (str): The action, as it was given to the application.
+
+    Returns:
+        str: The name of the action, without any namespace or parameters.
+    """
+    return action.split( "(", 1 )[ 0 ].rsplit( ".", 1 )[ -1 ]
+
+##############################################################################
+def key_event( key: str ) -> events.Key:
+    """Make the event for a key being pressed.
+
+    Args:
+        key (str): The name of the key.
+
+    Returns:
+        events.Key: The event, with the character the key types, if it types one.
+
+    Note:
+        The event is made outside of any message pump, just as the events
+        made by a driver are, so that it isn't seen as sent by a widget and
+        bubbles all the way up to the application.
+    """
+    name = REPLACED_KEYS.get( key, key )
+    try:
+        character: str | None = lookup( KEY_TO_UNICODE_NAME.get( name, name.upper() ) )
+    except KeyError:
+        character = key if len( key ) == 1 else None
+    return Context().run( events.Key, key, character )
+
+##############################################################################
+async def press( pilot: Pilot[ Any ], *keys: str ) -> None:
+    """Press keys in the application being piloted.
+
+    Args:
+        pilot (Pilot[ Any ]): The pilot for the application.
+        keys (str): The names of the keys to press.
+
+    Note:
+        Unlike `Pilot.press` this reports nothing; each key is posted to
+        the application, and waited on until the application is idle.
+    """
+    for key in keys:
+        pilot.app.post_message( key_event( key ) )
+        await pilot.pause()
+
+##############################################################################
+class Recorder:
+    """Records the keys that are pressed, and the actions they lead to.
+
+    Each key and each action is written as a line of JSON as it happens,
+    after a header line that gives the size of the terminal and the shape
+    of the data. Nothing that is typed into an input is recorded as it was
+    typed, and only the shape of the data is recorded, never the data.
+    """
+
+    VERSION: Final = 1
+    """int: The version of the format of a recording."""
+
+    def __init__( self, output: IO[ str ] | None=None, shape: Shape | None=None ) -> None:
+        """Initialise the recorder.
+
+        Args:
+            output (IO[ str ] | None): Where to write the recording.
+            shape (Shape | None): The shape of the data being worked with.
+        """
+        self._output  = output
+        self._shape   = shape or Shape( 0, () )
+        self._started = perf_counter()
+
+    def _write( self, **event: Any ) -> None:
+        """Write an event to the recording.
+
+        Args:
+            event (Any): The details of the event.
+        """
+        if self._output is not None:
+            self._output.write( f"{dumps( event )}\n" )
+            self._output.flush()
+
+    def start( self, size: tuple[ int, int ] ) -> None:
+        """Start the recording.
+
+        Args:
+            size (tuple[ int, int ]): The size of the terminal.
+        """
+        self._started = perf_counter()
+        self._write( version=self.VERSION, size=list( size ), shape=self._shape.to_json() )
+
+    def key( self, key: str ) -> None:
+        """Record a key being pressed.
+
+        Args:
+            key (str): The key.
+        """
+        self._write( time=round( perf_counter() - self._started, 4 ), key=key )
+
+    def action( self, action: str, elapsed: float ) -> None:
+        """Record an action being carried out.
+
+        Args:
+            action (str): The action.
+            elapsed (float): How long the action took, in seconds.
+        """
+        self._write( time=round( perf_counter() - self._started, 4 ), action=action, elapsed=round( elapsed, 6 ) )
+
+##############################################################################
+class Recording( NamedTuple ):
+    """A recording that has been read back in."""
+
+    size: tuple[ int, int ]
+    """tuple[ int, int ]: The size of the terminal the recording was made in."""
+
+    shape: Shape
+    """Shape: The shape of the data the recording was made with."""
+
+    keys: list[ str ]
+    """list[ str ]: The keys that were pressed, in order."""
+
+    @classmethod
+    def read( cls, source: IO[ str ] ) -> "Recording":
+        """Read a recording.
+
+        Args:
+            source (IO[ str ]): The source of the recording.
+
+        Returns:
+            Recording: The recording.
+
+        Raises:
+            ValueError: If the recording couldn't be read.
+        """
+        try:
+            header = loads( source.readline() )
+            if header.get( "version" ) != Recorder.VERSION:
+                raise ValueError( "Not a recording, or one from a different version of OIDIA" )
+            width, height = header[ "size" ]
+            keys = [
+                str( event[ "key" ] ) for event in ( loads( line ) for line in source if line.strip() )
+                if "key" in event
+            ]
+            return cls( ( int( width ), int( height ) ), Shape.from_json( header[ "shape" ] ), keys )
+        except ( KeyError, TypeError, AttributeError ) as error:
+            raise ValueError( f"Not a valid recording: {error}" ) from None
+
+##############################################################################
+class Replayer( Recorder ):
+    """Replays a recording, timing each of the actions.
+
+    The keys are pressed one after another through a pilot, each as soon
+    as the application has finished with the last, rather than with the
+    gaps there were when they were recorded; so a replay of the same
+    recording against the same data does the same thing every time. The
+    time a key took is put down to the action it led to.
+    """
+
+    NO_ACTION: Final = "(no action)"
+    """str: The name that the time for keys that didn't lead to an action is put down to."""
+
+    def __init__( self, recording: Recording ) -> None:
+        """Initialise the replayer.
+
+        Args:
+            recording (Recording): The recording to replay.
+        """
+        super().__init__()
+        self._recording = recording
+        self._actions: list[ str ] = []
+        self.timings: dict[ str, list[ float ] ] = {}
+        """dict[ str, list[ float ] ]: The times taken by each action, in seconds."""
+
+    def action( self, action: str, elapsed: float ) -> None:
+        """Make a note of an action being carried out.
+
+        Args:
+            action (str): The action.
+            elapsed (float): How long the action took, in seconds.
+        """
+        self._actions.append( action )
+
+    async def run( self, pilot: Pilot[ Any ] ) -> None:
+        """Replay the recording.
+
+        Args:
+            pilot (Pilot[ Any ]): The pilot for the application to replay the recording in.
+
+        Note:
+            The application is asked to exit once the replay is done, if
+            the recording didn't do that itself.
+        """
+        app = pilot.app
+        await pilot.pause()
+        try:
+            for key in self._recording.keys:
+                self._actions.clear()
+                started = perf_counter()
+                await press( pilot, key )
+                elapsed = perf_counter() - started
+                name = action_name( self._actions[ 0 ] ) if self._actions else self.NO_ACTION
+                self.timings.setdefault( name, [] ).append( elapsed )
+                if not app.is_running:
+                    break
+        finally:
+            app.exit()
+
+### recording.py ends here
@@ -2,12 +2,14 @@
 
 ##############################################################################
 # Local imports.
-from .main import Main
+from .main    import Main
+from .heatmap import Heatmap
 
 ##############################################################################
 # Export the screens.
 __all__ = [
-    "Main"
+    "Main",
+    "Heatmap"
 ]
 
 ### __init__.py ends here
@@ -0,0 +1,57 @@
+"""Provides the base for screens that let the user filter the streaks."""
+
+##############################################################################
+# Textual imports.
+from textual.widgets import Input
+
+##############################################################################
+# Local imports.
+from ..widgets import GroupHeader, StreakDay, StreakFilter, StreakLine
+from .rows     import RowsScreen
+
+##############################################################################
+class FilterScreen( RowsScreen ):
+    """The base for a screen that lets the user filter the streaks by title.
+
+    The screen is expected to have a `StreakFilter`; as the user types in
+    it only the streaks whose titles match are shown, and once it's closed
+    focus goes back to where it was before filtering started.
+    """
+
+    _filtered_from: StreakLine | GroupHeader | None = None
+    """StreakLine | GroupHeader | None: The row that had focus when filtering started."""
+
+    def action_filter( self ) -> None:
+        """Start filtering the streaks."""
+        if not isinstance( self.focused, StreakFilter ):
+            self._filtered_from = self.streaks.focused_row
+        self.query_one( StreakFilter ).open()
+
+    def action_jump( self ) -> None:
+        """Jump to the first streak that matches the filter."""
+        if ( line := self.streaks.first_match ) is not None:
+            line.query( StreakDay ).last().focus()
+            line.scroll_visible()
+
+    def on_streak_filter_closed( self, _: StreakFilter.Closed ) -> None:
+        """Move focus back to the streaks once the filter has been closed."""
+        if isinstance( self.focused, StreakFilter ):
+            rows = self.streaks.rows
+            if ( row := self._filtered_from ) not in rows:
+                row = rows[ 0 ] if rows else None
+            if row is None:
+                self.set_focus( None )
+            else:
+                self.focus_row( row )
+        self._filtered_from = None
+
+    def on_input_changed( self, event: Input.Changed ) -> None:
+        """Handle the user changing an input.
+
+        Args:
+            event (Input.Changed): The change event.
+        """
+        if isinstance( event.input, StreakFilter ):
+            self.streaks.filter( event.value.strip() )
+
+### filtering.py ends here
@@ -0,0 +1,91 @@
+"""A screen that shows a year-long heatmap of each streak."""
+
+##############################################################################
+# Python imports.
+from datetime import date
+
+##############################################################################
+# Textual imports.
+from textual.app        import ComposeResult
+from textual.binding    import Binding
+from textual.containers import Vertical
+from textual.reactive   import reactive
+from textual.screen     import Screen
+from textual.widgets    import Header, Footer
+
+##############################################################################
+# Local imports.
+from ..widgets import HeatmapHeader, StreakHeatmap, Streaks
+
+##############################################################################
+class Heatmap( Screen ):
+    """A screen that shows a year-long heatmap of each streak."""
+
+    DEFAULT_CSS = """
+    Heatmap {
+        background: $primary-background-darken-1;
+    }
+
+    Heatmap HeatmapHeader {
+        background: $primary-background;
+    }
+
+    Heatmap Vertical {
+        overflow-y: auto;
+        scrollbar-background: $primary-background-darken-1;
+    }
+    """
+    """str: The styles for the heatmap screen."""
+
+    BINDINGS = [
+        Binding( "up",     "app.focus_previous", "", show=False ),
+        Binding( "down",   "app.focus_next",     "", show=False ),
+        Binding( "left",   "year(-1)",           "Previous Year" ),
+        Binding( "right",  "year(1)",            "Next Year" ),
+        Binding( "escape", "app.pop_screen",     "Back" )
+    ]
+    """list[ Binding ]: The bindings for the heatmap screen."""
+
+    year = reactive( date.today().year, init=False )
+    """int: The year being shown."""
+
+    def __init__( self, streaks: Streaks ) -> None:
+        """Initialise the heatmap screen.
+
+        Args:
+            streaks (Streaks): The streaks to show.
+        """
+        super().__init__()
+        self._streaks = streaks
+
+    def compose( self ) -> ComposeResult:
+        """Compose the content of the heatmap screen.
+
+        Returns:
+            ComposeResult: The result of composing the screen.
+        """
+        yield Header( show_clock=True )
+        yield HeatmapHeader()
+        yield Vertical( *[ StreakHeatmap( streak ) for streak in self._streaks.streaks ] )
+        yield Footer()
+
+    async def watch_year( self, new_year: int ) -> None:
+        """React to the year being changed.
+
+        Args:
+            new_year (int): The new year to show.
+        """
+        await self._streaks.visit( date( new_year, 1, 1 ), date( new_year, 12, 31 ) )
+        self.query_one( HeatmapHeader ).year = new_year
+        for heatmap in self.query( StreakHeatmap ):
+            heatmap.year = new_year
+
+    def action_year( self, years: int ) -> None:
+        """Move the year being shown.
+
+        Args:
+            years (int): The number of years to move by.
+        """
+        self.year += years
+
+### heatmap.py ends here
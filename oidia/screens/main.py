@@ -1,19 +1,33 @@
 """The main screen of the application."""
 
+##############################################################################
+# Python imports.
+from pathlib import Path
+from typing  import Any
+
 ##############################################################################
 # Textual imports.
 from textual.app        import ComposeResult
-from textual.screen     import Screen
 from textual.widgets    import Header, Footer, Input
 from textual.containers import Container
 from textual.binding    import Binding
+from textual.events     import DescendantFocus
+from textual.message    import Message
 
 ##############################################################################
 # Local imports.
-from ..widgets import Streaks, Timeline, StreakLine, StreakDay, TitleInput
+from ..data     import (
+    Datasets, History, SortOrder, Store, Streak, TransferError, guess_format, read_rows
+)
+from ..widgets  import (
+    Streaks, Timeline, StreakDay, TitleInput, StreakFilter, DayNote
+)
+from .filtering import FilterScreen
+from .heatmap   import Heatmap
+from .selection import SelectionScreen
 
 ##############################################################################
-class Main( Screen ):
+class Main( FilterScreen, SelectionScreen ):
     """The main screen of the application."""
 
     DEFAULT_CSS = """
@@ -67,6 +81,10 @@ class Main( Screen ):
         color: darkgreen;
         background: lightgreen;
     }
+
+    StreakDay.selected {
+        text-style: bold reverse;
+    }
     """
     """str: The styles for the main screen."""
 
@@ -74,10 +92,41 @@ class Main( Screen ):
         Binding( "left_square_bracket",  "zoom(-1)",    "Zoom In" ),
         Binding( "right_square_bracket", "zoom(1)",     "Zoom Out" ),
         Binding( "a",                    "add",         "Add Streak", key_display="a" ),
-        Binding( "escape",               "app.quit",    "Quit" )
+        Binding( "h",                    "heatmap",     "Heatmap" ),
+        Binding( "i",                    "import",      "Import" ),
+        Binding( "d",                    "dataset",     "Dataset" ),
+        Binding( "slash",                "filter",      "Filter", key_display="/" ),
+        Binding( "s",                    "sort",        "Sort" ),
+        Binding( "v",                    "select",      "Select" ),
+        Binding( "ctrl+z",               "undo",        "Undo" ),
+        Binding( "ctrl+y",               "redo",        "Redo" ),
+        Binding( "escape",               "escape",      "Quit" )
     ]
     """list[ Binding ]: The bindings for the main screen."""
 
+    _sorted_by: SortOrder | None = None
+    """SortOrder | None: The order the streaks were last sorted into."""
+
+    def __init__(
+        self,
+        *args: Any,
+        history: History | None=None,
+        store: Store | None=None,
+        datasets: Datasets | None=None,
+        **kwargs: Any
+    ) -> None:
+        """Initialise the main screen.
+
+        Args:
+            history (History | None): The history to record changes in.
+            store (Store | None): The store of streaks to show.
+            datasets (Datasets | None): The datasets that can be switched between, if any.
+        """
+        super().__init__( *args, **kwargs )
+        self._history  = history
+        self._store    = store
+        self._datasets = datasets
+
     def compose( self ) -> ComposeResult:
         """Compose the content of the main screen.
 
@@ -85,67 +134,181 @@ class Main( Screen ):
             ComposeResult: The result of composing the screen.
         """
         yield Header( show_clock=True )
-        self.streaks = Streaks()
-        yield Container( Timeline( id="header" ), self.streaks )
+        self.streaks = Streaks( history=self._history, store=self._store )
+        yield Container(
+            Timeline( id="header" ), StreakFilter( placeholder="Filter" ), self.streaks, DayNote()
+        )
         yield Footer()
 
     async def on_mount( self ) -> None:
         """Set up the screen on mount."""
         await self.streaks.load()
-        if len( self.streaks.children ) > 0:
-            self.streaks[ 0 ].query( StreakDay ).last().focus()
+        if rows := self.streaks.rows:
+            self.focus_row( rows[ 0 ] )
 
-    def action_focus_left( self ) -> None:
+    async def visit( self ) -> None:
+        """Make sure the data for the dates being shown is loaded."""
+        header = self.query_one( "#header", Timeline )
+        await self.streaks.visit( header.start_date, header.end_date )
+
+    async def show_note( self ) -> None:
+        """Show the note for the focused day, if it has one.
+
+        Note:
+            This is the only place the text of a note is asked for, so
+            notes are only ever read for days that are looked at.
+        """
+        text = ""
+        if (
+            isinstance( focused := self.focused, StreakDay ) and focused.noted and focused.editable
+            and ( line := self.streaks.focused_streak ) is not None
+        ):
+            await self.streaks.notes.fetch( line.streak.key )
+            text = self.streaks.notes.get( line.streak.key, focused.day )
+        self.query_one( DayNote ).show( text )
+
+    async def on_screen_resume( self ) -> None:
+        """Make sure the data being shown is loaded when we come back to the screen."""
+        await self.visit()
+
+    async def on_streaks_changed( self, _: Streaks.Changed ) -> None:
+        """Bring the display up to date when another session changes the streaks."""
+        await self.streaks.resync( **self.line_settings )
+        self.highlight_selection()
+        if self.focused is None and ( rows := self.streaks.rows ):
+            self.focus_row( rows[ 0 ] )
+
+    async def action_focus_left( self ) -> None:
         """Action wrapper for moving focus to the left."""
         if isinstance( self.screen.focused, StreakDay ) and self.screen.focused.is_first:
-            self.action_move( -1 )
+            await self.action_move( -1 )
         else:
             self.focus_previous()
 
-    def action_focus_right( self ) -> None:
+    async def action_focus_right( self ) -> None:
         """Action wrapper for moving focus to the right."""
         if isinstance( self.screen.focused, StreakDay ) and self.screen.focused.is_last:
-            self.action_move( 1 )
+            await self.action_move( 1 )
         else:
             self.focus_next()
 
-    def action_focus_up( self ) -> None:
-        """Action that moves focus up a streak."""
-        if ( current := self.streaks.focused_streak ) is not None:
-            self.streaks[
-                -1 if current.is_first else self.streaks.index( current ) - 1
-            ].steal_focus( current )
-
-    def action_focus_down( self ) -> None:
-        """Action that moves focus down a streak."""
-        if ( current := self.streaks.focused_streak ) is not None:
-            self.streaks[
-                0 if current.is_last else self.streaks.index( current ) + 1
-            ].steal_focus( current )
-
-    def action_move( self, days: int ) -> None:
+    async def action_move( self, periods: int ) -> None:
         """Move the timeline.
 
         Args:
-            days (int): The number of times to move the timeline by.
+            periods (int): The number of periods to move the timeline by.
         """
         for timeline in self.query( Timeline ):
-            timeline.move_days( days )
+            timeline.move_periods( periods )
+        await self.visit()
+        self.highlight_selection()
+        await self.show_note()
 
-    def action_zoom( self, days: int ) -> None:
+    async def action_zoom( self, periods: int ) -> None:
         """Zoom the timeline.
 
         Args:
-            days (int): The number of times to zoom the timeline by.
+            periods (int): The number of periods to zoom the timeline by.
         """
         for timeline in self.query( Timeline ):
-            timeline.zoom_days( days )
+            timeline.zoom_periods( periods )
+        await self.visit()
+        self.call_after_refresh( self.highlight_selection )
+        self.call_after_refresh( self.show_note )
+
+    async def on_descendant_focus( self, _: DescendantFocus ) -> None:
+        """Keep the selection of days, and the note being shown, up to date as focus moves."""
+        if self._anchor is not None:
+            self.highlight_selection()
+        await self.show_note()
+
+    def action_heatmap( self ) -> None:
+        """Show the heatmap of all the streaks."""
+        self.app.push_screen( Heatmap( self.streaks ) )
 
     async def action_add( self ) -> None:
         """Add a new timeline to the display."""
         await self.streaks.mount( title_input := TitleInput( placeholder="Title", id="streak-add" ) )
         title_input.focus()
 
+    async def action_import( self ) -> None:
+        """Ask for a file of streak data to import."""
+        await self.streaks.mount(
+            file_input := TitleInput( placeholder="File to import", id="streak-import" )
+        )
+        file_input.focus()
+
+    async def import_file( self, path: Path ) -> None:
+        """Import streak data from a file.
+
+        Args:
+            path (Path): The path to the file to import.
+        """
+        try:
+            with path.open( encoding="utf-8", newline="" ) as source:
+                await self.streaks.import_rows( read_rows( source, guess_format( path ) ), **self.line_settings )
+        except ( OSError, TransferError ):
+            self.app.bell()
+
+    class SwitchDataset( Message ):
+        """Message sent when the user asks to switch to another dataset.
+
+        Attributes:
+            dataset (str): The name of the dataset to switch to.
+        """
+
+        def __init__( self, dataset: str ) -> None:
+            """Initialise the message.
+
+            Args:
+                dataset (str): The name of the dataset to switch to.
+            """
+            super().__init__()
+            self.dataset = dataset
+
+    async def action_dataset( self ) -> None:
+        """Ask for the name of a dataset to switch to.
+
+        Note:
+            The names of the existing datasets are given as the
+            placeholder; giving a new name makes a new dataset.
+        """
+        if self._datasets is None:
+            self.app.bell()
+            return
+        await self.streaks.mount(
+            dataset_input := TitleInput( placeholder=", ".join( self._datasets.names ), id="dataset-switch" )
+        )
+        dataset_input.focus()
+
+    async def action_sort( self ) -> None:
+        """Sort the streaks into the next sort order."""
+        self._sorted_by = SortOrder.TITLE if self._sorted_by is None else self._sorted_by.next
+        await self.streaks.sort( self._sorted_by )
+        if ( row := self.streaks.focused_row ) is not None:
+            self.call_after_refresh( row.scroll_visible )
+
+    async def _undo_or_redo( self, redo: bool ) -> None:
+        """Undo or redo a change.
+
+        Args:
+            redo (bool): Should the change be redone rather than undone?
+        """
+        apply = self.streaks.redo if redo else self.streaks.undo
+        if not await apply( **self.line_settings ):
+            self.app.bell()
+        self.highlight_selection()
+        if self.focused is None and ( rows := self.streaks.rows ):
+            self.focus_row( rows[ 0 ] )
+
+    async def action_undo( self ) -> None:
+        """Undo the most recent change."""
+        await self._undo_or_redo( False )
+
+    async def action_redo( self ) -> None:
+        """Redo the most recently undone change."""
+        await self._undo_or_redo( True )
+
     async def on_input_submitted( self, event: Input.Submitted ) -> None:
         """Handle the user submitting input.
 
@@ -153,20 +316,38 @@ class Main( Screen ):
             event (TitleInput.Submitted): The submit event.
         """
 
+        # If this is the filter being submitted, that's a request to jump
+        # to the first match.
+        if isinstance( event.input, StreakFilter ):
+            self.action_jump()
+            return
+
         # We're going to remove the input, so let's get its content before
         # we do that.
-        title = event.input.value.strip()
+        title     = event.input.value.strip()
+        importing = event.input.id == "streak-import"
+        switching = event.input.id == "dataset-switch"
 
         # Now let's remove the input box.
         await event.input.remove()
 
+        # If the user was asking to switch datasets...
+        if switching:
+            # ...ask for the switch if they named one; either way, settle
+            # focus back on this screen for when it's next shown.
+            if title:
+                self.post_message( self.SwitchDataset( title ) )
+            if rows := self.streaks.rows:
+                self.focus_row( rows[ 0 ] )
+        # If the user was asking for an import...
+        elif importing:
+            # ...and gave us a file, import it.
+            if title:
+                await self.import_file( Path( title ).expanduser() )
         # If the user entered a title...
-        if title:
+        elif title:
             # ...add a new timeline associated with it.
-            await self.streaks.mount( line := StreakLine() )
-            line.title     = title
-            line.time_span = self.query_one( "#header", Timeline ).time_span
-            line.query( StreakDay ).last().focus()
-            self.streaks.save()
+            if ( line := await self.streaks.add( Streak( title ), **self.line_settings ) ) is not None:
+                line.query( StreakDay ).last().focus()
 
 ### main.py ends here
@@ -0,0 +1,75 @@
+"""Provides the base for screens that show a list of streaks."""
+
+##############################################################################
+# Python imports.
+from typing import Any
+
+##############################################################################
+# Textual imports.
+from textual.screen import Screen
+
+##############################################################################
+# Local imports.
+from ..widgets import GroupHeader, StreakDay, StreakLine, Streaks, Timeline
+
+##############################################################################
+class RowsScreen( Screen ):
+    """The base for a screen that shows a list of streaks, in groups.
+
+    This looks after moving focus between the rows of the list, and the
+    groups within it. The screen is expected to have a `Timeline` with the
+    ID `header` that sets the span of time being shown.
+    """
+
+    streaks: Streaks
+    """Streaks: The streaks being shown."""
+
+    @property
+    def line_settings( self ) -> dict[ str, Any ]:
+        """dict[ str, Any ]: The settings a newly-mounted streak line needs to match the display."""
+        header = self.query_one( "#header", Timeline )
+        return { "time_span": header.time_span, "end_date": header.end_date }
+
+    def focus_row( self, row: StreakLine | GroupHeader, from_row: StreakLine | GroupHeader | None=None ) -> None:
+        """Move focus to a row of the display.
+
+        Args:
+            row (StreakLine | GroupHeader): The row to focus.
+            from_row (StreakLine | GroupHeader | None): The row focus is moving from.
+        """
+        if isinstance( row, GroupHeader ):
+            row.focus()
+        elif isinstance( from_row, StreakLine ):
+            row.steal_focus( from_row )
+        else:
+            row.query( StreakDay ).last().focus()
+
+    def action_focus_up( self ) -> None:
+        """Action that moves focus up a streak."""
+        if ( current := self.streaks.focused_row ) is not None:
+            self.focus_row( self.streaks.neighbour( current, -1 ), current )
+
+    def action_focus_down( self ) -> None:
+        """Action that moves focus down a streak."""
+        if ( current := self.streaks.focused_row ) is not None:
+            self.focus_row( self.streaks.neighbour( current, 1 ), current )
+
+    async def on_group_header_toggled( self, event: GroupHeader.Toggled ) -> None:
+        """Handle a request to expand or collapse a group.
+
+        Args:
+            event (GroupHeader.Toggled): The toggle event.
+        """
+        await self.streaks.toggle( event.group, **self.line_settings )
+
+    async def on_streak_line_regrouped( self, event: StreakLine.Regrouped ) -> None:
+        """Handle a streak being moved to a different group.
+
+        Args:
+            event (StreakLine.Regrouped): The regroup event.
+        """
+        if ( line := await self.streaks.regroup( event.line, **self.line_settings ) ) is not None:
+            self.focus_row( line )
+            line.scroll_visible()
+
+### rows.py ends here
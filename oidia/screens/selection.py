@@ -0,0 +1,95 @@
+"""Provides the base for screens that let the user select a range of days."""
+
+##############################################################################
+# Python imports.
+from datetime import date
+
+##############################################################################
+# Local imports.
+from ..data    import Resolution
+from ..widgets import StreakDay, StreakLine, Timeline
+from .rows     import RowsScreen
+
+##############################################################################
+class SelectionScreen( RowsScreen ):
+    """The base for a screen that lets the user select a range of days.
+
+    A selection starts from the focused day of the focused streak, and
+    takes in every day and streak between there and wherever focus then
+    moves to; marking a day while there's a selection marks every day in
+    it.
+    """
+
+    _anchor: tuple[ StreakLine, date ] | None = None
+    """tuple[ StreakLine, date ] | None: The line and day a selection of days started from."""
+
+    @property
+    def selection( self ) -> tuple[ list[ StreakLine ], date, date ] | None:
+        """tuple[ list[ StreakLine ], date, date ] | None: The current selection of days.
+
+        This is the lines in the selection, in display order, and the first
+        and last day of the selection; or `None` if nothing is selected.
+        """
+        if self._anchor is None or not isinstance( focused := self.focused, StreakDay ):
+            return None
+        anchor_line, anchor_day = self._anchor
+        lines = [ row for row in self.streaks.rows if isinstance( row, StreakLine ) ]
+        if anchor_line not in lines or ( current_line := self.streaks.focused_streak ) not in lines:
+            return None
+        top, bottom = sorted( ( lines.index( anchor_line ), lines.index( current_line ) ) )
+        return lines[ top:bottom + 1 ], min( anchor_day, focused.day ), max( anchor_day, focused.day )
+
+    def highlight_selection( self ) -> None:
+        """Highlight the days that are in the current selection.
+
+        Note:
+            If the selection can no longer be made sense of (for example if
+            the timeline is no longer showing individual days) the
+            selection is ended.
+        """
+        for day in self.query( "StreakDay.selected" ):
+            day.remove_class( "selected" )
+        if self._anchor is None:
+            return
+        if (
+            self._anchor[ 0 ] not in self.streaks.rows
+            or self.query_one( "#header", Timeline ).time_span.resolution is not Resolution.DAY
+        ):
+            self._anchor = None
+        elif ( selection := self.selection ) is not None:
+            lines, start, end = selection
+            for line in lines:
+                for day in line.query( StreakDay ):
+                    if start <= day.day <= end:
+                        day.add_class( "selected" )
+
+    def action_select( self ) -> None:
+        """Start or end the selection of a range of days."""
+        if self._anchor is not None:
+            self._anchor = None
+        elif (
+            isinstance( focused := self.focused, StreakDay ) and focused.editable
+            and ( line := self.streaks.focused_streak ) is not None
+        ):
+            self._anchor = ( line, focused.day )
+        else:
+            self.app.bell()
+        self.highlight_selection()
+
+    def action_escape( self ) -> None:
+        """End any selection of days, or quit if there isn't one."""
+        if self._anchor is not None:
+            self.action_select()
+        else:
+            self.app.exit()
+
+    def on_streak_day_selection_marked( self, event: StreakDay.SelectionMarked ) -> None:
+        """Handle the done count being changed for the selection of days.
+
+        Args:
+            event (StreakDay.SelectionMarked): The event.
+        """
+        if ( selection := self.selection ) is not None:
+            self.streaks.mark( *selection, event.adjust )
+
+### selection.py ends here
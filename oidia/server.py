@@ -0,0 +1,653 @@
+"""Provides a server that runs sessions of the application for many users.
+
+Each session is a process of its own, running the application on a
+pseudo-terminal that the server relays to and from the user's terminal or
+web browser; the streaks of each user are held by the server, and shared
+by all of that user's sessions.
+"""
+
+##############################################################################
+# Python imports.
+import os
+import sys
+from abc             import ABC, abstractmethod
+from asyncio         import (
+    FIRST_COMPLETED, Event, IncompleteReadError, LimitOverrunError, StreamReader, StreamWriter,
+    create_subprocess_exec, create_task, gather, get_running_loop, open_connection, sleep, start_server,
+    to_thread, wait
+)
+from base64          import b64encode
+from contextlib      import suppress
+from fcntl           import ioctl
+from hashlib         import sha1
+from json            import dumps, loads
+from pathlib         import Path, PurePosixPath
+from socket          import socketpair
+from struct          import pack, unpack
+from termios         import TIOCSWINSZ
+from typing          import Final
+
+##############################################################################
+# Local imports.
+from .data import Passwords, Stores, StoreService
+
+##############################################################################
+PAGE: Final = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>OIDIA</title>
+<link rel="stylesheet" href="/xterm.css">
+<link rel="stylesheet" href="/oidia.css">
+<script src="/xterm.js"></script>
+<script src="/addon-fit.js"></script>
+<script src="/oidia.js" defer></script>
+</head>
+<body>
+<form id="login">
+<p id="unencrypted" hidden>This connection isn't encrypted; your password will be sent as it is typed.</p>
+<p><label>User <input name="user" autocomplete="username" autofocus></label></p>
+<p><label>Password <input name="password" type="password" autocomplete="current-password"></label></p>
+<p><button>Log in</button></p>
+</form>
+<div id="terminal"></div>
+</body>
+</html>
+"""
+"""str: The page that runs a session in a web browser."""
+
+##############################################################################
+STYLE: Final = """html, body { height: 100%; margin: 0; background: #000; color: #ccc; font-family: sans-serif; }
+#terminal { height: 100%; }
+#unencrypted { color: #f66; }
+form { padding: 2em; }
+"""
+"""str: The style sheet for the page."""
+
+##############################################################################
+SCRIPT: Final = """const form = document.getElementById( "login" );
+document.getElementById( "unencrypted" ).hidden = location.protocol === "https:";
+form.addEventListener( "submit", event => {
+    event.preventDefault();
+    form.hidden = true;
+    const terminal = new Terminal();
+    const fit      = new FitAddon.FitAddon();
+    const encoder  = new TextEncoder();
+    const socket   = new WebSocket( `${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/session` );
+    terminal.loadAddon( fit );
+    terminal.open( document.getElementById( "terminal" ) );
+    fit.fit();
+    socket.binaryType = "arraybuffer";
+    socket.onopen = () => {
+        socket.send( JSON.stringify( {
+            user: form.user.value, password: form.password.value, width: terminal.cols, height: terminal.rows
+        } ) );
+        form.password.value = "";
+    };
+    socket.onmessage = message => terminal.write( new Uint8Array( message.data ) );
+    socket.onclose   = () => terminal.write( "\\r\\n[The session has ended]\\r\\n" );
+    terminal.onData( data => socket.send( encoder.encode( data ) ) );
+    terminal.onResize( size => socket.send( JSON.stringify( { width: size.cols, height: size.rows } ) ) );
+    window.addEventListener( "resize", () => fit.fit() );
+    terminal.focus();
+} );
+"""
+"""str: The script that runs a session in the page."""
+
+##############################################################################
+XTERM: Final = {
+    "xterm.js":     "lib/xterm.min.js from @xterm/xterm 5.5.0",
+    "xterm.css":    "css/xterm.min.css from @xterm/xterm 5.5.0",
+    "addon-fit.js": "lib/addon-fit.min.js from @xterm/addon-fit 0.10.0"
+}
+"""dict[ str, str ]: The files of xterm.js that the page needs, and where each one comes from."""
+
+##############################################################################
+CONTENT_TYPES: Final = {
+    "":     "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js":  "text/javascript; charset=utf-8"
+}
+"""dict[ str, str ]: The content type of each kind of file that makes up the page, by extension."""
+
+##############################################################################
+SECURITY_HEADERS: Final = (
+    "Content-Security-Policy: default-src 'none'; script-src 'self'; style-src 'self' 'unsafe-inline'; "
+    "connect-src 'self'; font-src 'self'; img-src 'self' data:; form-action 'none'; frame-ancestors 'none'\r\n"
+    "X-Content-Type-Options: nosniff\r\n"
+    "Referrer-Policy: no-referrer\r\n"
+)
+"""str: The headers that go with every file of the page.
+
+Only what the server itself serves can be run; xterm.js adds styles of
+its own as it draws the terminal, so inline styles are allowed.
+"""
+
+##############################################################################
+def web_files( assets: Path ) -> dict[ str, bytes ]:
+    """Get the files that make up the page that runs a session in a web browser.
+
+    Args:
+        assets (Path): The directory that holds the files of xterm.js.
+
+    Returns:
+        dict[ str, bytes ]: The content of each file, keyed by the path it is served at.
+
+    Raises:
+        FileNotFoundError: If any of the files of xterm.js are missing.
+
+    Note:
+        The files of xterm.js are served by the server itself, rather than
+        being fetched from elsewhere by the browser, so that the page only
+        ever runs code that whoever runs the server has put there.
+    """
+    if missing := [ name for name in XTERM if not ( assets / name ).is_file() ]:
+        raise FileNotFoundError(
+            f"The web page needs these files of xterm.js in {assets}: "
+            + "; ".join( f"{name} ({XTERM[ name ]})" for name in missing )
+        )
+    return {
+        "/": PAGE.encode( "utf-8" ),
+        "/oidia.css": STYLE.encode( "utf-8" ),
+        "/oidia.js": SCRIPT.encode( "utf-8" ),
+        **{ f"/{name}": ( assets / name ).read_bytes() for name in XTERM }
+    }
+
+##############################################################################
+def set_size( terminal: int, size: tuple[ int, int ] ) -> None:
+    """Set the size of a pseudo-terminal.
+
+    Args:
+        terminal (int): The file descriptor of the pseudo-terminal.
+        size (tuple[ int, int ]): The width and height to set.
+    """
+    width, height = size
+    ioctl( terminal, TIOCSWINSZ, pack( "HHHH", height, width, 0, 0 ) )
+
+##############################################################################
+class Client( ABC ):
+    """The base class for the user's end of a session."""
+
+    def __init__( self, reader: StreamReader, writer: StreamWriter ) -> None:
+        """Initialise the client.
+
+        Args:
+            reader (StreamReader): The reader for the connection.
+            writer (StreamWriter): The writer for the connection.
+        """
+        self._reader = reader
+        self._writer = writer
+        self.size: tuple[ int, int ] | None = None
+        """tuple[ int, int ] | None: The size of the user's terminal, if it's known."""
+
+    @abstractmethod
+    async def login( self ) -> tuple[ str, str ] | None:
+        """Get the user name and password that the user logs in with.
+
+        Returns:
+            tuple[ str, str ] | None: The user name and password, or `None` if the connection closed first.
+        """
+
+    @abstractmethod
+    async def read( self ) -> bytes | tuple[ int, int ] | None:
+        """Read what the user does next.
+
+        Returns:
+            bytes | tuple[ int, int ] | None: Input, a new size, or `None` if the connection closed.
+        """
+
+    @abstractmethod
+    def write( self, data: bytes ) -> None:
+        """Write output to the user.
+
+        Args:
+            data (bytes): The output.
+        """
+
+    def close( self ) -> None:
+        """Close the connection."""
+        self._writer.close()
+
+##############################################################################
+class TerminalClient( Client ):
+    """A user connected straight from their terminal."""
+
+    async def _ask( self, prompt: str, echo: bool ) -> str | None:
+        """Ask the user a question.
+
+        Args:
+            prompt (str): The prompt for the question.
+            echo (bool): Echo the answer as it's typed?
+
+        Returns:
+            str | None: The answer, or `None` if the connection closed first.
+
+        Note:
+            As the terminal at the other end will most likely be in raw
+            mode, what is typed is echoed back, and backspace is handled,
+            here.
+        """
+        self.write( prompt.encode( "utf-8" ) )
+        answer = ""
+        while ( key := await self._reader.read( 1 ) ) not in ( b"", b"\r", b"\n" ):
+            if key in ( b"\x7f", b"\x08" ):
+                if answer:
+                    answer = answer[ :-1 ]
+                    if echo:
+                        self.write( b"\b \b" )
+            elif key.isascii() and key.decode().isprintable():
+                answer += key.decode()
+                if echo:
+                    self.write( key )
+        self.write( b"\r\n" )
+        return answer if key else None
+
+    async def login( self ) -> tuple[ str, str ] | None:
+        """Get the user name and password that the user logs in with.
+
+        Returns:
+            tuple[ str, str ] | None: The user name and password, or `None` if the connection closed first.
+        """
+        if ( user := await self._ask( "User: ", True ) ) is None:
+            return None
+        if ( password := await self._ask( "Password: ", False ) ) is None:
+            return None
+        return user, password
+
+    async def read( self ) -> bytes | tuple[ int, int ] | None:
+        """Read what the user types next.
+
+        Returns:
+            bytes | tuple[ int, int ] | None: The input, or `None` if the connection closed.
+        """
+        with suppress( ConnectionError ):
+            return await self._reader.read( 4096 ) or None
+        return None
+
+    def write( self, data: bytes ) -> None:
+        """Write output to the user.
+
+        Args:
+            data (bytes): The output.
+        """
+        if not self._writer.is_closing():
+            self._writer.write( data )
+
+##############################################################################
+class BrowserClient( Client ):
+    """A user connected from a web browser, over a WebSocket."""
+
+    CONTINUATION: Final = 0x0
+    """int: The opcode of a frame that continues a message."""
+    TEXT: Final = 0x1
+    """int: The opcode of a text message."""
+    BINARY: Final = 0x2
+    """int: The opcode of a binary message."""
+    CLOSE: Final = 0x8
+    """int: The opcode of a closing frame."""
+    PING: Final = 0x9
+    """int: The opcode of a ping."""
+    PONG: Final = 0xA
+    """int: The opcode of a pong."""
+
+    LARGEST_MESSAGE: Final = 1 << 20
+    """int: The size of the largest message that will be accepted."""
+
+    def _send( self, opcode: int, data: bytes ) -> None:
+        """Send a frame to the browser.
+
+        Args:
+            opcode (int): The opcode of the frame.
+            data (bytes): The data of the frame.
+        """
+        if self._writer.is_closing():
+            return
+        if len( data ) < 126:
+            header = pack( "!BB", 0x80 | opcode, len( data ) )
+        elif len( data ) < 1 << 16:
+            header = pack( "!BBH", 0x80 | opcode, 126, len( data ) )
+        else:
+            header = pack( "!BBQ", 0x80 | opcode, 127, len( data ) )
+        self._writer.write( header + data )
+
+    async def _frame( self ) -> tuple[ bool, int, bytes ]:
+        """Read a frame from the browser.
+
+        Returns:
+            tuple[ bool, int, bytes ]: Whether the frame ends a message, its opcode, and its data.
+
+        Raises:
+            ValueError: If the frame is too large.
+        """
+        first, second = await self._reader.readexactly( 2 )
+        if ( length := second & 0x7F ) == 126:
+            ( length, ) = unpack( "!H", await self._reader.readexactly( 2 ) )
+        elif length == 127:
+            ( length, ) = unpack( "!Q", await self._reader.readexactly( 8 ) )
+        if length > self.LARGEST_MESSAGE:
+            raise ValueError( "Message too large" )
+        mask = await self._reader.readexactly( 4 ) if second & 0x80 else bytes( 4 )
+        data = await self._reader.readexactly( length )
+        data = bytes( byte ^ mask[ index % 4 ] for index, byte in enumerate( data ) )
+        return bool( first & 0x80 ), first & 0x0F, data
+
+    async def _message( self ) -> tuple[ int, bytes ] | None:
+        """Read the next message from the browser, answering any pings along the way.
+
+        Returns:
+            tuple[ int, bytes ] | None: The opcode and data of the message, or `None` if the connection closed.
+        """
+        opcode, message = self.BINARY, b""
+        try:
+            while True:
+                final, frame_opcode, data = await self._frame()
+                if frame_opcode == self.CLOSE:
+                    self._send( self.CLOSE, b"" )
+                    return None
+                if frame_opcode == self.PING:
+                    self._send( self.PONG, data )
+                elif frame_opcode != self.PONG:
+                    if frame_opcode != self.CONTINUATION:
+                        opcode, message = frame_opcode, b""
+                    if len( message := message + data ) > self.LARGEST_MESSAGE:
+                        return None
+                    if final:
+                        return opcode, message
+        except ( IncompleteReadError, ConnectionError, ValueError ):
+            return None
+
+    @staticmethod
+    def _size( data: dict[ str, int ] ) -> tuple[ int, int ]:
+        """Get the size of the browser's terminal from a message.
+
+        Args:
+            data (dict[ str, int ]): The data of the message.
+
+        Returns:
+            tuple[ int, int ]: The width and height of the terminal.
+        """
+        return max( 1, min( int( data[ "width" ] ), 1000 ) ), max( 1, min( int( data[ "height" ] ), 1000 ) )
+
+    async def login( self ) -> tuple[ str, str ] | None:
+        """Get the user name and password that the user logs in with.
+
+        Returns:
+            tuple[ str, str ] | None: The user name and password, or `None` if the connection closed first.
+
+        Note:
+            The first message from the browser holds the user name and
+            password, and the size of the terminal.
+        """
+        if ( message := await self._message() ) is None:
+            return None
+        try:
+            data = loads( message[ 1 ] )
+            self.size = self._size( data )
+            return str( data[ "user" ] ), str( data[ "password" ] )
+        except ( ValueError, KeyError, TypeError ):
+            return None
+
+    async def read( self ) -> bytes | tuple[ int, int ] | None:
+        """Read what the user does next.
+
+        Returns:
+            bytes | tuple[ int, int ] | None: Input, a new size, or `None` if the connection closed.
+        """
+        while ( message := await self._message() ) is not None:
+            opcode, data = message
+            if opcode == self.BINARY:
+                return data
+            with suppress( ValueError, KeyError, TypeError ):
+                return self._size( loads( data ) )
+        return None
+
+    def write( self, data: bytes ) -> None:
+        """Write output to the user.
+
+        Args:
+            data (bytes): The output.
+        """
+        self._send( self.BINARY, data )
+
+    def close( self ) -> None:
+        """Close the connection."""
+        self._send( self.CLOSE, b"" )
+        super().close()
+
+##############################################################################
+class Server:
+    """Serves sessions of the application, each in a process of its own."""
+
+    WEBSOCKET_GUID: Final = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+    """str: The GUID used to accept the opening of a WebSocket."""
+
+    def __init__(
+        self,
+        stores: Stores,
+        passwords: Passwords,
+        size: tuple[ int, int ],
+        undo_memory: int,
+        web: dict[ str, bytes ] | None=None
+    ) -> None:
+        """Initialise the server.
+
+        Args:
+            stores (Stores): The stores for the users.
+            passwords (Passwords): The passwords of the users.
+            size (tuple[ int, int ]): The size of a terminal whose size isn't known.
+            undo_memory (int): The memory budget for the undo history of each session, in bytes.
+            web (dict[ str, bytes ] | None): The files of the web page, keyed by the path they're served at.
+        """
+        self._stores      = stores
+        self._passwords   = passwords
+        self._size        = size
+        self._undo_memory = undo_memory
+        self._web         = web or {}
+        self._services: dict[ str, StoreService ] = {}
+
+    def flush( self ) -> None:
+        """Save anything that hasn't been saved yet, for every user."""
+        self._stores.flush()
+
+    async def _serve_store(
+        self, session: object, service: StoreService, reader: StreamReader, writer: StreamWriter
+    ) -> None:
+        """Carry out the requests a session makes of its store, until it goes away.
+
+        Args:
+            session (object): The session.
+            service (StoreService): The service for the store of the session's user.
+            reader (StreamReader): The reader for the connection to the session.
+            writer (StreamWriter): The writer for the connection to the session.
+        """
+        with suppress( ConnectionError, IncompleteReadError, LimitOverrunError ):
+            while line := await reader.readline():
+                try:
+                    reply = service.handle( session, loads( line ) )
+                except ( ValueError, KeyError, TypeError, OSError ) as error:
+                    reply = { "error": str( error ) }
+                writer.write( dumps( reply ).encode( "utf-8" ) + b"\n" )
+
+    @staticmethod
+    async def _relay_input( client: Client, terminal: int ) -> None:
+        """Relay what the user does to the session, until the user goes away.
+
+        Args:
+            client (Client): The user's end of the session.
+            terminal (int): The file descriptor of the session's pseudo-terminal.
+        """
+        while ( data := await client.read() ) is not None:
+            if isinstance( data, tuple ):
+                set_size( terminal, data )
+            else:
+                os.write( terminal, data )
+
+    @staticmethod
+    def _relay_output( terminal: int, client: Client, ended: Event ) -> None:
+        """Relay the output of the session to the user.
+
+        Args:
+            terminal (int): The file descriptor of the session's pseudo-terminal.
+            client (Client): The user's end of the session.
+            ended (Event): The event to set once the session has no more output.
+        """
+        try:
+            data = os.read( terminal, 65536 )
+        except OSError:
+            data = b""
+        if data:
+            client.write( data )
+        else:
+            get_running_loop().remove_reader( terminal )
+            ended.set()
+
+    async def _session( self, user: str, client: Client ) -> None:
+        """Run a session of the application for a user.
+
+        Args:
+            user (str): The name of the user.
+            client (Client): The user's end of the session.
+
+        Note:
+            The session runs until either it finishes or the user goes
+            away; if the user goes away first, the session is stopped.
+        """
+        service = self._services.setdefault( user, StoreService( self._stores.for_user( user ) ) )
+        ours, theirs = socketpair()
+        terminal, their_terminal = os.openpty()
+        set_size( terminal, client.size or self._size )
+        try:
+            process = await create_subprocess_exec(
+                sys.executable, "-m", f"{__package__}.session",
+                str( theirs.fileno() ),
+                str( self._stores.for_user( user ).storage.directory ),
+                "--undo-memory", str( self._undo_memory ),
+                stdin=their_terminal,
+                stdout=their_terminal,
+                stderr=their_terminal,
+                pass_fds=( theirs.fileno(), ),
+                start_new_session=True,
+                env={ **os.environ, "TERM": "xterm-256color" }
+            )
+        finally:
+            os.close( their_terminal )
+            theirs.close()
+        reader, writer = await open_connection( sock=ours, limit=1 << 24 )
+        session = object()
+        service.join( session, lambda message: writer.write( dumps( message ).encode( "utf-8" ) + b"\n" ) )
+        ended = Event()
+        get_running_loop().add_reader( terminal, self._relay_output, terminal, client, ended )
+        tasks = [
+            create_task( self._serve_store( session, service, reader, writer ) ),
+            create_task( self._relay_input( client, terminal ) ),
+            create_task( ended.wait() )
+        ]
+        try:
+            await wait( tasks[ 1: ], return_when=FIRST_COMPLETED )
+        finally:
+            if process.returncode is None:
+                with suppress( ProcessLookupError ):
+                    process.terminate()
+                await process.wait()
+            for task in tasks:
+                task.cancel()
+            get_running_loop().remove_reader( terminal )
+            service.leave( session )
+            writer.close()
+            os.close( terminal )
+
+    async def _log_in( self, client: Client ) -> None:
+        """Log a user in, and run a session for them.
+
+        Args:
+            client (Client): The user's end of the session.
+        """
+        if ( login := await client.login() ) is None:
+            return
+        user, password = login
+        if await to_thread( self._passwords.check, user, password ):
+            await self._session( user, client )
+        else:
+            await sleep( 2 )
+            client.write( b"Login incorrect\r\n" )
+
+    async def terminal( self, reader: StreamReader, writer: StreamWriter ) -> None:
+        """Serve a session to a user connected from their terminal.
+
+        Args:
+            reader (StreamReader): The reader for the connection.
+            writer (StreamWriter): The writer for the connection.
+        """
+        client = TerminalClient( reader, writer )
+        try:
+            await self._log_in( client )
+        finally:
+            client.close()
+
+    async def browser( self, reader: StreamReader, writer: StreamWriter ) -> None:
+        """Serve the page, or a session, to a web browser.
+
+        Args:
+            reader (StreamReader): The reader for the connection.
+            writer (StreamWriter): The writer for the connection.
+        """
+        try:
+            request, *lines = ( await reader.readuntil( b"\r\n\r\n" ) ).decode( "latin-1" ).split( "\r\n" )
+        except ( IncompleteReadError, LimitOverrunError, ConnectionError ):
+            writer.close()
+            return
+        method, path, *_ = request.split( " " ) + [ "", "" ]
+        headers = {
+            name.strip().lower(): value.strip() for name, _, value in ( line.partition( ":" ) for line in lines )
+        }
+        if path == "/session" and headers.get( "upgrade", "" ).lower() == "websocket" and (
+            key := headers.get( "sec-websocket-key" )
+        ):
+            accept = b64encode( sha1( f"{key}{self.WEBSOCKET_GUID}".encode(), usedforsecurity=False ).digest() )
+            writer.write(
+                b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+            )
+            client = BrowserClient( reader, writer )
+            try:
+                await self._log_in( client )
+            finally:
+                client.close()
+            return
+        if method == "GET" and ( body := self._web.get( path ) ) is not None:
+            status, content_type = "200 OK", CONTENT_TYPES[ PurePosixPath( path ).suffix ]
+        else:
+            status, content_type, body = "404 Not Found", CONTENT_TYPES[ "" ], b"Not found"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n{SECURITY_HEADERS}"
+            f"Content-Length: {len( body )}\r\nConnection: close\r\n\r\n".encode( "utf-8" ) + body
+        )
+        writer.close()
+
+##############################################################################
+async def serve( server: Server, host: str, ports: tuple[ int, int | None ] ) -> None:
+    """Serve sessions of the application until cancelled.
+
+    Args:
+        server (Server): The server.
+        host (str): The host to listen on.
+        ports (tuple[ int, int | None ]): The port for terminals, and the port for web browsers if they're served.
+
+    Note:
+        Every session of the same user shares the one store, so their
+        streaks are only ever loaded once, changes made in one session
+        show up in the others, and saving is batched across all of them.
+        Anything that hasn't been saved yet is saved when the server stops.
+    """
+    terminal, web = ports
+    listeners     = [ await start_server( server.terminal, host, terminal ) ]
+    if web is not None:
+        listeners.append( await start_server( server.browser, host, web ) )
+    try:
+        await gather( *( listener.serve_forever() for listener in listeners ) )
+    finally:
+        for listener in listeners:
+            listener.close()
+        server.flush()
+
+### server.py ends here
@@ -0,0 +1,73 @@
+"""Provides the running of one session of the application for the server.
+
+The server starts each session as a process of its own, running on a
+pseudo-terminal that the server relays to and from the user, with its
+streaks held by the server; this is what that process runs.
+"""
+
+##############################################################################
+# Python imports.
+import sys
+from argparse   import ArgumentParser, Namespace
+from asyncio    import run
+from contextlib import suppress
+from fcntl      import ioctl
+from pathlib    import Path
+from socket     import socket
+from termios    import TIOCSCTTY
+
+##############################################################################
+# Local imports.
+from .app  import OIDIA
+from .data import Connection, RemoteStore
+
+##############################################################################
+def get_args() -> Namespace:
+    """Get the command line arguments of the session.
+
+    Returns:
+        Namespace: The parsed arguments.
+    """
+    parser = ArgumentParser( prog="oidia-session", description="Run one session of OIDIA for the server" )
+    parser.add_argument( "connection", type=int, help="The file descriptor of the connection to the server" )
+    parser.add_argument( "directory", type=Path, help="The directory that the data of the user lives in" )
+    parser.add_argument(
+        "--undo-memory", type=int, required=True, help="The memory budget for the undo history, in bytes"
+    )
+    return parser.parse_args()
+
+##############################################################################
+async def session( args: Namespace ) -> None:
+    """Run the session.
+
+    Args:
+        args (Namespace): The arguments of the session.
+
+    Note:
+        Once the application has finished, the connection to the server
+        is only closed when the server has dealt with everything that was
+        sent to it.
+    """
+    store = RemoteStore( await Connection.open( socket( fileno=args.connection ) ), args.directory )
+    try:
+        await OIDIA( undo_memory=args.undo_memory, store=store ).run_async()
+    finally:
+        await store.close()
+
+##############################################################################
+def main() -> None:
+    """Run the session."""
+    args = get_args()
+    # The server starts the session in a session of its own; take the
+    # pseudo-terminal on as the controlling terminal, so that a change in
+    # its size is signalled to the application.
+    with suppress( OSError ):
+        ioctl( sys.stdin.fileno(), TIOCSCTTY, 0 )
+    run( session( args ) )
+
+##############################################################################
+# Run the session if we're being called as the main entry point.
+if __name__ == "__main__":
+    main()
+
+### session.py ends here
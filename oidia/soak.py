@@ -0,0 +1,237 @@
+"""Provides a soak test of the application, for spotting memory and latency creep."""
+
+##############################################################################
+# Python imports.
+import gc
+import tracemalloc
+from pathlib    import Path
+from random     import Random
+from statistics import median
+from time       import perf_counter
+from typing     import Any, Final, NamedTuple
+
+##############################################################################
+# Unix-only imports, for finding out the resident memory of the process.
+try:
+    from os       import sysconf
+    from resource import RUSAGE_SELF, getrusage
+except ImportError:
+    HAS_RESOURCE = False
+else:
+    HAS_RESOURCE = True
+
+##############################################################################
+# Textual imports.
+from textual.app    import App
+from textual.pilot  import Pilot
+from textual.widget import Widget
+
+##############################################################################
+# Local imports.
+from .recording import press
+from .widgets   import StreakLine, TitleInput
+
+##############################################################################
+def resident_memory() -> int:
+    """Get the resident memory of the process.
+
+    Returns:
+        int: The resident memory, in bytes.
+
+    Note:
+        Where the current resident memory can't be found out, the peak is
+        used instead. On platforms that can't tell the resident memory at
+        all, the memory allocated by Python, as traced by `tracemalloc`, is
+        used instead.
+    """
+    if not HAS_RESOURCE:
+        return tracemalloc.get_traced_memory()[ 0 ]
+    try:
+        return int( Path( "/proc/self/statm" ).read_text( encoding="utf-8" ).split()[ 1 ] ) * sysconf( "SC_PAGE_SIZE" )
+    except OSError:
+        return getrusage( RUSAGE_SELF ).ru_maxrss * 1024
+
+##############################################################################
+class Sample( NamedTuple ):
+    """A sample of the state of the application during a soak test."""
+
+    actions: int
+    """int: The number of actions that had been carried out."""
+
+    memory: int
+    """int: The resident memory of the process, in bytes."""
+
+    widgets: int
+    """int: The number of widgets in the DOM."""
+
+    detached: int
+    """int: The number of widgets that are still alive but aren't in the DOM."""
+
+    latency: float
+    """float: The median time an action took since the previous sample, in seconds."""
+
+##############################################################################
+class Thresholds( NamedTuple ):
+    """The amounts that things may grow by during a soak test before it fails."""
+
+    memory: int
+    """int: The amount the resident memory may grow by, in bytes."""
+
+    widgets: int
+    """int: The amount the number of widgets in the DOM may grow by."""
+
+    detached: int
+    """int: The amount the number of detached widgets may grow by."""
+
+    latency: float
+    """float: The factor the median latency of an action may grow by."""
+
+##############################################################################
+class Soak:
+    """A soak test that drives the application with a long run of random actions.
+
+    The actions are carried out through a pilot, just as if they were being
+    typed. Every so often a sample is taken of the memory being used, the
+    widgets that exist, and how long the recent actions took. The first
+    sample is taken after the first batch of actions, so that it reflects
+    the application once it has warmed up; the test fails if the last
+    sample has grown too far past it.
+    """
+
+    ACTIONS: Final = {
+        "move":   30,
+        "zoom":   10,
+        "edit":   30,
+        "focus":  15,
+        "add":    3,
+        "delete": 3,
+        "undo":   6,
+        "sort":   3
+    }
+    """dict[ str, int ]: The actions that are carried out, and how often each is chosen relative to the others."""
+
+    SPARE_STREAKS: Final = 5
+    """int: The most streaks that will be added past the number there were to start with."""
+
+    def __init__( self, actions: int, sample_every: int, seed: int=0 ) -> None:
+        """Initialise the soak test.
+
+        Args:
+            actions (int): The number of actions to carry out.
+            sample_every (int): The number of actions between each sample.
+            seed (int): The seed for choosing the actions, so the same test can be run again.
+        """
+        self._actions      = actions
+        self._sample_every = sample_every
+        self._random       = Random( seed )
+        self._streaks      = 0
+        self.samples: list[ Sample ] = []
+        """list[ Sample ]: The samples taken during the test."""
+
+    def _keys( self, app: App[ Any ], action: str ) -> list[ str ]:
+        """Get the keys to press to carry out an action.
+
+        Args:
+            app (App[ Any ]): The application being tested.
+            action (str): The action to carry out.
+
+        Returns:
+            list[ str ]: The keys to press.
+
+        Note:
+            Adding and deleting streaks are kept within bounds, so that the
+            amount of data being shown stays about the same; where one
+            can't be done, a day is edited instead.
+        """
+        choose = self._random.choice
+        keys   = [ "tab" ] if app.focused is None else []
+        if isinstance( app.focused, TitleInput ):
+            return [ "enter" ]
+        lines = len( app.screen.query( StreakLine ) )
+        if action == "add" and lines < self._streaks + self.SPARE_STREAKS:
+            return [ *keys, "a", *"soak", "enter" ]
+        if action == "delete" and lines > self._streaks and app.screen.query( "StreakLine:focus-within" ):
+            return [ "ctrl+d" ]
+        choices = {
+            "move":  ( "left", "right" ),
+            "zoom":  ( "left_square_bracket", "right_square_bracket" ),
+            "focus": ( "up", "down" ),
+            "undo":  ( "ctrl+z", "ctrl+y" ),
+            "sort":  ( "s", )
+        }.get( action, ( "space", "space", "minus", "0" ) )
+        return [ *keys, *[ choose( choices ) ] * ( self._random.randint( 1, 10 ) if action == "move" else 1 ) ]
+
+    def _sample( self, app: App[ Any ], actions: int, latencies: list[ float ] ) -> None:
+        """Take a sample of the state of the application.
+
+        Args:
+            app (App[ Any ]): The application being tested.
+            actions (int): The number of actions carried out so far.
+            latencies (list[ float ]): The times taken by the actions since the last sample.
+        """
+        gc.collect()
+        widgets = sum( len( screen.query( "*" ) ) for screen in app.screen_stack )
+        alive   = sum( isinstance( thing, Widget ) for thing in gc.get_objects() )
+        self.samples.append( Sample(
+            actions,
+            resident_memory(),
+            widgets,
+            alive - widgets - len( app.screen_stack ),
+            median( latencies ) if latencies else 0.0
+        ) )
+
+    async def run( self, pilot: Pilot[ Any ] ) -> None:
+        """Run the soak test.
+
+        Args:
+            pilot (Pilot[ Any ]): The pilot for the application being tested.
+
+        Note:
+            The application is asked to exit once the test is done.
+        """
+        app = pilot.app
+        await pilot.pause()
+        self._streaks = len( app.screen.query( StreakLine ) )
+        actions  = list( self.ACTIONS )
+        weights  = list( self.ACTIONS.values() )
+        latencies: list[ float ] = []
+        if not HAS_RESOURCE:
+            tracemalloc.start()
+        try:
+            for action in range( 1, self._actions + 1 ):
+                keys    = self._keys( app, self._random.choices( actions, weights )[ 0 ] )
+                started = perf_counter()
+                await press( pilot, *keys )
+                latencies.append( perf_counter() - started )
+                if action % self._sample_every == 0:
+                    self._sample( app, action, latencies )
+                    latencies = []
+        finally:
+            if not HAS_RESOURCE:
+                tracemalloc.stop()
+            app.exit()
+
+    def problems( self, thresholds: Thresholds ) -> list[ str ]:
+        """Check the samples against the thresholds.
+
+        Args:
+            thresholds (Thresholds): The amounts that things may grow by.
+
+        Returns:
+            list[ str ]: Descriptions of any growth past the thresholds.
+        """
+        if len( self.samples ) < 2:
+            return [ "Not enough samples were taken to compare" ]
+        first, last = self.samples[ 0 ], self.samples[ -1 ]
+        problems: list[ str ] = []
+        if ( grown := last.memory - first.memory ) > thresholds.memory:
+            problems.append( f"Memory grew by {grown / 1048576:.1f}MB" )
+        if ( grown := last.widgets - first.widgets ) > thresholds.widgets:
+            problems.append( f"Widgets in the DOM grew by {grown}" )
+        if ( grown := last.detached - first.detached ) > thresholds.detached:
+            problems.append( f"Detached widgets grew by {grown}" )
+        if first.latency and ( factor := last.latency / first.latency ) > thresholds.latency:
+            problems.append( f"Median action latency grew by a factor of {factor:.1f}" )
+        return problems
+
+### soak.py ends here
@@ -2,10 +2,14 @@
 
 ##############################################################################
 # Local imports.
-from .timeline    import TimelineTitle, TimelineDay, Timeline
-from .streakline  import StreakDay, StreakLine
-from .title_input import TitleInput
-from .streaks     import Streaks
+from .timeline      import TimelineTitle, TimelineDay, Timeline
+from .streakline    import StreakDay, StreakLine
+from .title_input   import TitleInput
+from .streak_filter import StreakFilter
+from .streak_group  import GroupHeader, StreakGroup
+from .day_note      import DayNote
+from .streaks       import Streaks
+from .heatmap       import HeatmapHeader, StreakHeatmap
 
 ##############################################################################
 # Exports.
@@ -16,7 +20,13 @@ __all__ = [
     "StreakDay",
     "StreakLine",
     "TitleInput",
-    "Streaks"
+    "StreakFilter",
+    "GroupHeader",
+    "StreakGroup",
+    "DayNote",
+    "Streaks",
+    "HeatmapHeader",
+    "StreakHeatmap"
 ]
 
 ### __init__.py ends here
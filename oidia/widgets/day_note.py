@@ -0,0 +1,36 @@
+"""Provides a widget for showing the note for a day."""
+
+##############################################################################
+# Textual imports.
+from textual.widgets import Label
+
+##############################################################################
+class DayNote( Label ):
+    """Widget that shows the note for the focused day, if it has one."""
+
+    DEFAULT_CSS = """
+    DayNote {
+        display: none;
+        dock: bottom;
+        width: 100%;
+        height: 1;
+        padding: 0 2;
+        background: $primary-background;
+    }
+
+    DayNote.showing {
+        display: block;
+    }
+    """
+    """str: The styles for the day note widget."""
+
+    def show( self, text: str ) -> None:
+        """Show a note, or hide the widget if there isn't one.
+
+        Args:
+            text (str): The text of the note.
+        """
+        self.update( text )
+        self.set_class( bool( text ), "showing" )
+
+### day_note.py ends here
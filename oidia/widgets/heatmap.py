@@ -0,0 +1,124 @@
+"""Provides widgets for showing a year-long heatmap of streaks."""
+
+##############################################################################
+# Python imports.
+from datetime  import date
+from functools import lru_cache
+from typing    import Any, Final
+
+##############################################################################
+# Rich imports.
+from rich.text import Text
+
+##############################################################################
+# Textual imports.
+from textual.app      import RenderResult
+from textual.reactive import reactive
+from textual.widget   import Widget
+
+##############################################################################
+# Local imports.
+from ..data import Resolution, Streak, period_start, shift_period
+
+##############################################################################
+@lru_cache( maxsize=16 )
+def year_weeks( year: int ) -> tuple[ date, ... ]:
+    """Get the start dates of the weeks that make up a year.
+
+    Args:
+        year (int): The year to get the weeks for.
+
+    Returns:
+        tuple[ date, ... ]: The first day of each week that touches the year.
+    """
+    week  = period_start( date( year, 1, 1 ), Resolution.WEEK )
+    weeks = []
+    while week.year <= year:
+        weeks.append( week )
+        week = shift_period( week, Resolution.WEEK, 1 )
+    return tuple( weeks )
+
+##############################################################################
+class HeatmapHeader( Widget ):
+    """Widget that shows the year and month markers above a heatmap."""
+
+    DEFAULT_CSS = """
+    HeatmapHeader {
+        height: 1;
+        text-style: bold;
+    }
+    """
+    """str: The default styling for a `HeatmapHeader`."""
+
+    TITLE_WIDTH: Final = 25
+    """int: The width given over to the title column."""
+
+    year = reactive( date.today().year )
+    """int: The year being shown."""
+
+    def render( self ) -> RenderResult:
+        """Render the header.
+
+        Returns:
+            RenderResult: The rendering of the header.
+        """
+        markers = [ " " ] * len( weeks := year_weeks( self.year ) )
+        for column, week in enumerate( weeks ):
+            if ( month := shift_period( week, Resolution.DAY, 6 ) ).year == self.year and month.day <= 7:
+                markers[ column:column + 3 ] = month.strftime( "%b" )
+        return f"  {self.year:<{self.TITLE_WIDTH - 2}}{''.join( markers )}"
+
+##############################################################################
+class StreakHeatmap( Widget, can_focus=True ):
+    """Widget that shows a year-long heatmap for a single streak.
+
+    Each cell of the heatmap is a week, shaded by the weekly total for the
+    streak. The totals come straight from the streak's aggregates, so
+    rendering a year is a fixed number of lookups no matter how much
+    history the streak has.
+    """
+
+    DEFAULT_CSS = """
+    StreakHeatmap {
+        height: 1;
+    }
+
+    StreakHeatmap:focus {
+        background: $primary-background-lighten-1;
+    }
+    """
+    """str: The default styling for a `StreakHeatmap`."""
+
+    SHADES: Final = ( "#0e4429", "#006d32", "#26a641", "#39d353" )
+    """tuple[ str, ... ]: The colours used to shade weeks, from least to most done."""
+
+    year = reactive( date.today().year )
+    """int: The year being shown."""
+
+    def __init__( self, streak: Streak, *args: Any, **kwargs: Any ) -> None:
+        """Initialise the heatmap.
+
+        Args:
+            streak (Streak): The streak to show the heatmap for.
+        """
+        super().__init__( *args, **kwargs )
+        self.streak = streak
+        """Streak: The streak being shown."""
+
+    def render( self ) -> RenderResult:
+        """Render the heatmap.
+
+        Returns:
+            RenderResult: The rendering of the heatmap.
+        """
+        totals  = [ self.streak.total( week, Resolution.WEEK ) for week in year_weeks( self.year ) ]
+        busiest = max( totals, default=0 )
+        heatmap = Text( f"  {self.streak.title[ :HeatmapHeader.TITLE_WIDTH - 4 ]:<{HeatmapHeader.TITLE_WIDTH - 2}}" )
+        for total in totals:
+            if total:
+                heatmap.append( "■", style=self.SHADES[ ( ( total * len( self.SHADES ) ) - 1 ) // busiest ] )
+            else:
+                heatmap.append( "·", style="dim" )
+        return heatmap
+
+### heatmap.py ends here
@@ -0,0 +1,45 @@
+"""Provides a widget for filtering the list of streaks."""
+
+##############################################################################
+# Textual imports.
+from textual.widgets import Input
+from textual.binding import Binding
+from textual.message import Message
+
+##############################################################################
+class StreakFilter( Input ):
+    """Widget for filtering the streaks by title."""
+
+    DEFAULT_CSS = """
+    StreakFilter {
+        display: none;
+        border-left: none;
+        border-right: none;
+    }
+
+    StreakFilter.filtering {
+        display: block;
+    }
+    """
+    """str: The styles for the streak filter widget."""
+
+    BINDINGS = [
+        Binding( "escape", "close", "Close" )
+    ]
+    """list[ Binding ]: The bindings for the streak filter widget."""
+
+    class Closed( Message ):
+        """Message sent when the filter has been closed."""
+
+    def open( self ) -> None:
+        """Show the filter and give it focus."""
+        self.add_class( "filtering" )
+        self.focus()
+
+    def action_close( self ) -> None:
+        """Clear and hide the filter."""
+        self.value = ""
+        self.remove_class( "filtering" )
+        self.post_message( self.Closed() )
+
+### streak_filter.py ends here
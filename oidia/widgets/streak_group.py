@@ -0,0 +1,233 @@
+"""Provides widgets for showing a collapsible group of streaks."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Iterable
+from typing          import Any, cast
+
+##############################################################################
+# Textual imports.
+from textual.app        import ComposeResult, RenderResult
+from textual.binding    import Binding
+from textual.containers import Vertical
+from textual.message    import Message
+from textual.widgets    import Static
+
+##############################################################################
+# Local imports.
+from ..data      import Archive, SortOrder, Streak, in_order, sort_streaks
+from .streakline import StreakLine, arrange
+
+##############################################################################
+class GroupHeader( Static, can_focus=True ):
+    """Widget that shows the header of a group of streaks."""
+
+    DEFAULT_CSS = """
+    GroupHeader {
+        height: 1;
+        padding-left: 1;
+        text-style: bold;
+        background: $primary-background;
+    }
+
+    GroupHeader:focus {
+        background: $primary-background-lighten-1;
+    }
+    """
+    """str: The default styling for a `GroupHeader`."""
+
+    BINDINGS = [
+        Binding( "up",          "screen.focus_up",   "", show=False ),
+        Binding( "down",        "screen.focus_down", "", show=False ),
+        Binding( "enter,space", "toggle",            "Expand/Collapse" )
+    ]
+    """list[ Binding ]: The bindings for a group header."""
+
+    @property
+    def group( self ) -> "StreakGroup":
+        """StreakGroup: The group this is the header for."""
+        return cast( StreakGroup, self.parent )
+
+    def render( self ) -> RenderResult:
+        """Render the header.
+
+        Returns:
+            RenderResult: The rendering of the header.
+        """
+        return (
+            f"{'▶' if self.group.collapsed else '▼'} {self.group.group} "
+            f"({len( self.group.streaks )})"
+        )
+
+    class Toggled( Message ):
+        """Message sent when the user asks for a group to be toggled.
+
+        Attributes:
+            group (StreakGroup): The group to toggle.
+        """
+
+        def __init__( self, group: "StreakGroup" ) -> None:
+            """Initialise the message.
+
+            Args:
+                group (StreakGroup): The group to toggle.
+            """
+            super().__init__()
+            self.group = group
+
+    def action_toggle( self ) -> None:
+        """Ask for the group to be expanded or collapsed."""
+        self.post_message( self.Toggled( self.group ) )
+
+##############################################################################
+class StreakGroup( Vertical ):
+    """Container widget for a collapsible group of streaks.
+
+    When the group is collapsed only its header stays mounted; the streak
+    lines, and all of their day widgets, are removed, with just the data
+    for the streaks being kept. The lines are created afresh when the
+    group is expanded again.
+    """
+
+    DEFAULT_CSS = """
+    StreakGroup {
+        height: auto;
+    }
+    """
+    """str: The default styling for a `StreakGroup`."""
+
+    def __init__( self, group: str, streaks: list[ Streak ], *args: Any, **kwargs: Any ) -> None:
+        """Initialise the group.
+
+        Args:
+            group (str): The name of the group.
+            streaks (list[ Streak ]): The streaks in the group.
+        """
+        super().__init__( *args, **kwargs )
+        self.group = group
+        """str: The name of the group."""
+        self._streaks = streaks
+        self._collapsed: list[ Streak ] | None = None
+
+    def compose( self ) -> ComposeResult:
+        """Compose the group.
+
+        Returns:
+            ComposeResult: The result of composing the group.
+        """
+        yield GroupHeader()
+        yield from ( StreakLine( streak=streak ) for streak in self._streaks )
+
+    @property
+    def collapsed( self ) -> bool:
+        """bool: Is the group collapsed?"""
+        return self._collapsed is not None
+
+    @property
+    def lines( self ) -> list[ StreakLine ]:
+        """list[ StreakLine ]: The streak lines that are mounted in the group."""
+        return [ line for line in self.query( StreakLine ) if not line.removing ]
+
+    @property
+    def streaks( self ) -> list[ Streak ]:
+        """list[ Streak ]: The streaks in the group, in order."""
+        if self._collapsed is not None:
+            return self._collapsed
+        return [ line.streak for line in self.lines ]
+
+    async def close_group( self ) -> list[ StreakLine ]:
+        """Collapse the group.
+
+        Returns:
+            list[ StreakLine ]: The streak lines that were removed.
+        """
+        if self._collapsed is None:
+            lines           = self.lines
+            self._collapsed = [ line.streak for line in lines ]
+            await self.query( StreakLine ).remove()
+            self.query_one( GroupHeader ).refresh()
+            return lines
+        return []
+
+    async def open_group( self, **line_settings: Any ) -> list[ StreakLine ]:
+        """Expand the group.
+
+        Args:
+            line_settings (Any): Settings to apply to the lines once mounted.
+
+        Returns:
+            list[ StreakLine ]: The streak lines that were mounted.
+        """
+        if self._collapsed is None:
+            return []
+        lines = [ StreakLine( streak=streak ) for streak in self._collapsed ]
+        self._collapsed = None
+        return await self.add( lines, **line_settings )
+
+    async def add( self, lines: list[ StreakLine ], **line_settings: Any ) -> list[ StreakLine ]:
+        """Add streak lines to the end of the group.
+
+        Args:
+            lines (list[ StreakLine ]): The lines to add.
+            line_settings (Any): Settings to apply to the lines once mounted.
+
+        Returns:
+            list[ StreakLine ]: The lines that were mounted.
+
+        Note:
+            If the group is collapsed the streaks are added to the group but
+            nothing is mounted.
+        """
+        if self._collapsed is not None:
+            self._collapsed.extend( line.streak for line in lines )
+            lines = []
+        elif lines:
+            await self.mount( *lines )
+            for line in lines:
+                for setting, value in line_settings.items():
+                    setattr( line, setting, value )
+        self.query_one( GroupHeader ).refresh()
+        return lines
+
+    def reorder( self, keys: Iterable[ str ] ) -> None:
+        """Put the streaks in the group into the order of the given keys.
+
+        Args:
+            keys (Iterable[ str ]): The keys of the streaks, in the order wanted.
+        """
+        if self._collapsed is not None:
+            self._collapsed = in_order( self._collapsed, keys )
+        else:
+            arrange( self, in_order( self.streaks, keys ) )
+
+    def discard( self, key: str ) -> None:
+        """Remove a streak from a collapsed group.
+
+        Args:
+            key (str): The key of the streak to remove.
+
+        Note:
+            The streaks of an expanded group are removed by removing their
+            lines.
+        """
+        if self._collapsed is not None:
+            self._collapsed = [ streak for streak in self._collapsed if streak.key != key ]
+            self.query_one( GroupHeader ).refresh()
+
+    def sort( self, order: SortOrder, archive: Archive ) -> None:
+        """Sort the streaks in the group.
+
+        Args:
+            order (SortOrder): The order to sort the streaks into.
+            archive (Archive): The archive of the streaks' old years.
+
+        Note:
+            If the group is collapsed only the data is sorted, otherwise
+            the lines are moved into place.
+        """
+        if self._collapsed is not None:
+            self._collapsed = sort_streaks( self._collapsed, order, archive )
+        else:
+            arrange( self, sort_streaks( self.streaks, order, archive ) )
+
+### streak_group.py ends here
@@ -0,0 +1,100 @@
+"""Provides the base for a widget that shows the streaks as rows."""
+
+##############################################################################
+# Python imports.
+from typing import cast
+
+##############################################################################
+# Textual imports.
+from textual.css.query  import NoMatches
+from textual.containers import Vertical
+
+##############################################################################
+# Local imports.
+from .streakline   import StreakLine
+from .streak_group import GroupHeader
+
+##############################################################################
+class StreakRows( Vertical ):
+    """The base for a container of streaks, shown as rows of streak lines and group headers.
+
+    This looks after finding the rows that are being shown, and which of
+    them has focus, so that focus can be moved from row to row.
+    """
+
+    @property
+    def first_match( self ) -> StreakLine | None:
+        """StreakLine | None: The first streak that is being shown, if there is one."""
+        for line in self.query( StreakLine ):
+            if line.display and not line.removing:
+                return line
+        return None
+
+    @property
+    def rows( self ) -> list[ StreakLine | GroupHeader ]:
+        """list[ StreakLine | GroupHeader ]: The visible rows of the display, in order."""
+        return [
+            row for row in self.query( "StreakLine, GroupHeader" )
+            if isinstance( row, ( StreakLine, GroupHeader ) )
+            and row.display and not ( isinstance( row, StreakLine ) and row.removing )
+        ]
+
+    def neighbour(
+        self, row: StreakLine | GroupHeader, direction: int
+    ) -> StreakLine | GroupHeader:
+        """Find the nearest visible neighbour of a row.
+
+        Args:
+            row (StreakLine | GroupHeader): The row to find the neighbour of.
+            direction (int): The direction to look in.
+
+        Returns:
+            StreakLine | GroupHeader: The neighbouring row.
+
+        Note:
+            Looking past either end of the list wraps around to the other
+            end. If there are no other visible rows, the row itself is
+            returned.
+        """
+        rows     = self.rows
+        position = rows.index( row ) if row in rows else 0
+        return rows[ ( position + direction ) % len( rows ) ] if rows else row
+
+    @property
+    def focused_streak( self ) -> StreakLine | None:
+        """StreakLine | None: The streak that contains focus, if there is one."""
+        try:
+            return self.query_one( "StreakLine:focus-within", StreakLine )
+        except NoMatches:
+            return None
+
+    @property
+    def focused_row( self ) -> StreakLine | GroupHeader | None:
+        """StreakLine | GroupHeader | None: The row that contains focus, if there is one."""
+        if isinstance( focused := self.screen.focused, GroupHeader ):
+            return focused
+        return self.focused_streak
+
+    def __getitem__( self, index: int ) -> StreakLine:
+        """Get a streak based on its index.
+
+        Args:
+            index (int): The index of the streak to get.
+        """
+        return cast( StreakLine, self.children[ index ] )
+
+    def index( self, streak: StreakLine ) -> int:
+        """Find the index of the given streak.
+
+        Args:
+            streak (StreakLine): The streak to look for.
+
+        Returns:
+            int: The position of the streak.
+
+        Raises:
+            ValueError: If the streak could not be found.
+        """
+        return self.children.index( streak )
+
+### streak_rows.py ends here
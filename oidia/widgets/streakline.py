@@ -2,14 +2,14 @@
 
 ##############################################################################
 # Python imports.
-from typing      import Any, cast
-from datetime    import date, timedelta
-from collections import defaultdict
-from functools   import partial
+from bisect          import bisect_left
+from collections.abc import Hashable
+from typing          import Any, Final, cast
+from datetime        import date
+from functools       import partial
 
 ##############################################################################
 # Textual imports.
-from textual.app       import RenderResult
 from textual.reactive  import reactive
 from textual.binding   import Binding
 from textual.message   import Message
@@ -19,6 +19,10 @@ from textual.widget    import Widget
 
 ##############################################################################
 # Local imports.
+from ..data       import (
+    Change, DayChange, Notes, OrderChange, Resolution, Streak, StreakChange, TitleChange,
+    period_start, shift_period
+)
 from .timeline    import TimelineTitle, TimelineDay, Timeline
 from .title_input import TitleInput
 
@@ -39,26 +43,55 @@ class StreakDay( TimelineDay, can_focus=True ):
         Binding( "up",                "screen.focus_up",    "", show=False ),
         Binding( "down",              "screen.focus_down",  "", show=False ),
         Binding( "minus,backspace",   "done( -1 )", "Less Done", key_display="-" ),
-        Binding( "equals_sign,space", "done(  1 )", "More Done", key_display="=" )
+        Binding( "equals_sign,space", "done(  1 )", "More Done", key_display="=" ),
+        Binding( "0,delete",          "clear",      "Clear", show=False )
     ]
     """list[ Binding ]: The bindings for a streak day."""
 
+    NOTE_MARK: Final = "•"
+    """str: The mark shown on a day that has a note."""
+
     done = reactive( 0 )
-    """int: The done count for the day."""
+    """int: The done count for the day.
+
+    When the timeline is showing a resolution coarser than a day, this is
+    the total done count for the period.
+    """
+
+    noted = reactive( False )
+    """bool: Does the day have a note?
+
+    When the timeline is showing a resolution coarser than a day, this is
+    if any day in the period has a note.
+    """
 
-    def __init__( self, day: date, done: int, *args: Any, **kwargs: Any ) -> None:
+    def __init__( self, day: date, done: int, *args: Any, noted: bool=False, **kwargs: Any ) -> None:
         """Initialise the streak day."""
         super().__init__( day, *args, **kwargs )
-        with self.prevent( self.Updated ):
-            self.done = done
+        self.done  = done
+        self.noted = noted
 
-    def render( self ) -> RenderResult:
-        """Render the content of the streak day.
+    @property
+    def editable( self ) -> bool:
+        """bool: Can the done count for this day be edited?
+
+        Only individual days can be edited; the totals for weeks and months
+        are derived from the days within them.
+        """
+        return self.resolution is Resolution.DAY
+
+    @property
+    def content_key( self ) -> Hashable:
+        """Hashable: Everything that what the cell shows depends on."""
+        return ( self.done, self.noted )
+
+    def content( self ) -> str:
+        """Get what the cell shows.
 
         Returns:
-            RenderResult: The content to render for the day.
+            str: The done count for the day, marked if it has a note.
         """
-        return str( self.done ) if self.done else ""
+        return f"{self.done or ''}{self.NOTE_MARK if self.noted else ''}"
 
     class Updated( Message ):
         """Message sent when the streak day is updated.
@@ -79,9 +112,21 @@ class StreakDay( TimelineDay, can_focus=True ):
             self.day  = day.day
             self.done = updated_to
 
-    def on_mount( self ) -> None:
-        """Force an initial refresh on mount."""
-        self.action_done( 0 )
+    class SelectionMarked( Message ):
+        """Message sent when the done count is changed for a selection of days.
+
+        Attributes:
+            adjust (int | None): The amount to adjust the counts by, or `None` to clear them.
+        """
+
+        def __init__( self, adjust: int | None ) -> None:
+            """Initialise the message.
+
+            Args:
+                adjust (int | None): The amount to adjust the counts by, or `None` to clear them.
+            """
+            super().__init__()
+            self.adjust = adjust
 
     def watch_done( self, new_done: int ) -> None:
         """React to changes in the done count.
@@ -90,15 +135,47 @@ class StreakDay( TimelineDay, can_focus=True ):
             new_done (int): The new value for `done`.
         """
         self.set_class( bool( new_done ), "done" )
-        self.post_message( self.Updated( self, new_done ) )
+
+    def watch_noted( self, new_noted: bool ) -> None:
+        """React to changes in whether the day has a note.
+
+        Args:
+            new_noted (bool): The new value for `noted`.
+        """
+        self.set_class( new_noted, "noted" )
 
     def action_done( self, this_many: int ) -> None:
         """Handle the done count being changed.
 
         Args:
             this_many (int): The amount to change the done count by.
+
+        Note:
+            If the day is part of a selection of days, the change is made to
+            the whole of the selection instead.
         """
-        self.done = max( 0, self.done + this_many )
+        if self.has_class( "selected" ):
+            self.post_message( self.SelectionMarked( this_many ) )
+        elif not self.editable:
+            self.app.bell()
+        elif ( done := max( 0, self.done + this_many ) ) != self.done:
+            self.done = done
+            self.post_message( self.Updated( self, done ) )
+
+    def action_clear( self ) -> None:
+        """Handle the done count being cleared.
+
+        Note:
+            If the day is part of a selection of days, the whole of the
+            selection is cleared instead.
+        """
+        if self.has_class( "selected" ):
+            self.post_message( self.SelectionMarked( None ) )
+        elif not self.editable:
+            self.app.bell()
+        elif self.done:
+            self.done = 0
+            self.post_message( self.Updated( self, 0 ) )
 
     def on_click( self, event: Click ) -> None:
         """Handle a mouse click event.
@@ -118,7 +195,102 @@ class StreakDay( TimelineDay, can_focus=True ):
             self.action_done( -1 )
 
 ##############################################################################
-class StreakLine( Timeline ):
+class StreakTimeline( Timeline ):
+    """Widget to display the done counts of a streak on a timeline.
+
+    This only shows the streak; editing it, and moving it around the list
+    of streaks, is left to `StreakLine`.
+    """
+
+    def __init__( self, *args: Any, streak: Streak | None=None, **kwargs: Any ) -> None:
+        """Initialise the streak timeline."""
+        super().__init__( *args, **kwargs )
+        self.streak = streak or Streak()
+        """Streak: The data for the streak being shown."""
+        self.title = self.streak.title
+
+    def watch_title( self, new_title: str ) -> None:
+        """Keep the streak's title in step with the title of the line.
+
+        Args:
+            new_title (str): The new title.
+        """
+        self.streak.title = new_title
+        super().watch_title( new_title )
+
+    @property
+    def as_dict( self ) -> dict[ str, str | dict[ str, int ] ]:
+        """dict[ str, str | dict[ str, int ] ]: The streak as a dictionary.
+
+        This is intended to be converted into JSON data.
+        """
+        return self.streak.as_dict
+
+    @property
+    def notes( self ) -> Notes | None:
+        """Notes | None: The notes for the days of the streak, if there are any to hand.
+
+        These are the notes held by the nearest container of the line that
+        has any.
+        """
+        for node in self.ancestors:
+            if isinstance( notes := getattr( node, "notes", None ), Notes ):
+                return notes
+        return None
+
+    def noted( self, day: date, resolution: Resolution ) -> bool:
+        """Does a period of the streak have a note?
+
+        Args:
+            day (date): The start of the period.
+            resolution (Resolution): The resolution of the period.
+
+        Returns:
+            bool: `True` if any day in the period has a note, `False` if not.
+        """
+        return ( notes := self.notes ) is not None and notes.noted(
+            self.streak.key,
+            day,
+            None if resolution is Resolution.DAY else shift_period( day, resolution, 1 )
+        )
+
+    def make_my_day( self, day: date ) -> StreakDay:
+        """Make a day widget for the given day.
+
+        Args:
+            day (date): The date to make the day widget for.
+
+        Returns:
+            StreakDay: The day widget for the timeline.
+        """
+        resolution = self.time_span.resolution
+        return StreakDay(
+            day, self.streak.total( day, resolution ), resolution, noted=self.noted( day, resolution )
+        )
+
+    def refresh_days( self ) -> None:
+        """Refresh the done counts shown for the visible days.
+
+        This is for use when the streak's data has been changed from
+        somewhere other than the day widgets themselves.
+        """
+        for day in self.query( StreakDay ):
+            day.done  = self.streak.total( day.day, day.resolution )
+            day.noted = self.noted( day.day, day.resolution )
+
+    def adjust_day( self, day: TimelineDay, new_date: date ) -> None:
+        """Adjust the date of a given timeline day.
+
+        Args:
+            day (TimelineDay): The day widget to adjust.
+            new_date (date): The new date for the day widget.
+        """
+        super().adjust_day( day, new_date )
+        cast( StreakDay, day ).done  = self.streak.total( new_date, day.resolution )
+        cast( StreakDay, day ).noted = self.noted( new_date, day.resolution )
+
+##############################################################################
+class StreakLine( StreakTimeline ):
     """Widget to display a horizontal timeline of streak results."""
 
     DEFAULT_CSS = """
@@ -129,30 +301,19 @@ class StreakLine( Timeline ):
 
     BINDINGS = [
         Binding( "enter",     "edit",   "Edit" ),
+        Binding( "g",         "group",  "Group" ),
+        Binding( "n",         "note",   "Note" ),
         Binding( "ctrl+d",    "delete", "Delete" ),
         Binding( "ctrl+up",   "up",     "Up" ),
         Binding( "ctrl+down", "down",   "Down" )
     ]
     """list[ Binding ]: The bindings for the widget."""
 
-    def __init__( self, *args: Any, start: dict[ date, int ] | None=None, **kwargs: Any ) -> None:
+    def __init__( self, *args: Any, streak: Streak | None=None, **kwargs: Any ) -> None:
         """Initialise the streak line."""
-        super().__init__( *args, **kwargs )
-        self._streaks: defaultdict[ date, int ] = defaultdict( int, start or {} )
+        super().__init__( *args, streak=streak, **kwargs )
         self._removing = False
-
-    @property
-    def as_dict( self ) -> dict[ str, str | dict[ str, int ] ]:
-        """dict[ str, str | dict[ str, int ] ]: The streak as a dictionary.
-
-        This is intended to be converted into JSON data.
-        """
-        return {
-            "title": self.title,
-            "days": {
-                day.isoformat(): count for day, count in self._streaks.items() if count > 0
-            }
-        }
+        self._noting: date | None = None
 
     @classmethod
     def from_dict( cls, data: dict[ str, str | dict[ str, int ] ] ) -> "StreakLine":
@@ -164,27 +325,29 @@ class StreakLine( Timeline ):
         Returns:
             StreakLine: The new widget to show the streak.
         """
-        streak = cls( start={
-            date.fromisoformat( day ): count for day, count
-            in cast( dict[ str, int ], data[ "days" ] ).items()
-        } )
-        streak.title = str( data[ "title" ] )
-        return streak
+        return cls( streak=Streak.from_dict( data ) )
 
     @property
     def removing( self ) -> bool:
         """Is this line in the process of being removed?"""
         return self._removing
 
+    @property
+    def group_lines( self ) -> list[ "StreakLine" ]:
+        """list[ StreakLine ]: The streak lines in the same list as this one, including this one."""
+        return [] if self.parent is None else [
+            child for child in self.parent.children if isinstance( child, StreakLine )
+        ]
+
     @property
     def is_first( self ) -> bool:
         """bool: Is this the first streak in the list?"""
-        return self.parent is not None and self.parent.children[ 0 ] == self
+        return ( lines := self.group_lines ) != [] and lines[ 0 ] == self
 
     @property
     def is_last( self ) -> bool:
         """bool: Is this the last streak in the list?"""
-        return self.parent is not None and self.parent.children[ -1 ] == self
+        return ( lines := self.group_lines ) != [] and lines[ -1 ] == self
 
     @property
     def contains_focus( self ) -> bool:
@@ -225,19 +388,24 @@ class StreakLine( Timeline ):
             from_streak.days.children.index( self.screen.focused )
         ].focus()
 
-    def make_my_day( self, day: date ) -> StreakDay:
-        """Make a day widget for the given day.
-
-        Args:
-            day (date): The date to make the day widget for.
+    class Updated( Message ):
+        """Message sent when a streak is updated in some way.
 
-        Returns:
-            StreakDay: The day widget for the timeline.
+        Attributes:
+            line (StreakLine): The streak line that was updated.
+            changes (tuple[ Change, ... ]): The changes that were made.
         """
-        return StreakDay( day, self._streaks[ day ] )
 
-    class Updated( Message ):
-        """Message sent when a streak is updated in some way."""
+        def __init__( self, line: "StreakLine", *changes: Change ) -> None:
+            """Initialise the message.
+
+            Args:
+                line (StreakLine): The streak line that was updated.
+                changes (Change): The changes that were made.
+            """
+            super().__init__()
+            self.line    = line
+            self.changes = changes
 
     def on_streak_day_updated( self, event: StreakDay.Updated ) -> None:
         """React to the done count of a day being changed.
@@ -245,20 +413,9 @@ class StreakLine( Timeline ):
         Args:
             event (StreakDay.Updated): The event.
         """
-        self._streaks[ event.day ] = event.done
-        if self._streaks[ event.day ] == 0:
-            del self._streaks[ event.day ]
-        self.post_message( self.Updated() )
-
-    def adjust_day( self, day: TimelineDay, delta: timedelta ) -> None:
-        """Adjust the date of a given timeline day.
-
-        Args:
-            day (TimelineDay): The day widget to adjust.
-            delta (timedelta): The period of time to adjust by.
-        """
-        super().adjust_day( day, delta )
-        cast( StreakDay, day ).done = self._streaks[ day.day ]
+        change = DayChange( self.streak.key, event.day, self.streak[ event.day ], event.done )
+        self.streak[ event.day ] = event.done
+        self.post_message( self.Updated( self, change ) )
 
     def maybe_focus_day( self, day: date ) -> None:
         """Set focus on a paticular day, if it's visible.
@@ -268,28 +425,31 @@ class StreakLine( Timeline ):
 
         Note:
             This will only focus a day display, of the given date, *iff* a
-            day of that date is visible to the user (horizontally).
+            day of that date is visible to the user (horizontally). If the
+            timeline is zoomed out past individual days, the period that
+            contains the day will be focused.
         """
+        day = period_start( day, self.time_span.resolution )
         for candidate in self.query( StreakDay ):
             if candidate.day == day:
                 candidate.focus()
                 return
 
-    def zoom_days( self, days: int ) -> None:
-        """Zoom the timeline in/out by a given number of days.
+    def zoom_periods( self, periods: int ) -> None:
+        """Zoom the timeline in/out by a given number of periods.
 
         Args:
-            days (int): The number of days to zoom by.
+            periods (int): The number of periods to zoom by.
 
         Note:
-            A negative number of days zooms out.
+            A negative number of periods zooms in.
         """
         # If we were currently focused on a date in our timeline, remember
         # what it is.
         return_to = focused_day.day if ( focused_day := self.focused_day ) is not None else None
 
         # Do the normal processing.
-        super().zoom_days( days )
+        super().zoom_periods( periods )
 
         # Now, if there's a day to return to...
         if return_to is not None:
@@ -314,6 +474,52 @@ class StreakLine( Timeline ):
         if self.screen.focused is not None:
             self.screen.focused.add_class( "back-here-please" )
 
+    async def action_group( self ) -> None:
+        """Start the process of changing the group of a streak."""
+        self.add_class( "editing" )
+        await self.mount(
+            group_input := TitleInput( value=self.streak.group, placeholder="Group", id="group-input" ),
+            before=0
+        )
+        group_input.focus()
+
+    async def action_note( self ) -> None:
+        """Start the process of editing the note for the focused day.
+
+        Note:
+            Only individual days can have notes.
+        """
+        if ( day := self.focused_day ) is None or not day.editable or ( notes := self.notes ) is None:
+            self.app.bell()
+            return
+        await notes.fetch( self.streak.key )
+        self._noting = day.day
+        day.add_class( "back-here-please" )
+        self.add_class( "editing" )
+        await self.mount(
+            note_input := TitleInput(
+                value=notes.get( self.streak.key, day.day ), placeholder="Note", id="note-input"
+            ),
+            before=0
+        )
+        note_input.focus()
+
+    class Regrouped( Message ):
+        """Message sent when a streak is moved to a different group.
+
+        Attributes:
+            line (StreakLine): The streak line that was moved.
+        """
+
+        def __init__( self, line: "StreakLine" ) -> None:
+            """Initialise the message.
+
+            Args:
+                line (StreakLine): The streak line that was moved.
+            """
+            super().__init__()
+            self.line = line
+
     async def on_input_submitted( self, event: TitleInput.Submitted ) -> None:
         """Handle the user submitting input.
 
@@ -325,6 +531,16 @@ class StreakLine( Timeline ):
         # an edit event. That's on us.
         event.prevent_default()
 
+        # If this is the group being edited, that's handled differently.
+        if event.input.id == "group-input":
+            await self._regroup( cast( TitleInput, event.input ) )
+            return
+
+        # Likewise if it's the note for a day being edited.
+        if event.input.id == "note-input":
+            await self._annotate( cast( TitleInput, event.input ) )
+            return
+
         # Let's make sure focus is back to where it should be.
         try:
             return_to = self.screen.query_one( ".back-here-please" )
@@ -340,16 +556,62 @@ class StreakLine( Timeline ):
         # Now let's remove the input box.
         await event.input.remove()
 
-        # If the user entered a title...
-        if title:
+        # If the user entered a different title...
+        changes: list[ Change ] = []
+        if title and title != self.title:
             # ...go with it.
+            changes.append( TitleChange( self.streak.key, self.title, title ) )
             self.title = title
 
         # Ensure any editing state is cleared.
         self.remove_class( "editing" )
 
         # Let anyone above us know we changed stuff.
-        self.post_message( self.Updated() )
+        self.post_message( self.Updated( self, *changes ) )
+
+    async def _regroup( self, group_input: TitleInput ) -> None:
+        """Handle the user submitting a new group for the streak.
+
+        Args:
+            group_input (TitleInput): The input the group was entered in.
+
+        Note:
+            An empty group takes the streak out of any group; cancelling
+            the input leaves the group as it was.
+        """
+        group = group_input.value.strip()
+        await group_input.remove()
+        self.remove_class( "editing" )
+        if not group_input.cancelled and group != self.streak.group:
+            self.streak.group = group
+            self.post_message( self.Regrouped( self ) )
+        else:
+            self.query( StreakDay ).last().focus()
+
+    async def _annotate( self, note_input: TitleInput ) -> None:
+        """Handle the user submitting a note for a day.
+
+        Args:
+            note_input (TitleInput): The input the note was entered in.
+
+        Note:
+            An empty note removes any note the day had; cancelling the
+            input leaves the note as it was.
+        """
+        text = note_input.value.strip()
+        await note_input.remove()
+        self.remove_class( "editing" )
+        if not note_input.cancelled and self._noting is not None and ( notes := self.notes ) is not None:
+            notes.set( self.streak.key, self._noting, text )
+            for day in self.query( StreakDay ):
+                day.noted = self.noted( day.day, day.resolution )
+        self._noting = None
+        try:
+            return_to = self.screen.query_one( ".back-here-please" )
+            return_to.remove_class( "back-here-please" )
+            return_to.focus()
+        except NoMatches:
+            self.query( StreakDay ).last().focus()
 
     async def on_click( self, event: Click ) -> None:
         """Handle clicks on the widget.
@@ -364,12 +626,14 @@ class StreakLine( Timeline ):
 
     def action_delete( self ) -> None:
         """Delete the current streak."""
+        # Make a note of what's being removed, so it can be put back.
+        change = StreakChange( self.streak.to_dict(), self.group_lines.index( self ), False )
         # Mark this line as one being removed.
         self._removing = True
         # Let the parent know a change is happening, it should respect the
         # `removing` state of lines when saving (in other words filter them
         # out).
-        self.post_message( self.Updated() )
+        self.post_message( self.Updated( self, change ) )
         # Finally, we want to self-remove, but doing so would cause the
         # above message to never make it to the parent; so we delay the
         # removal until (hopefully) the message has got out.
@@ -377,24 +641,99 @@ class StreakLine( Timeline ):
         # See https://github.com/Textualize/textual/issues/2017
         self.call_after_refresh( self.remove )
 
+    def _order_change( self, before: list[ "StreakLine" ] ) -> OrderChange:
+        """Make a record of this line having been moved.
+
+        Args:
+            before (list[ StreakLine ]): The lines in their order before the move.
+
+        Returns:
+            OrderChange: The record of the move.
+        """
+        return OrderChange(
+            self.streak.group,
+            tuple( line.streak.key for line in before ),
+            tuple( line.streak.key for line in self.group_lines )
+        )
+
     def action_up( self ) -> None:
         """Move the streak up the list of streaks."""
         if self.parent is not None and not self.is_first:
-            parent = cast( Widget, self.parent )
-            parent.move_child(
-                self, before=parent.children.index( self ) - 1
+            lines = self.group_lines
+            cast( Widget, self.parent ).move_child(
+                self, before=lines[ lines.index( self ) - 1 ]
             )
-            self.post_message( self.Updated() )
+            self.post_message( self.Updated( self, self._order_change( lines ) ) )
             self.scroll_visible()
 
     def action_down( self ) -> None:
         """Move the streak down the list of streaks."""
         if self.parent is not None and not self.is_last:
-            parent = cast( Widget, self.parent )
-            parent.move_child(
-                self, after=parent.children.index( self ) + 1
+            lines = self.group_lines
+            cast( Widget, self.parent ).move_child(
+                self, after=lines[ lines.index( self ) + 1 ]
             )
-            self.post_message( self.Updated() )
+            self.post_message( self.Updated( self, self._order_change( lines ) ) )
             self.scroll_visible()
 
+##############################################################################
+def arrange( parent: Widget, streaks: list[ Streak ] ) -> None:
+    """Arrange the streak lines within a parent into the order of some streaks.
+
+    Args:
+        parent (Widget): The parent widget whose streak lines are to be arranged.
+        streaks (list[ Streak ]): The streaks, in the order wanted.
+
+    Note:
+        The new order is worked out in a single pass, and the longest run
+        of lines that are already in order is left where it is; every
+        other line is moved the once, straight to where it belongs. Any
+        lines whose streaks aren't in `streaks` end up after those that
+        are.
+    """
+    current  = [ child for child in parent.children if isinstance( child, StreakLine ) ]
+    position = { line: index for index, line in enumerate( current ) }
+    lines    = { line.streak.key: line for line in current }
+    wanted   = [ lines.pop( streak.key ) for streak in streaks if streak.key in lines ]
+    wanted  += [ line for line in current if line.streak.key in lines ]
+    staying  = _in_place( [ position[ line ] for line in wanted ] )
+    following: StreakLine | None = None
+    for index in reversed( range( len( wanted ) ) ):
+        line = wanted[ index ]
+        if index not in staying:
+            if following is not None:
+                parent.move_child( line, before=following )
+            elif line is not current[ -1 ]:
+                parent.move_child( line, after=current[ -1 ] )
+        following = line
+
+##############################################################################
+def _in_place( positions: list[ int ] ) -> set[ int ]:
+    """Find the longest run of items that are already in order.
+
+    Args:
+        positions (list[ int ]): The current position of each item, in the order wanted.
+
+    Returns:
+        set[ int ]: The indexes into `positions` of the items that can stay where they are.
+    """
+    tails: list[ int ] = []
+    ends: list[ int ] = []
+    previous: list[ int ] = []
+    for index, here in enumerate( positions ):
+        slot = bisect_left( tails, here )
+        previous.append( ends[ slot - 1 ] if slot else -1 )
+        if slot == len( tails ):
+            tails.append( here )
+            ends.append( index )
+        else:
+            tails[ slot ] = here
+            ends[ slot ]  = index
+    staying: set[ int ] = set()
+    index = ends[ -1 ] if ends else -1
+    while index >= 0:
+        staying.add( index )
+        index = previous[ index ]
+    return staying
+
 ### streakline.py ends here
@@ -2,25 +2,27 @@
 
 ##############################################################################
 # Python imports.
-from typing  import Final, Any, cast
-from pathlib import Path
-from json    import dumps, loads, JSONEncoder
-
-##############################################################################
-# XDG imports.
-from xdg import xdg_data_home
+from collections.abc import Iterable
+from datetime        import date
+from typing          import Any
 
 ##############################################################################
 # Textual imports.
-from textual.css.query  import NoMatches
-from textual.containers import Vertical
+from textual.message import Message
 
 ##############################################################################
 # Local imports.
-from . import StreakLine
+from ..data         import (
+    DayChange, History, Notes, Operation, OrderChange, Row, SortOrder, Storage, Store, Streak,
+    StreakChange, Tally, TitleChange, TitleIndex, data_directory, in_order, mark_days,
+    merge_tally, sort_streaks
+)
+from .streakline    import StreakLine, arrange
+from .streak_group  import GroupHeader, StreakGroup
+from .streak_rows   import StreakRows
 
 ##############################################################################
-class Streaks( Vertical ):
+class Streaks( StreakRows ):
     """Container widget for the streaks."""
 
     DEFAULT_CSS = """
@@ -30,75 +32,614 @@ class Streaks( Vertical ):
     }
     """
 
-    STREAKS_FILE: Final = Path( "streaks.json" )
-    """Path: The name of the file that the list it saved to."""
+    def __init__(
+        self, *args: Any, history: History | None=None, store: Store | None=None, **kwargs: Any
+    ) -> None:
+        """Initialise the streaks container.
+
+        Args:
+            history (History | None): The history to record changes in.
+            store (Store | None): The store of streaks to show; by default the local user's streaks.
+        """
+        super().__init__( *args, **kwargs )
+        self.store = store or Store( Storage( data_directory() ) )
+        """Store: The store that holds the streaks."""
+        self.storage = self.store.storage
+        """Storage: The storage for the streaks."""
+        self.history = history or History()
+        """History: The history of changes made to the streaks."""
+        self.titles = TitleIndex()
+        """TitleIndex: The index of the titles of the streaks."""
+        self._lines: dict[ str, StreakLine ] = {}
+        self._showing: set[ str ] = set()
+        self._filter = ""
+
+    @property
+    def streaks( self ) -> list[ Streak ]:
+        """list[ Streak ]: The data for all of the current streaks.
+
+        This includes the streaks in any collapsed groups.
+        """
+        streaks: list[ Streak ] = []
+        for child in self.children:
+            if isinstance( child, StreakLine ) and not child.removing:
+                streaks.append( child.streak )
+            elif isinstance( child, StreakGroup ):
+                streaks.extend( child.streaks )
+        return streaks
 
     @property
-    def data_file( self ) -> Path:
-        """Path: The full path to the file for saving the data.
+    def notes( self ) -> Notes:
+        """Notes: The notes attached to days of the streaks."""
+        return self.storage.notes
 
-        Note:
-            As a side effect of access the directory will be crated if it
-            doesn't exist.
+    @property
+    def groups( self ) -> list[ StreakGroup ]:
+        """list[ StreakGroup ]: The groups of streaks."""
+        return [ child for child in self.children if isinstance( child, StreakGroup ) ]
+
+    def group( self, name: str ) -> StreakGroup | None:
+        """Find a group by name.
+
+        Args:
+            name (str): The name of the group.
+
+        Returns:
+            StreakGroup | None: The group, or `None` if there is no such group.
+        """
+        for group in self.groups:
+            if group.group == name:
+                return group
+        return None
+
+    def _order( self, group: str ) -> list[ str ]:
+        """Get the keys of the streaks in a group, in order.
+
+        Args:
+            group (str): The name of the group, or empty for the ungrouped streaks.
+
+        Returns:
+            list[ str ]: The keys of the streaks in the group.
+        """
+        if not group:
+            return [
+                child.streak.key for child in self.children
+                if isinstance( child, StreakLine ) and not child.removing
+            ]
+        return [] if ( container := self.group( group ) ) is None else [
+            streak.key for streak in container.streaks
+        ]
+
+    def _reorder( self, group: str, keys: Iterable[ str ] ) -> None:
+        """Put the streaks in a group into the order of the given keys.
+
+        Args:
+            group (str): The name of the group, or empty for the ungrouped streaks.
+            keys (Iterable[ str ]): The keys of the streaks, in the order wanted.
         """
-        ( save_to := xdg_data_home() / "oidia" ).mkdir( parents=True, exist_ok=True )
-        return save_to / self.STREAKS_FILE
+        if not group:
+            arrange( self, in_order( (
+                child.streak for child in self.children
+                if isinstance( child, StreakLine ) and not child.removing
+            ), keys ) )
+        elif ( container := self.group( group ) ) is not None:
+            container.reorder( keys )
 
-    class Encoder( JSONEncoder ):
-        """Encoder for the streak data data."""
+    def _tidy_groups( self ) -> None:
+        """Remove any groups that have been emptied, and refresh the rest."""
+        for group in self.groups:
+            if group.streaks:
+                group.query_one( GroupHeader ).refresh()
+            else:
+                group.remove()
 
-        def default( self, o: object ) -> Any:
-            """Handle unknown values."""
-            return o.as_dict if isinstance( o, StreakLine ) else super().default( o )
+    class Changed( Message ):
+        """Message sent when the streaks have been changed by another session."""
 
     def save( self ) -> None:
-        """Save the streaks to local storage."""
-        self.data_file.write_text( dumps(
-            [ streak for streak in self.query( StreakLine ) if not streak.removing ],
-            cls    = self.Encoder,
-            indent = 4
-        ) )
+        """Save the streaks to the store."""
+        self.store.changed( self.streaks, self )
+
+    def _store_changed( self ) -> None:
+        """Let the screen know that another session has changed the streaks."""
+        self.post_message( self.Changed() )
+
+    def on_unmount( self ) -> None:
+        """Stop using the store when the streaks go away."""
+        self.store.unsubscribe( self )
+        self.store.flush()
+
+    def _track( self, lines: list[ StreakLine ] ) -> None:
+        """Start tracking newly-mounted streak lines.
+
+        Args:
+            lines (list[ StreakLine ]): The lines to track.
+        """
+        for line in lines:
+            self._lines[ line.streak.key ] = line
+            self._showing.add( line.streak.key )
+            self.titles.add( line.streak.key, line.streak.title )
+        if self._filter:
+            self.filter( self._filter )
+
+    def _untrack( self, lines: list[ StreakLine ] ) -> None:
+        """Stop tracking streak lines that are being unmounted.
+
+        Args:
+            lines (list[ StreakLine ]): The lines to stop tracking.
+
+        Note:
+            The titles of the streaks stay in the index.
+        """
+        for line in lines:
+            self._lines.pop( line.streak.key, None )
+            self._showing.discard( line.streak.key )
+
+    def _forget( self, line: StreakLine ) -> None:
+        """Stop tracking a streak line that has been deleted.
+
+        Args:
+            line (StreakLine): The line to forget.
+        """
+        self._untrack( [ line ] )
+        self.titles.remove( line.streak.key )
+
+    async def _populate( self, streaks: Iterable[ Streak ] ) -> list[ StreakLine ]:
+        """Mount the lines and groups for some streaks.
+
+        Args:
+            streaks (Iterable[ Streak ]): The streaks to show.
+
+        Returns:
+            list[ StreakLine ]: The lines that were mounted.
+
+        Note:
+            Ungrouped streaks are shown first, followed by each group in
+            the order that they're first seen in the data.
+        """
+        groups: dict[ str, list[ Streak ] ] = {}
+        for streak in streaks:
+            groups.setdefault( streak.group, [] ).append( streak )
+        ungrouped = groups.pop( "", [] )
+        await self.mount(
+            *[ StreakLine( streak=streak ) for streak in ungrouped ],
+            *[ StreakGroup( name, streaks ) for name, streaks in groups.items() ]
+        )
+        self._track( lines := list( self.query( StreakLine ) ) )
+        for members in groups.values():
+            for streak in members:
+                self.titles.add( streak.key, streak.title )
+        return lines
 
     async def load( self ) -> None:
-        """Load any streak data from storage."""
-        if self.data_file.exists():
-            await self.mount( *[
-                StreakLine.from_dict( streak )
-                for streak in loads( self.data_file.read_text() )
-            ] )
+        """Load the streaks from the store.
 
-    @property
-    def focused_streak( self ) -> StreakLine | None:
-        """StreakLine | None: The streak that contains focus, if there is one."""
-        try:
-            return self.query_one( "StreakLine:focus-within", StreakLine )
-        except NoMatches:
-            return None
+        Note:
+            If another session is already showing the streaks they aren't
+            loaded again; the streaks the store already holds are shown.
+        """
+        await self.store.ready()
+        await self._populate( self.store.streaks )
+        self.store.subscribe( self, self._store_changed )
+
+    async def resync( self, **line_settings: Any ) -> None:
+        """Bring the display up to date with changes made by another session.
+
+        Args:
+            line_settings (Any): Settings to apply to any lines that get mounted.
+
+        Note:
+            If only the content of the streaks has changed the lines are
+            simply refreshed. If streaks have been added, removed, moved or
+            regrouped the lines are mounted afresh; as the history of
+            changes made here may no longer make sense, it is forgotten.
+        """
+        streaks = self.store.streaks
+        if [ ( streak.key, streak.group ) for streak in streaks ] == [
+            ( streak.key, streak.group ) for streak in self.streaks
+        ]:
+            with self.app.batch_update():
+                for line in self.query( StreakLine ):
+                    if line.title != line.streak.title:
+                        line.title = line.streak.title
+                    line.refresh_days()
+                for streak in streaks:
+                    self.titles.add( streak.key, streak.title )
+                self._tidy_groups()
+        else:
+            self.history.clear()
+            with self.app.batch_update():
+                self._untrack( list( self.query( StreakLine ) ) )
+                await self.query( "StreakLine, StreakGroup" ).remove()
+                self.titles = TitleIndex()
+                for line in await self._populate( streaks ):
+                    for setting, value in line_settings.items():
+                        setattr( line, setting, value )
+        if self._filter:
+            self.filter( self._filter )
+
+    async def _mount_lines( self, lines: list[ StreakLine ], **line_settings: Any ) -> list[ StreakLine ]:
+        """Mount new ungrouped streak lines.
 
-    def __getitem__( self, index: int ) -> StreakLine:
-        """Get a streak based on its index.
+        Args:
+            lines (list[ StreakLine ]): The lines to mount.
+            line_settings (Any): Settings to apply to the lines once mounted.
+
+        Returns:
+            list[ StreakLine ]: The lines that were mounted.
+        """
+        if lines:
+            if groups := self.groups:
+                await self.mount( *lines, before=groups[ 0 ] )
+            else:
+                await self.mount( *lines )
+            for line in lines:
+                for setting, value in line_settings.items():
+                    setattr( line, setting, value )
+        return lines
+
+    async def _place( self, streak: Streak, **line_settings: Any ) -> StreakLine | None:
+        """Place a streak in the display, taking its group into account.
+
+        Args:
+            streak (Streak): The streak to place.
+            line_settings (Any): Settings to apply to the new line once mounted.
+
+        Returns:
+            StreakLine | None: The line for the streak, or `None` if it was
+                placed in a collapsed group.
+        """
+        if not streak.group:
+            lines = await self._mount_lines( [ StreakLine( streak=streak ) ], **line_settings )
+        elif ( group := self.group( streak.group ) ) is None:
+            await self.mount( group := StreakGroup( streak.group, [ streak ] ) )
+            for line in ( lines := group.lines ):
+                for setting, value in line_settings.items():
+                    setattr( line, setting, value )
+        else:
+            lines = await group.add( [ StreakLine( streak=streak ) ], **line_settings )
+        self._track( lines )
+        self.titles.add( streak.key, streak.title )
+        return lines[ 0 ] if lines else None
+
+    async def add( self, streak: Streak, **line_settings: Any ) -> StreakLine | None:
+        """Add a new streak.
 
         Args:
-            index (int): The index of the streak to get.
+            streak (Streak): The streak to add.
+            line_settings (Any): Settings to apply to the new streak line once mounted.
+
+        Returns:
+            StreakLine | None: The line that was added for the streak, or
+                `None` if it was added to a collapsed group.
         """
-        return cast( StreakLine, self.children[ index ] )
+        line = await self._place( streak, **line_settings )
+        self.history.record( [
+            StreakChange( streak.to_dict(), self._order( streak.group ).index( streak.key ), True )
+        ] )
+        self.save()
+        return line
 
-    def index( self, streak: StreakLine ) -> int:
-        """Find the index of the given streak.
+    async def regroup( self, line: StreakLine, **line_settings: Any ) -> StreakLine | None:
+        """Move a streak line to the group its streak now belongs to.
 
         Args:
-            streak (StreakLine): The streak to look for.
+            line (StreakLine): The line to move.
+            line_settings (Any): Settings to apply to the new streak line once mounted.
 
         Returns:
-            int: The position of the streak.
+            StreakLine | None: The new line for the streak, or `None` if it
+                was moved to a collapsed group.
+        """
+        source = line.parent
+        self._untrack( [ line ] )
+        await line.remove()
+        if isinstance( source, StreakGroup ):
+            if source.streaks:
+                source.query_one( GroupHeader ).refresh()
+            else:
+                await source.remove()
+        moved = await self._place( line.streak, **line_settings )
+        self.save()
+        return moved
+
+    async def toggle( self, group: StreakGroup, **line_settings: Any ) -> None:
+        """Expand or collapse a group.
+
+        Args:
+            group (StreakGroup): The group to toggle.
+            line_settings (Any): Settings to apply to any lines that get mounted.
+        """
+        if group.collapsed:
+            self._track( await group.open_group( **line_settings ) )
+        else:
+            self._untrack( await group.close_group() )
+
+    async def sort( self, order: SortOrder ) -> None:
+        """Sort the streaks.
+
+        Args:
+            order (SortOrder): The order to sort the streaks into.
+
+        Note:
+            The ungrouped streaks are sorted, and the streaks within each
+            group are sorted; the groups themselves stay where they are. All
+            of the moves are made as a single update of the display, and the
+            result is saved once.
+        """
+        await self.storage.archive.fetch_summaries()
+        before = { name: self._order( name ) for name in ( "", *( group.group for group in self.groups ) ) }
+        with self.app.batch_update():
+            arrange( self, sort_streaks( (
+                child.streak for child in self.children
+                if isinstance( child, StreakLine ) and not child.removing
+            ), order, self.storage.archive ) )
+            for group in self.groups:
+                group.sort( order, self.storage.archive )
+        self.history.record(
+            OrderChange( name, tuple( keys ), tuple( after ) ) for name, keys in before.items()
+            if ( after := self._order( name ) ) != keys
+        )
+        self.save()
+
+    def mark( self, lines: list[ StreakLine ], start: date, end: date, adjust: int | None ) -> list[ DayChange ]:
+        """Adjust the done counts for a range of days across some streaks.
+
+        Args:
+            lines (list[ StreakLine ]): The lines of the streaks to adjust.
+            start (date): The first day to adjust.
+            end (date): The last day to adjust.
+            adjust (int | None): The amount to adjust each count by, or `None` to clear them.
+
+        Returns:
+            list[ DayChange ]: The changes that were made.
+
+        Note:
+            All of the changes are made to the data in one go, the lines
+            that were changed are then refreshed as a single update of the
+            display, and the result is saved once.
+        """
+        if changes := mark_days( [ line.streak for line in lines ], start, end, adjust ):
+            changed = { change.key for change in changes }
+            with self.app.batch_update():
+                for line in lines:
+                    if line.streak.key in changed:
+                        line.refresh_days()
+            self.history.record( changes )
+            self.save()
+        return changes
+
+    async def visit( self, start: date, end: date ) -> None:
+        """Make sure the data for the given range of dates is loaded.
+
+        Args:
+            start (date): The start of the range being visited.
+            end (date): The end of the range being visited.
+        """
+        if await self.store.visit( self, start, end ):
+            for line in self.query( StreakLine ):
+                line.refresh_days()
+
+    async def import_rows( self, rows: Iterable[ Row ], **line_settings: Any ) -> int:
+        """Import rows of streak data.
+
+        Args:
+            rows (Iterable[ Row ]): The rows to import.
+            line_settings (Any): Settings to apply to any new streak lines once mounted.
+
+        Returns:
+            int: The number of new streaks that were added.
 
         Raises:
-            ValueError: If the streak could not be found.
+            TransferError: If there was a problem with the rows.
+
+        Note:
+            All of the rows are read and added up first, and only if they
+            can all be read are they merged into the data; any new streaks
+            are then mounted in one go, and the result is saved. Importing
+            can't be undone, so the history of changes is forgotten.
+        """
+        tally = Tally.of( rows )
+        await self.storage.archive.fetch( tally.years )
+        self.history.clear()
+        added: list[ Streak ] = []
+        merge_tally(
+            self.streaks, tally, self.storage.archive, added, lambda streaks: self.store.changed( streaks, self )
+        )
+        for line in self.query( StreakLine ):
+            line.refresh_days()
+        self._track( await self._mount_lines( [ StreakLine( streak=streak ) for streak in added ], **line_settings ) )
+        self.save()
+        return len( added )
+
+    async def _restore( self, change: StreakChange, **line_settings: Any ) -> Streak:
+        """Put back a streak that was deleted.
+
+        Args:
+            change (StreakChange): The record of the streak.
+            line_settings (Any): Settings to apply to the new streak line once mounted.
+
+        Returns:
+            Streak: The streak that was put back.
+        """
+        streak = Streak.from_dict( change.data )
+        await self.storage.archive.fetch( day.year for day in streak.days )
+        for year in { day.year for day in streak.days }:
+            self.storage.archive.load_year( year, self.streaks )
+        streak.changed_years.update( day.year for day in streak.days )
+        if notes := change.data.get( "notes" ):
+            self.notes.replace( streak.key, notes )
+        await self._place( streak, **line_settings )
+        order = [ key for key in self._order( streak.group ) if key != streak.key ]
+        order.insert( change.position, streak.key )
+        self._reorder( streak.group, order )
+        return streak
+
+    async def _delete( self, key: str ) -> None:
+        """Delete a streak.
+
+        Args:
+            key (str): The key of the streak to delete.
+
+        Note:
+            Any notes the streak has are deleted along with it.
         """
-        return self.children.index( streak )
+        self._forget_notes( key )
+        if ( line := self._lines.get( key ) ) is not None:
+            self._forget( line )
+            await line.remove()
+        else:
+            for group in self.groups:
+                group.discard( key )
+            self.titles.remove( key )
+        self._tidy_groups()
+
+    def _forget_notes( self, key: str ) -> None:
+        """Delete any notes a streak has.
 
-    def on_streak_line_updated( self ) -> None:
-        """Save the streaks when they get updated in some way."""
+        Args:
+            key (str): The key of the streak.
+        """
+        if key in self.notes.index:
+            self.notes.replace( key, {} )
+
+    def _retitle( self, streak: Streak, title: str ) -> None:
+        """Change the title of a streak.
+
+        Args:
+            streak (Streak): The streak to retitle.
+            title (str): The new title.
+        """
+        streak.title = title
+        if ( line := self._lines.get( streak.key ) ) is not None:
+            line.title = title
+        self.titles.add( streak.key, title )
+
+    async def _apply( self, operation: Operation, **line_settings: Any ) -> bool:
+        """Apply the changes of an operation from the history.
+
+        Args:
+            operation (Operation): The changes to apply.
+            line_settings (Any): Settings to apply to any new streak lines once mounted.
+
+        Returns:
+            bool: `True` if there was anything to apply, `False` if not.
+
+        Note:
+            Only the changes themselves are applied, to the data and to any
+            lines that are showing it; nothing is reloaded.
+        """
+        if not operation:
+            return False
+        await self.storage.archive.fetch( change.day.year for change in operation if isinstance( change, DayChange ) )
+        streaks = { streak.key: streak for streak in self.streaks }
+        refresh: set[ str ] = set()
+        with self.app.batch_update():
+            for change in operation:
+                if isinstance( change, StreakChange ):
+                    if change.added:
+                        restored = await self._restore( change, **line_settings )
+                        streaks[ restored.key ] = restored
+                    else:
+                        await self._delete( str( change.data[ "key" ] ) )
+                        streaks.pop( str( change.data[ "key" ] ), None )
+                elif isinstance( change, OrderChange ):
+                    self._reorder( change.group, change.after )
+                elif ( streak := streaks.get( change.key ) ) is None:
+                    continue
+                elif isinstance( change, DayChange ):
+                    self.storage.archive.load_year( change.day.year, streaks.values() )
+                    streak[ change.day ] = change.after
+                    refresh.add( change.key )
+                elif isinstance( change, TitleChange ):
+                    self._retitle( streak, change.after )
+            for key in refresh:
+                if ( line := self._lines.get( key ) ) is not None:
+                    line.refresh_days()
+        if self._filter:
+            self.filter( self._filter )
+        self.save()
+        return True
+
+    async def undo( self, **line_settings: Any ) -> bool:
+        """Undo the most recent change.
+
+        Args:
+            line_settings (Any): Settings to apply to any new streak lines once mounted.
+
+        Returns:
+            bool: `True` if there was something to undo, `False` if not.
+        """
+        return await self._apply( self.history.undo(), **line_settings )
+
+    async def redo( self, **line_settings: Any ) -> bool:
+        """Redo the most recently undone change.
+
+        Args:
+            line_settings (Any): Settings to apply to any new streak lines once mounted.
+
+        Returns:
+            bool: `True` if there was something to redo, `False` if not.
+        """
+        return await self._apply( self.history.redo(), **line_settings )
+
+    def filter( self, text: str ) -> None:
+        """Filter the streaks so only those whose titles match are shown.
+
+        Args:
+            text (str): The text to filter on.
+
+        Note:
+            Lines that don't match are hidden rather than removed, and only
+            the lines whose visibility actually changes are touched.
+        """
+        self._filter = text
+        matches = self.titles.search( text )
+        for key in self._showing ^ matches:
+            if ( line := self._lines.get( key ) ) is not None:
+                line.display = key in matches
+        self._showing = matches
+
+    async def on_streak_line_updated( self, event: StreakLine.Updated ) -> None:
+        """Save the streaks when they get updated in some way.
+
+        Args:
+            event (StreakLine.Updated): The event.
+
+        Note:
+            The record of a streak being deleted is made with every day of
+            the streak, including any in archived years that aren't loaded,
+            and with all of its notes; so undoing the delete puts all of
+            the streak back, even after the archive has since dropped the
+            data of the deleted streak. The notes themselves are deleted
+            along with the streak.
+        """
+        changes = event.changes
+        if event.line.removing:
+            await self.storage.archive.fetch( self.storage.archive.years )
+            await self.notes.fetch( event.line.streak.key )
+            days    = self.storage.archive.all_days( event.line.streak )
+            notes   = self.notes.of_streak( event.line.streak.key )
+            changes = tuple(
+                change._replace( data={
+                    **change.data,
+                    "days": { day.isoformat(): count for day, count in sorted( days.items() ) },
+                    "notes": notes
+                } ) if isinstance( change, StreakChange ) and not change.added else change
+                for change in changes
+            )
+        self.history.record( changes )
+        if event.line.removing:
+            # Note that the line may well have left the DOM by the time we
+            # get to hear about it, so we can't ask it which group it was
+            # in; instead tidy up all of the groups.
+            self._forget( event.line )
+            self._forget_notes( event.line.streak.key )
+            self._tidy_groups()
+        else:
+            self.titles.add( event.line.streak.key, event.line.streak.title )
+            if self._filter:
+                self.filter( self._filter )
         self.save()
 
 ### streaks.py ends here
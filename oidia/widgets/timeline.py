@@ -2,8 +2,14 @@
 
 ##############################################################################
 # Python imports.
-from typing   import Any
-from datetime import date, timedelta
+from collections     import OrderedDict
+from collections.abc import Hashable
+from datetime        import date
+from typing          import Any, ClassVar, Final
+
+##############################################################################
+# Rich imports.
+from rich.text import Text
 
 ##############################################################################
 # Textual imports.
@@ -13,6 +19,69 @@ from textual.css.query  import NoMatches
 from textual.reactive   import reactive
 from textual.widgets    import Static, Label
 
+##############################################################################
+# Local imports.
+from ..data import Resolution, TimeSpan, period_start, shift_period
+
+##############################################################################
+class CellCache:
+    """A bounded cache of the content of timeline cells.
+
+    The content of a cell only depends on what it shows and how it's
+    aligned, and across all of the timelines on the screen there are only
+    a handful of different combinations of those; so the cache is keyed on
+    them, and every cell that shows the same thing shares the one piece of
+    content.
+    """
+
+    def __init__( self, capacity: int=4096 ) -> None:
+        """Initialise the cache.
+
+        Args:
+            capacity (int): The most renderings to keep.
+        """
+        self._capacity = capacity
+        self._cells: OrderedDict[ Hashable, Text ] = OrderedDict()
+        self.hits   = 0
+        """int: The number of times content was found in the cache."""
+        self.misses = 0
+        """int: The number of times content wasn't found in the cache."""
+
+    def __len__( self ) -> int:
+        """int: The amount of content in the cache."""
+        return len( self._cells )
+
+    def get( self, key: Hashable ) -> Text | None:
+        """Get content from the cache.
+
+        Args:
+            key (Hashable): The key for the content.
+
+        Returns:
+            Text | None: The content, or `None` if it isn't in the cache.
+        """
+        if ( content := self._cells.get( key ) ) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._cells.move_to_end( key )
+        return content
+
+    def put( self, key: Hashable, content: Text ) -> None:
+        """Put content in the cache.
+
+        Args:
+            key (Hashable): The key for the content.
+            content (Text): The content.
+
+        Note:
+            If the cache is full the least recently used content is dropped.
+        """
+        self._cells[ key ] = content
+        self._cells.move_to_end( key )
+        while len( self._cells ) > self._capacity:
+            self._cells.popitem( last=False )
+
 ##############################################################################
 class TimelineDay( Static ):
     """A widget for displaying information on a timeline date."""
@@ -26,25 +95,67 @@ class TimelineDay( Static ):
     """
     """str: The default styling for a `TimelineDay`."""
 
+    FORMATS: Final = {
+        Resolution.DAY:   "%b %d\n%a",
+        Resolution.WEEK:  "Wk %V\n%b %d",
+        Resolution.MONTH: "%b\n%Y"
+    }
+    """dict[ Resolution, str ]: The date formats for each resolution."""
+
+    CELLS: ClassVar[ CellCache ] = CellCache()
+    """CellCache: The cache of renderings shared by every timeline cell."""
+
     day = reactive( date.today() )
-    """date: The date of this day."""
+    """date: The date of this day.
 
-    def __init__( self, day: date ) -> None:
+    When the timeline is showing a resolution coarser than a day, this is
+    the first day of the period the widget represents.
+    """
+
+    def __init__( self, day: date, resolution: Resolution=Resolution.DAY ) -> None:
         """Initialise the day widget.
 
         Args:
             day (date): The day to represent.
+            resolution (Resolution): The resolution of the period the widget represents.
         """
         super().__init__()
+        self.resolution = resolution
+        """Resolution: The resolution of the period the widget represents."""
         self.day = day
 
+    @property
+    def content_key( self ) -> Hashable:
+        """Hashable: Everything that what the cell shows depends on."""
+        return ( self.day, self.resolution )
+
+    def content( self ) -> str:
+        """Get what the cell shows.
+
+        Returns:
+            str: The text of the cell.
+        """
+        return self.day.strftime( self.FORMATS[ self.resolution ] )
+
     def render( self ) -> RenderResult:
         """Render this day.
 
         Returns:
             RederResult: The rendering of this day.
+
+        Note:
+            The rendering is looked for in the shared cache first, keyed
+            on what the cell shows and how it's aligned; so only a cell
+            that shows what no other cell does has its content made
+            afresh. The content isn't styled, as Textual styles whatever
+            is rendered once it has been rendered; working out the style
+            takes longer than making the content, so it is kept out of the
+            key too.
         """
-        return self.day.strftime( "%b %d\n%a" )
+        key = ( type( self ), self.content_key, self.styles.text_align )
+        if ( content := self.CELLS.get( key ) ) is None:
+            self.CELLS.put( key, content := Text( self.content() ) )
+        return content
 
     @property
     def is_first( self ) -> bool:
@@ -80,22 +191,22 @@ class TimelineDays( Grid ):
     """
     """str: The default styling for a `TimelineDays`."""
 
-    def __init__( self, span: timedelta, *args: Any, **kwargs: Any ) -> None:
+    def __init__( self, span: TimeSpan, *args: Any, **kwargs: Any ) -> None:
         """Initialise the days widget.
 
         Args:
-            span (timedelta): The span of time to cover.
+            span (TimeSpan): The span of time to cover.
         """
         super().__init__( *args, **kwargs )
         self.spanning( span )
 
-    def spanning( self, span: timedelta ) -> None:
+    def spanning( self, span: TimeSpan ) -> None:
         """Set the span for the days display.
 
         Args:
-            span (timedelta): The span.
+            span (TimeSpan): The span.
         """
-        self.styles.grid_size_columns = span.days
+        self.styles.grid_size_columns = span.length
 
 ##############################################################################
 class Timeline( Horizontal ):
@@ -104,8 +215,8 @@ class Timeline( Horizontal ):
     title = reactive( "", init=False )
     """str: The title to five the timeline."""
 
-    time_span = reactive( timedelta( weeks=1 ), init=False )
-    """timedelta: The span of time the timeline will show in one go."""
+    time_span = reactive( TimeSpan(), init=False )
+    """TimeSpan: The span of time the timeline will show in one go."""
 
     end_date = reactive( date.today() )
     """date: The last date shown in the timeline."""
@@ -113,12 +224,20 @@ class Timeline( Horizontal ):
     @property
     def start_date( self ) -> date:
         """date: The first date shown in the timeline."""
-        return self.end_date - self.time_span
+        return self.dates[ 0 ]
 
     @property
     def dates( self ) -> list[ date ]:
-        """list[ date ]: The list of dates currently in the window of interest."""
-        return [ self.start_date + timedelta( days=day ) for day in range( 1, self.time_span.days + 1 ) ]
+        """list[ date ]: The list of dates currently in the window of interest.
+
+        Each date is the start of the period covered by a cell in the
+        timeline.
+        """
+        last = period_start( self.end_date, resolution := self.time_span.resolution )
+        return [
+            shift_period( last, resolution, -period )
+            for period in reversed( range( self.time_span.length ) )
+        ]
 
     def make_my_day( self, day: date ) -> TimelineDay:
         """Make a day widget for the given day.
@@ -129,7 +248,7 @@ class Timeline( Horizontal ):
         Returns:
             TimelineDay: The day widget for the timeline.
         """
-        return TimelineDay( day )
+        return TimelineDay( day, self.time_span.resolution )
 
     def compose( self ) -> ComposeResult:
         """Compose the widget.
@@ -158,58 +277,60 @@ class Timeline( Horizontal ):
         except NoMatches:
             pass
 
-    async def watch_time_span( self, new_span: timedelta ) -> None:
+    async def watch_time_span( self, new_span: TimeSpan ) -> None:
         """React to changes to the time span of the timeline.
 
         Args:
-            new_span (timedelta): The new timespan for the timeline.
+            new_span (TimeSpan): The new timespan for the timeline.
         """
         await self.query( TimelineDay ).remove()
-        self.days.spanning( self.time_span )
-        await self.days.mount( *[
-            self.make_my_day( self.end_date - timedelta( days=day ) )
-            for day in reversed( range( new_span.days ) )
-        ] )
-
-    def adjust_day( self, day: TimelineDay, delta: timedelta ) -> None:
+        self.days.spanning( new_span )
+        await self.days.mount( *[ self.make_my_day( day ) for day in self.dates ] )
+        # Mounting leaves a callback with the days container that holds on
+        # to the widgets that were mounted, until the container next
+        # handles a message. It hardly ever gets one, so every zoom would
+        # otherwise keep the previous set of days alive; nudge it instead.
+        self.days.call_later( self.days.refresh )
+
+    def adjust_day( self, day: TimelineDay, new_date: date ) -> None:
         """Adjust the date of a given timeline day.
 
         Args:
             day (TimelineDay): The day widget to adjust.
-            delta (timedelta): The period of time to adjust by.
+            new_date (date): The new date for the day widget.
         """
-        day.day += delta
+        day.day = new_date
 
-    def watch_end_date( self, old_date: date, new_date: date ) -> None:
-        """React to changes to the end date for the display.
+    def watch_end_date( self ) -> None:
+        """React to changes to the end date for the display."""
+        for day, new_date in zip( self.query( TimelineDay ), self.dates ):
+            self.adjust_day( day, new_date )
 
-        Args:
-            old_date (date): The old value for the end date.
-            new_date (date): The new value for the end date.
-        """
-        diff = new_date - old_date
-        for day in self.query( TimelineDay ):
-            self.adjust_day( day, diff )
-
-    def move_days( self, days: int ) -> None:
-        """Move the timeline by a given number of days.
+    def move_periods( self, periods: int ) -> None:
+        """Move the timeline by a given number of periods.
 
         Args:
-            days (int): The number of days to move by.
+            periods (int): The number of periods to move by.
+
+        Note:
+            The size of a period depends on the resolution of the
+            timeline; when zoomed out to weeks the timeline moves a week
+            at a time, for example.
         """
-        self.end_date += timedelta( days=days )
+        self.end_date = shift_period( self.end_date, self.time_span.resolution, periods )
 
-    def zoom_days( self, days: int ) -> None:
-        """Zoom the timeline in/out by a given number of days.
+    def zoom_periods( self, periods: int ) -> None:
+        """Zoom the timeline in/out by a given number of periods.
 
         Args:
-            days (int): The number of days to zoom by.
+            periods (int): The number of periods to zoom by.
 
         Note:
-            A negative number of days zooms out.
+            A negative number of periods zooms in. Zooming out past the
+            longest span for a resolution switches to the next coarser
+            resolution; zooming in past the shortest switches to the next
+            finer one.
         """
-        # Ensure the zoom only ever results in a single day at most.
-        if self.time_span.days > 1 or days > 0:
-            self.time_span += timedelta( days=days )
+        self.time_span = self.time_span.zoomed( periods )
 
 ### timeline.py ends here
@@ -23,15 +23,20 @@ class TitleInput( Input ):
     ]
     """list[ Binding ]: The bindings for the title input widget."""
 
+    cancelled = False
+    """bool: Was the input cancelled?"""
+
     async def action_cancel( self ) -> None:
         """Provide a cancel action.
 
         Note:
             This empties the input and then performs the normal submit. It
             is expected that the user of the class will check the input and
-            take an empty value to mean the input was cancelled.
+            take an empty value to mean the input was cancelled. Where an
+            empty value is meaningful, `cancelled` can be checked instead.
         """
-        self.value = ""
+        self.value     = ""
+        self.cancelled = True
         await self.action_submit()
 
 ### title_input.py ends here
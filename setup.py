@@ -51,7 +51,7 @@ setup(
     python_requires               = ">=3.10",
     keywords                      = "terminal textual streak todo",
     entry_points                  = {
-        "console_scripts": "oidia=oidia.app:run"
+        "console_scripts": "oidia=oidia.cli:run"
     },
     license                       = (
         "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)"
@@ -0,0 +1,79 @@
+"""Tests for the per-year archive of old streak data."""
+
+##############################################################################
+# Python imports.
+from asyncio  import run
+from datetime import date, timedelta
+from pathlib  import Path
+from typing   import Any
+
+##############################################################################
+# Textual imports.
+from textual.pilot import Pilot
+
+##############################################################################
+# Local imports.
+from oidia.app     import OIDIA
+from oidia.data    import Archive, Storage, Store, Streak, seed_storage
+from oidia.widgets import Streaks
+
+##############################################################################
+OLD_DAYS = { date( 2019, 5, 1 ): 2, date( 2019, 5, 2 ): 1 }
+"""dict[ date, int ]: Some days that are well into the archive."""
+
+##############################################################################
+def test_all_days_reads_unloaded_years( tmp_path: Path ) -> None:
+    """All of the days of a streak can be had without loading the archive."""
+    storage = Storage( tmp_path )
+    seed_storage( storage, [ Streak( "Test", { **OLD_DAYS, date.today(): 1 }, key="test" ) ] )
+    storage.load()
+    streak = ( storage := Storage( tmp_path ) ).load()[ 0 ]
+    assert streak.year( 2019 ) == {}
+    assert storage.archive.all_days( streak ) == { **OLD_DAYS, date.today(): 1 }
+
+##############################################################################
+def test_change_to_unloaded_year_is_kept( tmp_path: Path ) -> None:
+    """A change to a year that isn't loaded isn't forgotten by a save."""
+    archive = Archive( tmp_path, capacity=0 )
+    streak  = Streak( "Test", OLD_DAYS, key="test" )
+    archive.adopt( [ streak ] )
+    archive.save( [ streak ] )
+    archive.visit( [ streak ], date.today(), date.today() )
+    streak[ date( 2019, 6, 1 ) ] = 3
+    archive.save( [ streak ] )
+    archive.visit( [ streak ], date( 2019, 1, 1 ), date( 2019, 12, 31 ) )
+    archive.visit( [ streak ], date.today(), date.today() )
+    assert archive.read( 2019 )[ "test" ] == {
+        "2019-05-01": 2, "2019-05-02": 1, "2019-06-01": 3
+    }
+
+##############################################################################
+def test_undo_delete_restores_evicted_years( tmp_path: Path ) -> None:
+    """Undoing the delete of a streak puts back the years the archive dropped."""
+    storage = Storage( tmp_path )
+    recent  = date.today() - timedelta( days=1 )
+    seed_storage( storage, [ Streak( "Doomed", { **OLD_DAYS, recent: 1 }, key="doomed" ) ] )
+    # Load the data the once so the old year is moved into the archive,
+    # then start afresh so that the old year isn't loaded.
+    storage.load()
+    storage = Storage( tmp_path )
+
+    async def delete_and_undo( pilot: Pilot[ Any ] ) -> None:
+        await pilot.pause()
+        await pilot.press( "ctrl+d" )
+        await pilot.pause()
+        # Look at the archived year after the delete, so that the archive
+        # drops the data of the deleted streak from it.
+        streaks = pilot.app.screen.query_one( Streaks )
+        await streaks.visit( date( 2019, 1, 1 ), date( 2019, 12, 31 ) )
+        streaks.save()
+        await pilot.press( "ctrl+z" )
+        await pilot.pause()
+        pilot.app.exit()
+
+    run( OIDIA( store=Store( storage ) ).run_async( headless=True, auto_pilot=delete_and_undo ) )
+    assert [ ( row.title, row.day, row.value ) for row in Storage( tmp_path ).rows() ] == [
+        ( "Doomed", day, count ) for day, count in sorted( { **OLD_DAYS, recent: 1 }.items() )
+    ]
+
+### test_archive.py ends here
@@ -0,0 +1,42 @@
+"""Tests for filtering the list of streaks."""
+
+##############################################################################
+# Python imports.
+from asyncio import run, wait_for
+from pathlib import Path
+from typing  import Any
+
+##############################################################################
+# Textual imports.
+from textual.pilot import Pilot
+
+##############################################################################
+# Local imports.
+from oidia.app     import OIDIA
+from oidia.data    import Storage, Store, Streak, seed_storage
+from oidia.widgets import StreakFilter
+
+##############################################################################
+def test_closing_filter_returns_focus( tmp_path: Path ) -> None:
+    """Closing the filter puts focus back where it was, so escape can then quit."""
+    storage = Storage( tmp_path )
+    seed_storage( storage, [ Streak( "Alpha", {}, key="alpha" ), Streak( "Beta", {}, key="beta" ) ] )
+    focus: list[ Any ] = []
+
+    async def filter_then_quit( pilot: Pilot[ Any ] ) -> None:
+        await pilot.pause()
+        await pilot.press( "down" )
+        await pilot.pause()
+        focus.append( pilot.app.focused )
+        await pilot.press( "slash", "b", "escape" )
+        await pilot.pause()
+        focus.append( pilot.app.focused )
+        assert not pilot.app.screen.query_one( StreakFilter ).display
+        # With focus back on the streaks, this should quit the application.
+        await pilot.press( "escape" )
+
+    run( wait_for( OIDIA( store=Store( storage ) ).run_async( headless=True, auto_pilot=filter_then_quit ), 30 ) )
+    before, after = focus
+    assert before is not None and after is before
+
+### test_filter.py ends here
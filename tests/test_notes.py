@@ -0,0 +1,41 @@
+"""Tests for the notes attached to the days of streaks."""
+
+##############################################################################
+# Python imports.
+from asyncio  import run
+from datetime import date
+from pathlib  import Path
+from typing   import Any
+
+##############################################################################
+# Textual imports.
+from textual.pilot import Pilot
+
+##############################################################################
+# Local imports.
+from oidia.app  import OIDIA
+from oidia.data import Storage, Store, Streak, seed_storage
+
+##############################################################################
+def test_delete_takes_the_notes_and_undo_puts_them_back( tmp_path: Path ) -> None:
+    """Deleting a streak deletes its notes, and undoing the delete restores them."""
+    storage = Storage( tmp_path )
+    seed_storage( storage, [ Streak( "Noted", { date.today(): 1 }, key="noted" ) ] )
+    storage.notes.set( "noted", date.today(), "A note" )
+    storage = Storage( tmp_path )
+    notes: list[ str ] = []
+
+    async def delete_and_undo( pilot: Pilot[ Any ] ) -> None:
+        await pilot.pause()
+        await pilot.press( "ctrl+d" )
+        await pilot.pause()
+        notes.append( Storage( tmp_path ).notes.get( "noted", date.today() ) )
+        await pilot.press( "ctrl+z" )
+        await pilot.pause()
+        pilot.app.exit()
+
+    run( OIDIA( store=Store( storage ) ).run_async( headless=True, auto_pilot=delete_and_undo ) )
+    assert notes == [ "" ]
+    assert Storage( tmp_path ).notes.get( "noted", date.today() ) == "A note"
+
+### test_notes.py ends here
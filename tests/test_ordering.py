@@ -0,0 +1,129 @@
+"""Tests for sorting the streaks."""
+
+##############################################################################
+# Python imports.
+from asyncio  import run
+from datetime import date, timedelta
+from pathlib  import Path
+from typing   import Any
+
+##############################################################################
+# Textual imports.
+from textual.pilot import Pilot
+
+##############################################################################
+# Local imports.
+from oidia.app           import OIDIA
+from oidia.data          import SortOrder, Storage, Store, Streak, seed_storage, sort_streaks
+from oidia.data.ordering import current_run
+from oidia.widgets       import StreakLine, Streaks
+
+##############################################################################
+def history( tmp_path: Path ) -> list[ Streak ]:
+    """Make some streaks whose order depends on their archived years.
+
+    Args:
+        tmp_path (Path): The directory to keep the streaks in.
+
+    Returns:
+        list[ Streak ]: The streaks, with none of their archived years loaded.
+    """
+    storage = Storage( tmp_path )
+    first   = storage.archive.first_hot_day
+    runner  = first - timedelta( days=10 )
+    seed_storage( storage, [
+        Streak( "Recent", { date.today() - timedelta( days=3 ): 1 }, key="recent" ),
+        Streak( "Old", { date( 2019, 5, day ): 5 for day in range( 1, 11 ) }, key="old" ),
+        Streak( "Runner", {
+            runner + timedelta( days=day ): 1 for day in range( ( date.today() - runner ).days + 1 )
+        }, key="runner" ),
+        Streak( "Never", {}, key="never" ),
+    ] )
+    # Load the once so that the old years are archived, and then start
+    # afresh so that none of them are loaded.
+    storage.load()
+    return Storage( tmp_path ).load()
+
+##############################################################################
+def test_sort_uses_whole_history( tmp_path: Path ) -> None:
+    """Sorting takes the archived years into account, even when they aren't loaded."""
+    streaks = history( tmp_path )
+    archive = Storage( tmp_path ).archive
+    assert sum( streaks[ 1 ].days.values() ) == 0
+    assert [ streak.title for streak in sort_streaks( streaks, SortOrder.TOTAL, archive ) ] == [
+        "Runner", "Old", "Recent", "Never"
+    ]
+    assert [ streak.title for streak in sort_streaks( streaks, SortOrder.ACTIVITY, archive ) ] == [
+        "Runner", "Recent", "Old", "Never"
+    ]
+    assert [ streak.title for streak in sort_streaks( streaks, SortOrder.RUN, archive ) ][ 0 ] == "Runner"
+
+##############################################################################
+def test_sort_is_the_same_whatever_is_loaded( tmp_path: Path ) -> None:
+    """The order doesn't depend on which archived years happen to be loaded."""
+    streaks = history( tmp_path )
+    storage = Storage( tmp_path )
+    before  = { order: sort_streaks( streaks, order, storage.archive ) for order in SortOrder }
+    storage.archive.visit( streaks, date( 2019, 1, 1 ), date( 2019, 12, 31 ) )
+    storage.archive.load_year( storage.archive.first_hot_year - 1, streaks )
+    assert sum( streaks[ 1 ].days.values() ) == 50
+    for order in SortOrder:
+        assert sort_streaks( streaks, order, storage.archive ) == before[ order ]
+
+##############################################################################
+def test_summary_follows_saves( tmp_path: Path ) -> None:
+    """The summary of an archived year is kept up to date as the year is saved."""
+    streaks = history( tmp_path )
+    storage = Storage( tmp_path )
+    storage.archive.visit( streaks, date( 2019, 1, 1 ), date( 2019, 12, 31 ) )
+    streaks[ 1 ][ date( 2019, 6, 1 ) ] = 7
+    storage.save( streaks )
+    assert Storage( tmp_path ).archive.summary( streaks[ 1 ] ).total == 57
+    assert Storage( tmp_path ).archive.summary( streaks[ 1 ] ).last == date( 2019, 6, 1 )
+
+##############################################################################
+def test_summary_made_for_older_archives( tmp_path: Path ) -> None:
+    """An archive from before there were summaries gets summarised when needed."""
+    streaks = history( tmp_path )
+    ( tmp_path / Storage.ARCHIVE_DIRECTORY / "summary.json" ).unlink()
+    assert Storage( tmp_path ).archive.summary( streaks[ 1 ] ).total == 50
+    assert ( tmp_path / Storage.ARCHIVE_DIRECTORY / "summary.json" ).exists()
+
+##############################################################################
+def test_run_carries_on_into_the_archive( tmp_path: Path ) -> None:
+    """A run that goes back into the archived years is counted in full."""
+    runner  = history( tmp_path )[ 2 ]
+    archive = Storage( tmp_path ).archive
+    assert archive.summary( runner ).run == 10
+    assert current_run( runner, archive ) == ( date.today() - archive.first_hot_day ).days + 11
+
+##############################################################################
+def test_sort_arranges_lines( tmp_path: Path ) -> None:
+    """Sorting puts the lines on the screen into the new order."""
+    storage = Storage( tmp_path )
+    titles  = [ "Delta", "Alpha", "Echo", "Charlie", "Bravo" ]
+    seed_storage( storage, [
+        Streak( title, { date.today() - timedelta( days=day ): 1 for day in range( count ) }, key=title )
+        for count, title in enumerate( titles )
+    ] )
+    orders: list[ list[ str ] ] = []
+
+    async def sort( pilot: Pilot[ Any ] ) -> None:
+        await pilot.pause()
+        for _ in range( 3 ):
+            await pilot.press( "s" )
+            await pilot.pause()
+            orders.append( [
+                line.streak.title for line in pilot.app.screen.query_one( Streaks ).children
+                if isinstance( line, StreakLine )
+            ] )
+        pilot.app.exit()
+
+    run( OIDIA( store=Store( storage ) ).run_async( headless=True, auto_pilot=sort ) )
+    assert orders == [
+        sorted( titles ),
+        [ "Alpha", "Bravo", "Charlie", "Echo", "Delta" ],
+        [ "Bravo", "Charlie", "Echo", "Alpha", "Delta" ]
+    ]
+
+### test_ordering.py ends here
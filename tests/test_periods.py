@@ -0,0 +1,19 @@
+"""Tests for zooming the span of time covered by a timeline."""
+
+##############################################################################
+# Local imports.
+from oidia.data import Resolution, TimeSpan
+
+##############################################################################
+def test_zooming_crosses_resolutions() -> None:
+    """Zooming past the limits of a resolution moves to the next one."""
+    assert TimeSpan( Resolution.DAY, 31 ).zoomed( 1 ) == TimeSpan( Resolution.WEEK, 5 )
+    assert TimeSpan( Resolution.WEEK, 5 ).zoomed( -1 ) == TimeSpan( Resolution.DAY, 31 )
+
+##############################################################################
+def test_zooming_stops_at_the_limits() -> None:
+    """Zooming any distance past the limits stops at them."""
+    assert TimeSpan().zoomed( 100_000 ) == TimeSpan( Resolution.MONTH, 120 )
+    assert TimeSpan().zoomed( -100_000 ) == TimeSpan( Resolution.DAY, 1 )
+
+### test_periods.py ends here
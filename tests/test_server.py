@@ -0,0 +1,175 @@
+"""Tests for sharing a store between sessions of the server."""
+
+##############################################################################
+# Python imports.
+from asyncio         import gather, run, sleep
+from collections.abc import Callable
+from datetime        import date, timedelta
+from json            import dumps, loads
+from pathlib         import Path
+from socket          import socket, socketpair
+from threading       import Lock, Thread
+
+##############################################################################
+# Pytest imports.
+from pytest import raises
+
+##############################################################################
+# Local imports.
+from oidia.data   import Connection, Passwords, RemoteStore, Storage, Store, StoreService, Streak, seed_storage
+from oidia.server import web_files
+
+##############################################################################
+DAY = date.today() - timedelta( days=1 )
+"""date: The day that gets changed."""
+
+##############################################################################
+async def connect( service: StoreService, lock: Lock, directory: Path ) -> RemoteStore:
+    """Connect a session to a store service.
+
+    Args:
+        service (StoreService): The service.
+        lock (Lock): The lock that keeps the sessions from using the service at the same time.
+        directory (Path): The directory that the data lives in.
+
+    Returns:
+        RemoteStore: The store for the session, with its streaks fetched.
+    """
+    ours, theirs = socketpair()
+
+    def send( message: dict[ str, object ] ) -> None:
+        ours.sendall( dumps( message ).encode( "utf-8" ) + b"\n" )
+
+    def serve( session: object, connection: socket, send: Callable[ [ dict[ str, object ] ], None ] ) -> None:
+        with lock:
+            service.join( session, send )
+        for line in connection.makefile( "rb" ):
+            with lock:
+                send( service.handle( session, loads( line ) ) )
+
+    Thread( target=serve, args=( object(), ours, send ), daemon=True ).start()
+    store = RemoteStore( await Connection.open( theirs ), directory )
+    await store.ready()
+    return store
+
+##############################################################################
+async def sessions( tmp_path: Path, count: int=2, streak: Streak | None=None ) -> list[ RemoteStore ]:
+    """Make a number of sessions sharing the one store.
+
+    Args:
+        tmp_path (Path): The directory to keep the streaks in.
+        count (int): The number of sessions.
+        streak (Streak | None): The streak to seed the store with.
+
+    Returns:
+        list[ RemoteStore ]: The stores of the sessions.
+    """
+    seed_storage( Storage( tmp_path ), [ streak or Streak( "Habit", { DAY: 1 }, key="habit" ) ] )
+    service, lock = StoreService( Store( Storage( tmp_path ) ) ), Lock()
+    return [ await connect( service, lock, tmp_path ) for _ in range( count ) ]
+
+##############################################################################
+def test_changes_are_shared_and_saved( tmp_path: Path ) -> None:
+    """A change made in one session shows up in the others, and is saved."""
+    told: list[ int ] = []
+
+    async def share() -> None:
+        first, second = await sessions( tmp_path )
+        second.subscribe( second, lambda: told.append( 1 ) )
+        first.streaks[ 0 ][ DAY ] = 4
+        first.changed( [ *first.streaks, Streak( "Added", key="added" ) ], first )
+        await sleep( 0.2 )
+        assert [ streak.key for streak in second.streaks ] == [ "habit", "added" ]
+        assert second.streaks[ 0 ][ DAY ] == 4
+        second.unsubscribe( second )
+        await gather( first.close(), second.close() )
+
+    run( share() )
+    assert told
+    assert [ ( streak.key, streak[ DAY ] ) for streak in Storage( tmp_path ).load() ] == [
+        ( "habit", 4 ), ( "added", 0 )
+    ]
+
+##############################################################################
+def test_concurrent_changes_converge( tmp_path: Path ) -> None:
+    """Sessions that change the same day before hearing of each other end up the same."""
+
+    async def clash() -> list[ int ]:
+        first, second = await sessions( tmp_path )
+        first.streaks[ 0 ][ DAY ] = 2
+        second.streaks[ 0 ][ DAY ] = 3
+        first.changed( first.streaks, first )
+        second.changed( [ *second.streaks, Streak( "Other", key="other" ) ], second )
+        await sleep( 0.2 )
+        assert [ streak.key for streak in first.streaks ] == [ streak.key for streak in second.streaks ]
+        await gather( first.close(), second.close() )
+        return [ first.streaks[ 0 ][ DAY ], second.streaks[ 0 ][ DAY ] ]
+
+    counts = run( clash() )
+    assert counts == [ Storage( tmp_path ).load()[ 0 ][ DAY ] ] * 2
+
+##############################################################################
+def test_sessions_read_unsaved_notes( tmp_path: Path ) -> None:
+    """A note set in one session can be read in another."""
+
+    async def note() -> None:
+        first, second = await sessions( tmp_path )
+        await second.storage.notes.fetch( "habit" )
+        assert second.storage.notes.get( "habit", DAY ) == ""
+        first.storage.notes.set( "habit", DAY, "Went well" )
+        await sleep( 0.2 )
+        assert second.storage.notes.noted( "habit", DAY )
+        await second.storage.notes.fetch( "habit" )
+        assert second.storage.notes.get( "habit", DAY ) == "Went well"
+        await gather( first.close(), second.close() )
+
+    run( note() )
+
+##############################################################################
+def test_archived_years_are_fetched( tmp_path: Path ) -> None:
+    """Visiting an archived year fetches it from the server, changes made since and all."""
+    old = date( date.today().year - 5, 6, 1 )
+    storage = Storage( tmp_path )
+    seed_storage( storage, [ Streak( "Habit", { old: 1, DAY: 1 }, key="habit" ) ] )
+    # Load the data the once so the old year is moved into the archive.
+    storage.load()
+
+    async def visit() -> None:
+        first, second = await sessions( tmp_path, streak=Storage( tmp_path ).load()[ 0 ] )
+        assert second.streaks[ 0 ][ old ] == 0
+        await first.visit( first, old, old )
+        first.streaks[ 0 ][ old ] = 7
+        first.changed( first.streaks, first )
+        await sleep( 0.2 )
+        assert await second.visit( second, old, old )
+        assert second.streaks[ 0 ][ old ] == 7
+        await gather( first.close(), second.close() )
+
+    run( visit() )
+
+##############################################################################
+def test_web_files( tmp_path: Path ) -> None:
+    """The web page is only served once all of the files of xterm.js are there."""
+    ( tmp_path / "xterm.js" ).write_text( "// xterm", encoding="utf-8" )
+    with raises( FileNotFoundError, match="xterm.css.*addon-fit.js" ):
+        web_files( tmp_path )
+    for name in ( "xterm.css", "addon-fit.js" ):
+        ( tmp_path / name ).write_text( f"/* {name} */", encoding="utf-8" )
+    files = web_files( tmp_path )
+    assert files[ "/xterm.js" ] == b"// xterm"
+    assert b"cdn" not in files[ "/" ] and b"<script>" not in files[ "/" ]
+
+##############################################################################
+def test_passwords( tmp_path: Path ) -> None:
+    """Only the right password lets a user in, and it isn't kept as it is."""
+    passwords = Passwords( tmp_path / "passwords.json" )
+    passwords.set( "alice", "secret" )
+    assert passwords.users == [ "alice" ]
+    assert passwords.check( "alice", "secret" )
+    assert not passwords.check( "alice", "Secret" )
+    assert not passwords.check( "bob", "secret" )
+    assert "secret" not in ( tmp_path / "passwords.json" ).read_text( encoding="utf-8" )
+    passwords.set( "alice", "" )
+    assert passwords.users == []
+
+### test_server.py ends here
@@ -0,0 +1,194 @@
+"""Tests for syncing the streak data between devices."""
+
+##############################################################################
+# Python imports.
+from collections.abc import Iterable
+from datetime        import date, timedelta
+from pathlib         import Path
+from random          import Random
+
+##############################################################################
+# Pytest imports.
+import pytest
+
+##############################################################################
+# Local imports.
+from oidia.data import DirectoryTransport, Storage, Streak, Sync, seed_storage
+
+##############################################################################
+DEVICES = ( "a", "b", "c" )
+"""tuple[ str, ... ]: The names of the devices being synced."""
+
+DAY = date.today() - timedelta( days=1 )
+"""date: The day that gets changed."""
+
+##############################################################################
+def sync( root: Path, device: str, transport: DirectoryTransport | None=None ) -> tuple[ int, int ]:
+    """Sync a device.
+
+    Args:
+        root (Path): The directory that holds everything.
+        device (str): The name of the device to sync.
+        transport (DirectoryTransport | None): The transport to use.
+
+    Returns:
+        tuple[ int, int ]: The number of changes sent and received.
+    """
+    return Sync( Storage( root / device ), transport or DirectoryTransport( root / "shared" ), device ).run()
+
+##############################################################################
+def set_day( root: Path, device: str, key: str, day: date, value: int ) -> None:
+    """Set the count for a day of a streak on a device, as the application would.
+
+    Args:
+        root (Path): The directory that holds everything.
+        device (str): The name of the device.
+        key (str): The key of the streak.
+        day (date): The day to set.
+        value (int): The count to set.
+    """
+    storage = Storage( root / device )
+    streaks = storage.load()
+    if ( streak := next( ( streak for streak in streaks if streak.key == key ), None ) ) is None:
+        streaks.append( streak := Streak( key.title(), key=key ) )
+    storage.archive.load_year( day.year, streaks )
+    streak[ day ] = value
+    storage.save( streaks )
+
+##############################################################################
+def counts( root: Path, device: str ) -> dict[ tuple[ str, date ], int ]:
+    """Get every count held by a device.
+
+    Args:
+        root (Path): The directory that holds everything.
+        device (str): The name of the device.
+
+    Returns:
+        dict[ tuple[ str, date ], int ]: The counts, by streak title and day.
+    """
+    return { ( row.title, row.day ): row.value for row in Storage( root / device ).rows() }
+
+##############################################################################
+def settled( root: Path, devices: Iterable[ str ]=DEVICES ) -> list[ dict[ tuple[ str, date ], int ] ]:
+    """Sync every device until they've all seen everything, and get what they hold.
+
+    Args:
+        root (Path): The directory that holds everything.
+        devices (Iterable[ str ]): The devices to sync.
+
+    Returns:
+        list[ dict[ tuple[ str, date ], int ] ]: The counts held by each device.
+    """
+    devices = list( devices )
+    for _ in range( 2 ):
+        for device in devices:
+            sync( root, device )
+    return [ counts( root, device ) for device in devices ]
+
+##############################################################################
+def join( root: Path ) -> None:
+    """Have every device join the sync, with the one streak on the last device.
+
+    Args:
+        root (Path): The directory that holds everything.
+    """
+    for device in DEVICES:
+        ( root / device ).mkdir()
+    seed_storage( Storage( root / DEVICES[ -1 ] ), [ Streak( "Habit", { DAY: 2 }, key="habit" ) ] )
+    settled( root )
+
+##############################################################################
+def test_concurrent_changes_converge( tmp_path: Path ) -> None:
+    """Changes made to the same day on different devices end up the same everywhere."""
+    join( tmp_path )
+    assert [ found[ "Habit", DAY ] for found in settled( tmp_path ) ] == [ 2, 2, 2 ]
+    set_day( tmp_path, "a", "habit", DAY, 1 )
+    set_day( tmp_path, "b", "habit", DAY, 3 )
+    set_day( tmp_path, "c", "habit", DAY, 0 )
+    for device in ( "c", "a", "b" ):
+        sync( tmp_path, device )
+    first, *others = settled( tmp_path )
+    assert all( found == first for found in others )
+
+##############################################################################
+def test_clearing_a_day_is_synced( tmp_path: Path ) -> None:
+    """Setting a count to 0 is synced like any other count."""
+    join( tmp_path )
+    set_day( tmp_path, "a", "habit", DAY, 0 )
+    assert settled( tmp_path ) == [ {}, {}, {} ]
+
+##############################################################################
+@pytest.mark.parametrize( "seed", range( 8 ) )
+def test_random_histories_converge( tmp_path: Path, seed: int ) -> None:
+    """Whatever the changes and whatever order the devices sync in, they all end up the same."""
+    join( tmp_path )
+    chance = Random( seed )
+    for _ in range( 40 ):
+        device = chance.choice( DEVICES )
+        if chance.random() < 0.6:
+            set_day(
+                tmp_path,
+                device,
+                chance.choice( ( "habit", "other" ) ),
+                DAY - timedelta( days=chance.randrange( 3 ) ),
+                chance.randrange( 4 )
+            )
+        else:
+            sync( tmp_path, device )
+    first, *others = settled( tmp_path )
+    assert all( found == first for found in others )
+
+##############################################################################
+def test_only_changes_are_sent( tmp_path: Path ) -> None:
+    """Once joined, a device only sends what changed, and only reads what's new."""
+    join( tmp_path )
+    set_day( tmp_path, "a", "habit", DAY, 5 )
+    assert sync( tmp_path, "a" ) == ( 1, 0 )
+    assert sync( tmp_path, "b" ) == ( 0, 1 )
+    assert sync( tmp_path, "b" ) == ( 0, 0 )
+
+##############################################################################
+class FailingTransport( DirectoryTransport ):
+    """A transport whose next append fails, either before or after writing."""
+
+    def __init__( self, directory: Path, after: bool ) -> None:
+        """Initialise the transport.
+
+        Args:
+            directory (Path): The directory that holds the change logs.
+            after (bool): Fail after writing, rather than before?
+        """
+        super().__init__( directory )
+        self._after = after
+
+    def append( self, device: str, lines: Iterable[ str ] ) -> None:
+        """Fail to append lines to the change log of a device.
+
+        Args:
+            device (str): The name of the device.
+            lines (Iterable[ str ]): The lines to append.
+
+        Raises:
+            OSError: Always.
+        """
+        if self._after:
+            super().append( device, lines )
+        raise OSError( "The network went away" )
+
+##############################################################################
+@pytest.mark.parametrize( "after", ( False, True ) )
+def test_interrupted_sync_can_be_run_again( tmp_path: Path, after: bool ) -> None:
+    """A sync that fails while sending can be run again without losing or repeating a change."""
+    join( tmp_path )
+    set_day( tmp_path, "a", "habit", DAY, 7 )
+    with pytest.raises( OSError ):
+        sync( tmp_path, "a", FailingTransport( tmp_path / "shared", after ) )
+    set_day( tmp_path, "b", "habit", DAY + timedelta( days=1 ), 1 )
+    sync( tmp_path, "a" )
+    sync( tmp_path, "b" )
+    assert counts( tmp_path, "b" )[ "Habit", DAY ] == 7
+    first, *others = settled( tmp_path )
+    assert all( found == first for found in others )
+    assert first[ "Habit", DAY ] == 7
+
+### test_sync.py ends here
@@ -0,0 +1,24 @@
+"""Tests for taking the shape of streak data."""
+
+##############################################################################
+# Python imports.
+from datetime import date, timedelta
+from json     import dumps
+from pathlib  import Path
+
+##############################################################################
+# Local imports.
+from oidia.data import Shape, Storage, StreakShape
+
+##############################################################################
+def test_shape_of_data_without_keys( tmp_path: Path ) -> None:
+    """Streaks from before streaks had keys each get a shape of their own."""
+    today   = date.today()
+    storage = Storage( tmp_path )
+    storage.data_file.write_text( dumps( [
+        { "title": "Walk", "days": { today.isoformat(): 2 } },
+        { "title": "Read", "days": { today.isoformat(): 1, ( today - timedelta( days=1 ) ).isoformat(): 1 } }
+    ] ), encoding="utf-8" )
+    assert Shape.of( storage ) == Shape( 2, ( StreakShape( 0, 1, 2 ), StreakShape( 0, 2, 2 ) ) )
+
+### test_synthetic.py ends here
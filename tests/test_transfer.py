@@ -0,0 +1,130 @@
+"""Tests for transferring streak data in and out of the application."""
+
+##############################################################################
+# Python imports.
+from argparse import Namespace
+from datetime import date
+from io       import StringIO
+from pathlib  import Path
+
+##############################################################################
+# Pytest imports.
+import pytest
+
+##############################################################################
+# Local imports.
+from oidia.cli  import import_streaks
+from oidia.data import Datasets, Row, Storage, Streak, Tally, TransferError, merge_tally, read_rows, write_rows
+
+##############################################################################
+ROWS = [
+    Row( "Walk", date( 2023, 1, 1 ), 1 ),
+    Row( "Walk, \"fast\"", date( 2023, 1, 2 ), 3 ),
+    Row( "Read", date( 2023, 1, 3 ), 0 )
+]
+"""list[ Row ]: Some rows of data, including a count of 0."""
+
+##############################################################################
+@pytest.mark.parametrize( "data_format", [ "csv", "jsonl" ] )
+def test_round_trip( data_format: str ) -> None:
+    """Rows that are written can be read back just as they were."""
+    text = "".join( write_rows( ROWS, data_format ) )
+    assert list( read_rows( StringIO( text ), data_format ) ) == ROWS
+
+##############################################################################
+@pytest.mark.parametrize( "data_format, text", [
+    ( "csv", "title,date,count\nWalk,2023-01-01,0\n" ),
+    ( "jsonl", '{"title": "Walk", "date": "2023-01-01", "count": 0}\n' )
+] )
+def test_count_of_zero( data_format: str, text: str ) -> None:
+    """A count of 0 is read as 0 whatever the format."""
+    assert [ row.value for row in read_rows( StringIO( text ), data_format ) ] == [ 0 ]
+
+##############################################################################
+@pytest.mark.parametrize( "data_format, text", [
+    ( "csv", "title,date\nWalk,2023-01-01\n" ),
+    ( "csv", "title,date,count\nWalk,2023-01-01,\n" ),
+    ( "jsonl", '{"title": "Walk", "date": "2023-01-01"}\n' ),
+    ( "jsonl", '{"title": "Walk", "date": "2023-01-01", "count": null}\n' )
+] )
+def test_missing_count( data_format: str, text: str ) -> None:
+    """A row without a count counts as done once."""
+    assert [ row.value for row in read_rows( StringIO( text ), data_format ) ] == [ 1 ]
+
+##############################################################################
+@pytest.mark.parametrize( "data_format, text", [
+    ( "csv", "title,day\nWalk,2023-01-01\n" ),
+    ( "csv", "title,date\nWalk,yesterday\n" ),
+    ( "csv", "title,date\n,2023-01-01\n" ),
+    ( "jsonl", "{not json}\n" ),
+    ( "jsonl", '{"title": "Walk", "date": "2023-01-01", "count": "lots"}\n' )
+] )
+def test_bad_rows( data_format: str, text: str ) -> None:
+    """Data that isn't valid is reported as a transfer error."""
+    with pytest.raises( TransferError ):
+        list( read_rows( StringIO( text ), data_format ) )
+
+##############################################################################
+def test_ical_lines_are_folded() -> None:
+    """Long iCalendar lines are folded to no more than 75 octets, and unfold to what they were."""
+    title    = "Practise the cello, then the piano — scales, arpeggios and étude №3 " * 3
+    calendar = "".join( write_rows( [ Row( title, date( 2023, 1, 1 ), 1 ) ], "ical" ) )
+    assert calendar.endswith( "\r\n" )
+    assert all( len( line.encode( "utf-8" ) ) <= 75 for line in calendar.split( "\r\n" ) )
+    escaped  = title.replace( ",", "\\," )
+    assert f"SUMMARY:{escaped}\r\n" in calendar.replace( "\r\n ", "" )
+
+##############################################################################
+def test_failed_import_saves_nothing( tmp_path: Path, monkeypatch: pytest.MonkeyPatch ) -> None:
+    """An import that fails leaves the data, and its backups, untouched."""
+    monkeypatch.setenv( "XDG_DATA_HOME", str( tmp_path ) )
+    storage = Datasets( tmp_path / "oidia" ).storage( Datasets.DEFAULT )
+    ( bad := tmp_path / "bad.csv" ).write_text( "title,date\nWalk,2023-01-01\nRun,never\n", encoding="utf-8" )
+    for source in ( tmp_path / "missing.csv", bad ):
+        args = Namespace( file=source, format=None, dataset=Datasets.DEFAULT )
+        assert import_streaks( args ) == 1
+    assert not storage.data_file.exists()
+    assert storage.backups.snapshots == []
+
+##############################################################################
+def test_import( tmp_path: Path, monkeypatch: pytest.MonkeyPatch ) -> None:
+    """A good import is saved."""
+    monkeypatch.setenv( "XDG_DATA_HOME", str( tmp_path ) )
+    ( good := tmp_path / "good.jsonl" ).write_text(
+        "".join( write_rows( ROWS, "jsonl" ) ), encoding="utf-8"
+    )
+    assert import_streaks( Namespace( file=good, format=None, dataset=Datasets.DEFAULT ) ) == 0
+    storage = Datasets( tmp_path / "oidia" ).storage( Datasets.DEFAULT )
+    assert sorted( storage.rows() ) == sorted( row for row in ROWS if row.value )
+
+##############################################################################
+def test_import_again( tmp_path: Path, monkeypatch: pytest.MonkeyPatch ) -> None:
+    """Importing the same rows again changes nothing."""
+    monkeypatch.setenv( "XDG_DATA_HOME", str( tmp_path ) )
+    ( good := tmp_path / "good.jsonl" ).write_text(
+        "".join( write_rows( [ *ROWS, Row( "Walk", date( 2023, 1, 1 ), 2 ) ], "jsonl" ) ), encoding="utf-8"
+    )
+    for _ in range( 2 ):
+        assert import_streaks( Namespace( file=good, format=None, dataset=Datasets.DEFAULT ) ) == 0
+    storage = Datasets( tmp_path / "oidia" ).storage( Datasets.DEFAULT )
+    assert sorted( storage.rows() ) == sorted( [
+        Row( "Walk", date( 2023, 1, 1 ), 3 ), Row( "Walk, \"fast\"", date( 2023, 1, 2 ), 3 )
+    ] )
+
+##############################################################################
+def test_import_leaves_archived_years_unloaded( tmp_path: Path ) -> None:
+    """Importing into archived years saves them, but doesn't keep them loaded."""
+    storage = Storage( tmp_path )
+    streaks = storage.load()
+    added: list[ Streak ] = []
+    merge_tally(
+        streaks,
+        Tally.of( Row( "Walk", date( year, 6, 1 ), year % 10 ) for year in range( 2000, 2010 ) ),
+        storage.archive,
+        added
+    )
+    assert not any( storage.archive.is_loaded( year ) for year in range( 2000, 2010 ) )
+    assert added[ 0 ].days == {}
+    assert storage.archive.read( 2009 ) == { added[ 0 ].key: { "2009-06-01": 9 } }
+
+### test_transfer.py ends here